@@ -7,6 +7,20 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 # Diretórios principais
 ASSETS_DIR = PROJECT_ROOT / "assets"
 PRESETS_DIR = PROJECT_ROOT / "presets"
+# Listagens de diretórios dos projetos abertos, para reabri-los sem varrer tudo de novo (ver scan_cache)
+SCAN_CACHE_DIR = PROJECT_ROOT / ".cache" / "scan"
+# Regras do organizador de pastas definidas pelo usuário (opcional; ver organizer_engine)
+ORGANIZER_RULES_FILE = PROJECT_ROOT / "organizer_rules.json"
+# Diários para desfazer as organizações de pastas
+ORGANIZER_JOURNAL_DIR = PROJECT_ROOT / ".cache" / "organizer"
+# Hashes de conteúdo da busca de duplicados do organizador (ver hash_cache)
+HASH_CACHE_DIR = PROJECT_ROOT / ".cache" / "hashes"
+# Registros do Build Master para pular etapas que não mudaram (ver build_cache)
+BUILD_CACHE_DIR = PROJECT_ROOT / ".cache" / "build"
+# Logs completos dos builds (o painel da janela mostra só as linhas mais recentes)
+BUILD_LOG_DIR = BUILD_CACHE_DIR / "logs"
+# Tempos de cada build, para comparar com os anteriores (ver build_history)
+BUILD_HISTORY_FILE = BUILD_CACHE_DIR / "history.jsonl"
 
 # Lista de ícones que a aplicação tentará carregar
 # A extensão .png é preferível para ícones de UI, .ico para o ícone da janela
@@ -25,4 +39,7 @@ FILE_EXTENSIONS = [
 IGNORED_DIRS_AND_FILES = [
     '.git', '__pycache__', '.vscode', '.idea', '.pytest_cache',
     'build', 'dist', 'venv', '.venv', 'env', '*.egg-info'
-]
\ No newline at end of file
+]
+
+# Ao salvar um preset novo com pelo menos este número de itens, oferece o formato compacto (.archpreset)
+COMPACT_PRESET_MIN_NODES = 5000
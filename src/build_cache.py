@@ -0,0 +1,182 @@
+# src/build_cache.py
+"""
+Impressões digitais (fingerprints) das etapas do Build Master, sem dependência de Tk.
+
+Uma etapa é descrita por componentes nomeados (ex.: interpretador, requirements.txt,
+pacotes instalados), cada um reduzido a um texto curto ou a um hash. Depois de uma
+execução bem-sucedida os componentes são guardados em BUILD_CACHE_DIR; na próxima,
+se nenhum mudou, a etapa é pulada, e se algum mudou, `changes` diz quais.
+
+Etapas registradas: "env" (dependências, por interpretador) e "pyinstaller"
+(compilação, por projeto, nome e modo do executável).
+"""
+import os
+import json
+import hashlib
+import subprocess
+import logging
+
+from .app_config import BUILD_CACHE_DIR
+from .dir_scanner import IGNORE_RE
+
+log = logging.getLogger(__name__)
+
+# Sem janela de console ao chamar o interpretador do projeto (só existe no Windows)
+NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+class FingerprintStore:
+    """Componentes da última execução bem-sucedida de uma etapa (`kind`) para uma chave (ex.: o interpretador)."""
+    def __init__(self, kind: str, key: str, cache_dir=BUILD_CACHE_DIR):
+        digest = hashlib.sha1(os.path.normcase(key).encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(os.fspath(cache_dir), f"{kind}-{digest}.json")
+
+    def load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.warning(f"Registro de build ignorado ({e})"); return {}
+
+    def changes(self, components: dict) -> list[str]:
+        """Nomes dos componentes que mudaram desde a última execução; [] se nada mudou (e havia registro)."""
+        previous = self.load()
+        if not previous: return ["sem registro anterior"]
+        return [name for name in components.keys() | previous.keys() if components.get(name) != previous.get(name)]
+
+    def save(self, components: dict):
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(components, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning(f"Não foi possível gravar o registro de build: {e}")
+
+    def clear(self):
+        try: os.remove(self.path)
+        except OSError: pass
+
+
+def file_digest(path) -> str | None:
+    """SHA-256 do conteúdo de um arquivo; None se ele não existir."""
+    try:
+        with open(path, "rb") as f: return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def requirement_files(req_file) -> list[str]:
+    """O requirements.txt e os arquivos incluídos nele com -r/-c (recursivamente), sem repetir."""
+    files, stack = [], [os.path.abspath(os.fspath(req_file))]
+    while stack:
+        path = stack.pop()
+        if path in files or not os.path.isfile(path): continue
+        files.append(path)
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] in ("-r", "--requirement", "-c", "--constraint"):
+                    stack.append(os.path.join(os.path.dirname(path), parts[1]))
+    return files
+
+
+_PROBE = ("import sys, sysconfig, json; paths = sysconfig.get_paths(); "
+          "print(json.dumps({'version': sys.version, 'site': sorted({paths['purelib'], paths['platlib']})}))")
+
+def probe_interpreter(python_exe) -> dict:
+    """Versão e pastas site-packages do interpretador do projeto (pode ser um venv diferente do atual)."""
+    result = subprocess.run([os.fspath(python_exe), "-c", _PROBE], capture_output=True, text=True,
+                            timeout=60, creationflags=NO_WINDOW)
+    if result.returncode != 0: raise OSError(result.stderr.strip() or f"código de saída {result.returncode}")
+    return json.loads(result.stdout)
+
+
+def installed_distributions(site_dirs) -> list[str]:
+    """Pacotes instalados, pelos nomes das pastas *.dist-info / *.egg-info (que trazem a versão)."""
+    names = []
+    for site_dir in site_dirs:
+        try:
+            with os.scandir(site_dir) as it:
+                names += [entry.name for entry in it if entry.name.endswith((".dist-info", ".egg-info"))]
+        except OSError:
+            pass  # Pasta ainda não criada (venv novo)
+    return sorted(names)
+
+
+def environment_fingerprint(python_exe, req_file, packages, wheelhouse: str = "") -> dict:
+    """
+    Componentes da etapa de dependências: o interpretador (caminho, versão e o executável em
+    si), os requirements (com os incluídos), os pacotes pedidos, a wheelhouse e o conjunto
+    instalado. Custa uma chamada rápida ao interpretador e uma listagem do site-packages.
+    """
+    python_exe = os.fspath(python_exe)
+    info = probe_interpreter(python_exe)
+    st = os.stat(python_exe)
+    requirements = hashlib.sha256()
+    for path in requirement_files(req_file):
+        requirements.update(path.encode("utf-8") + b"\0" + (file_digest(path) or "").encode("ascii"))
+    installed = installed_distributions(info["site"])
+    return {
+        "interpretador": f"{os.path.normcase(python_exe)} | {info['version']} | {st.st_size} | {st.st_mtime_ns}",
+        "requirements.txt": requirements.hexdigest(),
+        "pacotes de build": " ".join(packages),
+        "wheelhouse": os.path.normcase(os.fspath(wheelhouse)) if wheelhouse else "",
+        "pacotes instalados": hashlib.sha256("\n".join(installed).encode("utf-8")).hexdigest(),
+    }
+
+
+def tree_manifest(root, suffixes: tuple[str, ...] | None = None, ignore_re=IGNORE_RE) -> dict:
+    """{caminho relativo: SHA-256} dos arquivos de `root` (só os com os sufixos dados, se houver), sem os ignorados."""
+    root = os.fspath(root)
+    manifest, stack = {}, [root]
+    while stack:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as it: entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if ignore_re.match(entry.name): continue
+            try:
+                if entry.is_dir(follow_symlinks=False): stack.append(entry.path)
+                elif entry.is_file() and (not suffixes or entry.name.lower().endswith(suffixes)):
+                    manifest[os.path.relpath(entry.path, root).replace(os.sep, "/")] = file_digest(entry.path)
+            except OSError:
+                pass  # Removido durante a leitura: aparece como alteração no próximo build
+    return manifest
+
+
+def changed_files(old: dict, new: dict) -> list[str]:
+    """Arquivos adicionados (+), removidos (-) ou alterados (~) entre dois tree_manifest."""
+    old, new = old or {}, new or {}
+    return sorted(f"+ {path}" for path in new.keys() - old.keys()) + sorted(f"- {path}" for path in old.keys() - new.keys()) \
+        + sorted(f"~ {path}" for path in new.keys() & old.keys() if new[path] != old[path])
+
+
+def artifact_stamp(path) -> str | None:
+    """Tamanho e mtime do executável gerado; None se ele não existir."""
+    try: st = os.stat(path)
+    except OSError: return None
+    return f"{st.st_size} | {st.st_mtime_ns}"
+
+
+def build_fingerprint(script, workdir, icon: str, options: list[str], environment: dict) -> dict:
+    """
+    Componentes da compilação com PyInstaller: o script principal, as fontes .py do projeto
+    (por arquivo, para o log dizer quais mudaram), assets/, o ícone, as opções da linha de
+    comando e o ambiente registrado pela etapa de dependências.
+    """
+    workdir = os.fspath(workdir)
+    assets = os.path.join(workdir, "assets")
+    return {
+        "script principal": f"{os.path.normcase(os.fspath(script))} | {file_digest(script)}",
+        "fontes": tree_manifest(workdir, (".py", ".pyw")),
+        "assets": tree_manifest(assets) if os.path.isdir(assets) else {},
+        "ícone": file_digest(icon) if icon else "",
+        "opções": " ".join(options),
+        "ambiente": " | ".join(str(environment.get(name)) for name in ("interpretador", "pacotes instalados")),
+    }
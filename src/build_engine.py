@@ -0,0 +1,425 @@
+# src/build_engine.py
+"""
+Execução dos builds do Build Master, sem dependência de Tk.
+
+Um BuildJob guarda a configuração de um build (projeto, script, nome, onefile/onedir,
+opções) tirada do formulário no momento em que foi enfileirado, e executa as etapas:
+dependências, PyInstaller e, opcionalmente, o instalador (Inno Setup). A BuildQueue
+executa vários jobs ao mesmo tempo, até o grau de paralelismo escolhido.
+
+Cada job compila em pastas próprias (--workpath/--specpath em build/<nome>-<modo>,
+--distpath explícito) e com um cache do PyInstaller próprio (PYINSTALLER_CONFIG_DIR),
+então builds simultâneos não disputam os arquivos temporários: o --clean de um job
+não apaga o cache de bootloaders/binários que outro está usando. A etapa de
+dependências é serializada por interpretador: dois pip no mesmo ambiente ao mesmo
+tempo se atrapalham.
+
+Os tempos de cada etapa (e das subfases do PyInstaller) de cada build terminado vão
+para o histórico (ver build_history), comparados com os builds anteriores do mesmo app.
+Opcionalmente o executável gerado é perfilado (inicialização, importações e tamanho;
+ver build_probe) antes do instalador.
+"""
+import os
+import time
+import shutil
+import itertools
+import threading
+import subprocess
+import queue
+from pathlib import Path
+
+from .build_cache import FingerprintStore, environment_fingerprint, build_fingerprint, changed_files, artifact_stamp
+from .build_log import BuildLog, popen_group_kwargs, kill_process_tree
+from .build_history import BuildHistory, PyInstallerPhases, compare_run
+from .build_probe import startup_time, import_times, bundle_sizes, profile_report
+
+BUILD_TOOLS = ["pip", "pyinstaller", "wheel"]  # Atualizados junto com o requirements.txt
+PROBE_RUNS = 3  # Aberturas do executável no perfil: a primeira e as repetidas
+INNO_SETUP_PATHS = [r"C:\Program Files (x86)\Inno Setup 6\ISCC.exe", r"C:\Program Files\Inno Setup 6\ISCC.exe"]
+
+# Um lock por interpretador para a etapa de dependências
+_env_locks = {}
+_env_locks_guard = threading.Lock()
+
+def _env_lock(python_exe: str) -> threading.Lock:
+    with _env_locks_guard:
+        return _env_locks.setdefault(os.path.normcase(os.path.abspath(python_exe)), threading.Lock())
+
+
+class BuildJob:
+    """
+    Um build com configuração própria. `status` e `timings` ({etapa: segundos}) são lidos pela
+    interface; a saída vai para `log` (BuildLog). Ao terminar, `result` tem a mensagem final
+    ("SUCESSO: ...", "ERRO: ..." ou "CANCELADO: ...") e `comparison` as linhas de compare_run
+    contra os builds anteriores (as regressões também em `regressions`).
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, project_root, python_exe: str, script: str, name: str = "", package_type: str = "onefile",
+                 icon: str = "", clean: bool = True, create_installer: bool = False, app_version: str = "1.0.0",
+                 app_publisher: str = "", force_install: bool = False, wheelhouse: str = "",
+                 offline_install: bool = False, force_rebuild: bool = False, profile: bool = False):
+        self.id = next(self._ids)
+        self.project_root = Path(project_root); self.python_exe = python_exe; self.script = script
+        self.name = name or Path(script).stem
+        self.custom_name = bool(name)
+        # A compilação para instalador SEMPRE deve ser no modo "onedir"
+        self.package_type = "onedir" if create_installer else package_type
+        self.icon = icon; self.clean = clean; self.create_installer = create_installer
+        self.app_version = app_version; self.app_publisher = app_publisher
+        self.force_install = force_install; self.wheelhouse = wheelhouse; self.offline_install = offline_install
+        self.force_rebuild = force_rebuild; self.profile = profile
+        self.workpath = self.project_root / "build" / f"{self.name}-{self.package_type}"
+        self.distpath = self.project_root / "dist"
+        self.status = "Na fila"
+        self.result = None
+        self.timings = {}
+        self.pyinstaller_phases = {}  # Subfases lidas do log do PyInstaller
+        self.skipped = []             # Etapas puladas por não haver mudanças (tempos não comparáveis)
+        self.comparison = []; self.regressions = []
+        self.startup = []             # Segundos até a primeira janela em cada abertura do perfil
+        self.started = self.finished = self.started_at = None
+        self.log = None
+        self._process = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def key(self) -> tuple:
+        """Dois jobs com a mesma chave escreveriam nos mesmos arquivos: a fila não os aceita juntos."""
+        return (os.path.normcase(str(self.project_root)), self.name.lower(), self.package_type)
+
+    @property
+    def title(self) -> str:
+        return f"{self.project_root.name} / {self.name}"
+
+    @property
+    def artifact(self) -> Path:
+        """O executável gerado: dist/<nome>(.exe) ou dist/<nome>/<nome>(.exe) no modo onedir."""
+        artifact = self.distpath / (f"{self.name}/{self.name}" if self.package_type == "onedir" else self.name)
+        return artifact.with_name(artifact.name + (".exe" if os.name == "nt" else ""))
+
+    @property
+    def elapsed(self) -> float | None:
+        if self.started is None: return None
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Interrompe o build: encerra o processo em execução e todos os filhos dele."""
+        self._cancel_event.set()
+        process = self._process
+        if process: threading.Thread(target=kill_process_tree, args=(process,), daemon=True).start()
+
+    def write(self, text):
+        self.log.write(text)
+
+    # --- Execução ---
+    def run(self, on_status=lambda job: None):
+        """Executa as etapas na thread atual, chamando on_status(job) a cada mudança de estado."""
+        self.log = self.log or BuildLog(f"{self.name}-{self.package_type}-{self.id}")
+        self.started = time.monotonic(); self.started_at = time.time()
+        try:
+            self.result = self._run_steps(on_status)
+        except Exception as e:  # Erro inesperado: o job termina em vez de deixar a fila esperando
+            self.write(f"\nERRO CRÍTICO: {e}"); self.result = f"ERRO: {e}"
+        if self.cancelled: self.result = "CANCELADO: O build foi interrompido."
+        self.finished = time.monotonic()
+        self.status = {"SUCESSO": "Concluído", "CANCELADO": "Cancelado"}.get(self.result.split(":")[0], "Falhou")
+        self.write(f"\n{self.result}")
+        if not self.cancelled: self._record_history()
+        if self.log.path: self.write(f"Log completo: {self.log.path}")
+        self.log.close()
+        on_status(self)
+
+    def _step(self, status: str, header: str, on_status, step):
+        self.status = status; on_status(self)
+        self.write(header)
+        start = time.monotonic()
+        try: return step()
+        finally: self.timings[status] = time.monotonic() - start
+
+    # --- Histórico de tempos ---
+    def history_entry(self) -> dict:
+        return {"time": self.started_at, "project": str(self.project_root), "name": self.name, "mode": self.package_type,
+                "status": self.status, "total": round(self.elapsed, 3),
+                "steps": {step: round(seconds, 3) for step, seconds in self.timings.items()},
+                "pyinstaller": {phase: round(seconds, 3) for phase, seconds in self.pyinstaller_phases.items()},
+                "skipped": self.skipped, **({"startup": self.startup} if self.startup else {})}
+
+    def _record_history(self, history=None):
+        history = history or BuildHistory()
+        entry = self.history_entry()
+        previous = history.entries(self.project_root, self.name, self.package_type)
+        history.append(entry)
+        self.comparison = compare_run(entry, previous)
+        self.regressions = [row for row in self.comparison if row[3]]
+        if self.regressions:
+            self.write("AVISO: mais lento que os builds anteriores (mediana): " + ", ".join(
+                f"{phase} {seconds:.1f}s (era {baseline:.1f}s, +{(seconds / baseline - 1) * 100:.0f}%)"
+                for phase, seconds, baseline, _ in self.regressions))
+        elif any(baseline is not None for _, _, baseline, _ in self.comparison):
+            self.write("Tempos dentro do esperado pelos builds anteriores.")
+
+    def _run_steps(self, on_status) -> str:
+        total = 3 if self.create_installer else 2
+        if not self._step("Preparando ambiente", f"--- [ETAPA 1/{total}] Preparando Ambiente ---", on_status, self._prepare_environment):
+            return "ERRO FATAL: Falha na instalação de dependências."
+        if not self._step("Compilando", f"\n--- [ETAPA 2/{total}] Compilando com PyInstaller ---", on_status, self._run_pyinstaller):
+            return "ERRO FATAL: Falha na compilação."
+        if self.profile:
+            self._step("Analisando executável", "\n--- Perfil do Executável ---", on_status, self._profile_executable)
+        if self.create_installer:
+            if not self._step("Criando instalador", "\n--- [ETAPA 3/3] Criando Instalador ---", on_status, self._run_inno_setup):
+                return "ERRO: Falha na criação do instalador."
+            return "SUCESSO: Processo concluído! Instalador criado."
+        return "SUCESSO: Processo concluído! Executável criado."
+
+    def _prepare_environment(self):
+        with _env_lock(self.python_exe):  # Outro job com o mesmo interpretador termina antes
+            if self.cancelled: return False
+            return self._install_dependencies()
+
+    def _install_dependencies(self):
+        """Instala as ferramentas de build e o requirements.txt, a menos que nada tenha mudado desde a última instalação."""
+        python_exe = self.python_exe; workdir = self.project_root
+        req_file = workdir / "requirements.txt"; wheelhouse = self.wheelhouse
+        store = FingerprintStore("env", python_exe)
+        fingerprint = lambda: environment_fingerprint(python_exe, req_file, BUILD_TOOLS, wheelhouse)
+        try:
+            changes = store.changes(fingerprint())
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            self.write(f"Não foi possível verificar o ambiente ({e}); instalando."); changes = ["verificação falhou"]
+        if not changes and not self.force_install:
+            self.write("Dependências inalteradas desde a última instalação; etapa pulada.")
+            self.skipped.append("Preparando ambiente"); return True
+        self.write("Instalando dependências (motivo: " + (", ".join(sorted(changes)) or "pedido pelo usuário") + ").")
+
+        pip = [python_exe, "-m", "pip"]; requirements = ["-r", str(req_file)] if req_file.exists() else []
+        source = []; commands = []
+        if wheelhouse:
+            # Com a wheelhouse os pacotes sempre vêm dela; online, ela é antes completada com o que faltar
+            if not self.offline_install: commands.append(pip + ["download", "--dest", wheelhouse] + BUILD_TOOLS + requirements)
+            source = ["--no-index", "--find-links", wheelhouse]
+        elif self.offline_install:
+            self.write("ERRO: a instalação offline precisa de uma wheelhouse."); return False
+        commands.append(pip + ["install", "--upgrade"] + source + BUILD_TOOLS)
+        if requirements: commands.append(pip + ["install"] + source + requirements)
+        for cmd in commands:
+            if not self.execute_command(cmd, workdir): store.clear(); return False
+        try:
+            store.save(fingerprint())  # Depois da instalação: o conjunto instalado mudou
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            self.write(f"Aviso: registro do ambiente não gravado ({e}).")
+        self.write("Ambiente preparado com sucesso."); return True
+
+    def _run_pyinstaller(self):
+        python_exe = Path(self.python_exe)
+        pyinstaller_exe = python_exe.parent / "pyinstaller.exe"
+        workdir = self.project_root; name = self.name
+        onedir = self.package_type == "onedir"
+        options = ["--onedir" if onedir else "--onefile", "--windowed"]
+        if self.custom_name: options.extend(["--name", name])
+        if self.icon: options.extend(["--icon", self.icon])
+        assets_path = workdir / "assets";
+        if assets_path.is_dir(): options.extend(["--add-data", f"{assets_path}{os.pathsep}assets"])
+
+        # Fontes, assets, ícone, opções e ambiente iguais aos do último build bem-sucedido: reaproveita o dist/
+        artifact = self.artifact
+        store = FingerprintStore("pyinstaller", f"{workdir}|{name}|{self.package_type}")
+        environment = FingerprintStore("env", str(python_exe)).load()
+        try:
+            components = build_fingerprint(self.script, workdir, self.icon, options, environment)
+        except OSError as e:
+            self.write(f"Não foi possível verificar as fontes ({e}); compilando."); components = None
+        if components is not None:
+            components["executável"] = artifact_stamp(artifact)
+            previous = store.load(); changes = store.changes(components)
+            if not changes and not self.force_rebuild:
+                self.write(f"Nenhuma entrada mudou desde o último build; reaproveitando '{artifact}'.")
+                self.skipped.append("Compilando"); return True
+            self.write("Compilando (motivo: " + (", ".join(sorted(changes)) or "pedido pelo usuário") + ").")
+            for component in ("fontes", "assets"):
+                if component not in changes or not previous: continue
+                files = changed_files(previous.get(component), components[component])
+                self.write("\n".join(f"  {component}: {line}" for line in files[:20])
+                           + (f"\n  ... e mais {len(files) - 20}" if len(files) > 20 else ""))
+
+        if not pyinstaller_exe.exists():
+            self.write(f"ERRO FATAL: '{pyinstaller_exe}' não encontrado."); return False
+        # Pastas próprias do job: builds simultâneos não compartilham os temporários nem o .spec
+        command = [str(pyinstaller_exe), self.script, "--noconfirm"] + options
+        command += ["--workpath", str(self.workpath), "--specpath", str(self.workpath), "--distpath", str(self.distpath)]
+        if self.clean: command.extend(["--clean"])
+        # O --clean limpa o cache do PyInstaller, que por padrão é um só por usuário
+        env = {**os.environ, "PYINSTALLER_CONFIG_DIR": str(self.workpath / "pyi-cache")}
+        phases = PyInstallerPhases()
+        succeeded = self.execute_command(command, workdir, on_line=phases.feed, env=env)
+        self.pyinstaller_phases = phases.result()
+        if self.pyinstaller_phases:
+            self.write("Fases do PyInstaller: " + "  ".join(f"{phase} {seconds:.1f}s" for phase, seconds in self.pyinstaller_phases.items()))
+        if not succeeded:
+            store.clear(); return False
+        if components is not None:
+            components["executável"] = artifact_stamp(artifact)
+            if components["executável"]: store.save(components)
+            else: self.write(f"Aviso: '{artifact}' não encontrado; o próximo build não será reaproveitado.")
+        return True
+
+    def _profile_executable(self):
+        """Mede a inicialização, as importações e o tamanho do executável. Falhas só vão para o log: o build já terminou."""
+        startup = []
+        for _ in range(PROBE_RUNS):
+            if self.cancelled: return True
+            try: startup.append(startup_time(self.artifact, cancelled=lambda: self.cancelled))
+            except (OSError, RuntimeError) as e:
+                self.write(f"Inicialização não medida: {e}."); break
+        self.startup = [round(seconds, 3) for seconds in startup]
+        try: imports = import_times(self.python_exe, self.script)
+        except (OSError, SyntaxError, ValueError, subprocess.SubprocessError) as e:
+            self.write(f"Importações não medidas: {e}."); imports = []
+        sizes = bundle_sizes(self.workpath, self.artifact)
+        self.write("\n".join(profile_report(self.startup, imports, sizes)))
+        return True
+
+    def _run_inno_setup(self):
+        script = self._generate_inno_script()
+        if script is None: return False
+        iscc = shutil.which("ISCC") or next((path for path in INNO_SETUP_PATHS if os.path.exists(path)), None)
+        if not iscc:
+            self.write("ERRO: compilador do Inno Setup (ISCC.exe) não encontrado. Instale o Inno Setup 6."); return False
+        iss_file = self.workpath / f"{self.name}.iss"
+        try:
+            self.workpath.mkdir(parents=True, exist_ok=True)
+            iss_file.write_text(script, encoding="utf-8-sig")  # O ISCC lê UTF-8 com BOM
+        except OSError as e:
+            self.write(f"ERRO: não foi possível gravar '{iss_file}': {e}"); return False
+        return self.execute_command([iscc, str(iss_file)], self.project_root)
+
+    def execute_command(self, command, workdir, on_line=None, env=None):
+        """Executa o comando com a saída no log; `on_line(linha)` também recebe cada linha (ex.: PyInstallerPhases.feed)."""
+        if self.cancelled: return False
+        self.write(f"\nComando: {' '.join(command)}\nEm: {workdir}\n" + "-"*50)
+        try:
+            process = self._process = subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8', errors='replace', **popen_group_kwargs())
+            if self.cancelled: kill_process_tree(process)  # Cancelado enquanto o processo iniciava
+            for line in iter(process.stdout.readline, ''):
+                line = line.rstrip(); self.write(line)
+                if on_line: on_line(line)
+            ret_code = process.wait()
+            self.write("-"*50 + f"\n---> Código de Saída: {ret_code} <---\n"); return ret_code == 0 and not self.cancelled
+        except Exception as e: self.write(f"\nERRO CRÍTICO: {e}"); return False
+        finally: self._process = None
+
+    def _generate_inno_script(self):
+        app_name = self.name
+        workdir = self.project_root
+        dist_folder = self.distpath / app_name
+
+        # Validação crucial: verifica se a pasta de distribuição existe.
+        if not dist_folder.is_dir():
+            error_msg = f"ERRO FATAL: A pasta de distribuição '{dist_folder}' não foi encontrada. A compilação com PyInstaller (em modo 'pasta') falhou ou não foi executada."
+            self.write(error_msg)
+            return None # Retorna None para indicar falha
+
+        source_files = str(dist_folder / "*").replace("/", "\\")
+        main_exe = app_name + ".exe"
+        output_dir = workdir # Salva o setup.exe na raiz do projeto por padrão
+        
+        # --- CORREÇÃO DA SINTAXE: CADA DIRETIVA EM UMA NOVA LINHA ---
+        return f"""
+[Setup]
+AppName={app_name}
+AppVersion={self.app_version}
+AppPublisher={self.app_publisher}
+DefaultDirName={{autopf}}\\{app_name}
+OutputBaseFilename={app_name}-v{self.app_version}-setup
+OutputDir={output_dir}
+Compression=lzma2
+SolidCompression=yes
+WizardStyle=modern
+
+[Languages]
+Name: "brazilianportuguese"; MessagesFile: "compiler:Languages\\BrazilianPortuguese.isl"
+
+[Tasks]
+Name: "desktopicon"; Description: "{{cm:CreateDesktopIcon}}"; GroupDescription: "Ícones Adicionais";
+
+[Files]
+Source: "{source_files}"; DestDir: "{{app}}"; Flags: ignoreversion recursesubdirs createallsubdirs
+
+[Icons]
+Name: "{{group}}\\{app_name}"; Filename: "{{app}}\\{main_exe}"
+Name: "{{autodesktop}}\\{app_name}"; Filename: "{{app}}\\{main_exe}"; Tasks: desktopicon
+
+[Run]
+Filename: "{{app}}\\{main_exe}"; Description: "{{cm:LaunchProgram, {app_name}}}"; Flags: nowait postinstall skipifsilent
+"""
+
+class BuildQueue:
+    """
+    Fila de BuildJobs executados em threads de trabalho, no máximo `max_parallel` ao mesmo tempo.
+    Cada mudança de estado de um job é publicada em `self.queue` como ("status", job).
+    """
+    def __init__(self, max_parallel: int = 1):
+        self.max_parallel = max_parallel
+        self.jobs = []          # Todos os jobs, na ordem em que entraram
+        self.queue = queue.Queue()
+        self._pending = []
+        self._running = set()
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        with self._lock: return bool(self._pending or self._running)
+
+    def add(self, job: BuildJob) -> bool:
+        """Enfileira o job; False se um job com a mesma chave (projeto, nome, modo) ainda não terminou."""
+        with self._lock:
+            if any(other.key == job.key for other in self._pending + list(self._running)): return False
+            self.jobs.append(job); self._pending.append(job)
+        self._publish(job)
+        self._dispatch()
+        return True
+
+    def set_parallelism(self, max_parallel: int):
+        self.max_parallel = max(1, max_parallel)
+        self._dispatch()
+
+    def cancel(self, job: BuildJob):
+        with self._lock:
+            queued = job in self._pending
+            if queued: self._pending.remove(job)
+        job.cancel()
+        if queued:
+            job.status = "Cancelado"; job.result = "CANCELADO: O build foi removido da fila."
+            self._publish(job)
+
+    def cancel_all(self):
+        with self._lock: jobs = self._pending + list(self._running)
+        for job in jobs: self.cancel(job)
+
+    def clear_finished(self):
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job in self._pending or job in self._running]
+
+    def _dispatch(self):
+        with self._lock:
+            started = []
+            while self._pending and len(self._running) < self.max_parallel:
+                job = self._pending.pop(0); self._running.add(job); started.append(job)
+        for job in started:
+            threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+    def _run(self, job: BuildJob):
+        try:
+            job.run(on_status=self._publish)
+        finally:
+            with self._lock: self._running.discard(job)
+            self._publish(job)
+            self._dispatch()
+
+    def _publish(self, job: BuildJob):
+        self.queue.put(("status", job))
@@ -0,0 +1,140 @@
+# src/build_history.py
+"""
+Histórico de tempos dos builds do Build Master, sem dependência de Tk.
+
+Cada build terminado (com sucesso ou falha) vira uma linha JSON em BUILD_HISTORY_FILE:
+o tempo de cada etapa do BuildJob, as subfases do PyInstaller lidas do próprio log
+dele (Analysis, PYZ, PKG, EXE, COLLECT), as etapas puladas pelos registros do
+build_cache e, com o perfil ligado, os tempos de abertura do executável (build_probe).
+`compare_run` compara um build com a mediana dos anteriores bem-sucedidos do mesmo
+projeto/nome/modo e marca as fases que ficaram bem mais lentas.
+"""
+import os
+import re
+import json
+import threading
+import statistics
+import logging
+
+from .app_config import BUILD_HISTORY_FILE
+
+log = logging.getLogger(__name__)
+
+PYINSTALLER_PHASES = ("Analysis", "PYZ", "PKG", "EXE", "COLLECT")
+BASELINE_RUNS = 5             # Builds anteriores usados na mediana
+REGRESSION_RATIO = 1.25       # Regressão: pelo menos 25% mais lento que a mediana...
+REGRESSION_MIN_SECONDS = 2.0  # ... e pelo menos 2 s a mais (fases curtas variam muito)
+
+class PyInstallerPhases:
+    """
+    Lê as linhas do log do PyInstaller ("1234 INFO: checking Analysis") e calcula a duração
+    de cada subfase pelo tempo (ms desde o início do processo) que ele mesmo imprime.
+    Uma fase vai da primeira linha que a menciona até o início da próxima ou "Build complete!".
+    """
+    LINE_RE = re.compile(r"^(\d+) [A-Z]+: (.*)$")
+    PHASE_RE = re.compile(r"^(?:checking|Building|Running) (" + "|".join(PYINSTALLER_PHASES) + r")\b")
+
+    def __init__(self):
+        self._starts = {}  # fase -> ms
+        self._last = self._end = None
+
+    def feed(self, line: str):
+        match = self.LINE_RE.match(line.strip())
+        if not match: return
+        stamp, message = int(match.group(1)), match.group(2)
+        self._last = stamp
+        if message.startswith("Build complete!"): self._end = stamp; return
+        phase = self.PHASE_RE.match(message)
+        if phase and phase.group(1) not in self._starts: self._starts[phase.group(1)] = stamp
+
+    def result(self) -> dict:
+        """{fase: segundos}, na ordem em que rodaram; "Inicialização" é o que veio antes da Analysis."""
+        if not self._starts: return {}
+        starts = list(self._starts.items())
+        end = self._end if self._end is not None else self._last
+        phases = {"Inicialização": starts[0][1] / 1000}
+        for i, (phase, start) in enumerate(starts):
+            stop = starts[i + 1][1] if i + 1 < len(starts) else end
+            phases[phase] = max(0, stop - start) / 1000
+        return phases
+
+
+def phase_times(entry: dict) -> dict:
+    """{fase: segundos} de um registro: as etapas executadas, as subfases do PyInstaller e o total."""
+    skipped = set(entry.get("skipped", ()))
+    times = {step: seconds for step, seconds in entry.get("steps", {}).items() if step not in skipped}
+    times.update((f"PyInstaller: {phase}", seconds) for phase, seconds in entry.get("pyinstaller", {}).items())
+    startup = entry.get("startup")  # Perfil do executável (ver build_probe)
+    if startup: times["Início do app (primeira)"] = startup[0]
+    if startup and len(startup) > 1: times["Início do app (repetidas)"] = statistics.median(startup[1:])
+    if entry.get("total") is not None: times["Total"] = entry["total"]
+    return times
+
+
+def compare_run(entry: dict, previous: list[dict], runs: int = BASELINE_RUNS) -> list[tuple]:
+    """
+    [(fase, segundos, mediana anterior ou None, é_regressão)] de um build contra os `runs` builds
+    bem-sucedidos mais recentes de `previous` (mais antigos primeiro). Uma etapa pulada só é
+    comparada com builds em que ela também rodou; o total, com builds que pularam as mesmas etapas.
+    """
+    skipped = set(entry.get("skipped", ()))
+    succeeded = [other for other in previous if other.get("status") == "Concluído"]
+    rows = []
+    for phase, seconds in phase_times(entry).items():
+        if phase == "Total": candidates = [other for other in succeeded if set(other.get("skipped", ())) == skipped]
+        else: candidates = succeeded
+        samples = [times[phase] for times in map(phase_times, candidates) if phase in times][-runs:]
+        baseline = statistics.median(samples) if samples else None
+        regression = (baseline is not None and seconds > baseline * REGRESSION_RATIO
+                      and seconds - baseline >= REGRESSION_MIN_SECONDS)
+        rows.append((phase, seconds, baseline, regression))
+    return rows
+
+
+class BuildHistory:
+    """Registros dos builds em JSON Lines (um por linha, mais antigos primeiro)."""
+    MAX_BYTES = 1_000_000  # Ao passar disso, só os KEEP_ENTRIES registros mais recentes são mantidos
+    KEEP_ENTRIES = 1000
+    _lock = threading.Lock()  # Jobs simultâneos gravam no mesmo arquivo
+
+    def __init__(self, path=BUILD_HISTORY_FILE):
+        self.path = os.fspath(path)
+
+    def append(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f: f.write(line)
+                if os.path.getsize(self.path) > self.MAX_BYTES: self._trim()
+            except OSError as e:
+                log.warning(f"Não foi possível gravar o histórico de builds: {e}")
+
+    def entries(self, project=None, name=None, mode=None) -> list[dict]:
+        """Registros (mais antigos primeiro), opcionalmente só os de um projeto/nome/modo."""
+        wanted = {"project": project and os.path.normcase(os.fspath(project)), "name": name and name.lower(), "mode": mode}
+        found = []
+        for entry in self._read():
+            key = {"project": os.path.normcase(entry.get("project", "")), "name": entry.get("name", "").lower(), "mode": entry.get("mode")}
+            if all(value is None or key[field] == value for field, value in wanted.items()): found.append(entry)
+        return found
+
+    def _read(self) -> list[dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f: lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            log.warning(f"Histórico de builds ignorado ({e})"); return []
+        entries = []
+        for line in lines:
+            try: entries.append(json.loads(line))
+            except ValueError: pass  # Linha cortada (ex.: gravação interrompida)
+        return entries
+
+    def _trim(self):
+        entries = self._read()[-self.KEEP_ENTRIES:]
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n" for entry in entries)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,94 @@
+# src/build_log.py
+"""
+Log de saída do Build Master e controle dos processos filhos, sem dependência de Tk.
+
+A thread de build escreve no BuildLog; a janela pede, a cada ciclo do after(), tudo o
+que chegou desde a última posição que exibiu e insere de uma vez. Só as linhas mais
+recentes ficam na memória; o log completo vai para um arquivo em BUILD_LOG_DIR.
+"""
+import os
+import time
+import signal
+import threading
+import subprocess
+import collections
+import itertools
+import logging
+
+from .app_config import BUILD_LOG_DIR
+
+log = logging.getLogger(__name__)
+
+class BuildLog:
+    MAX_FILES = 30  # Arquivos de log mantidos em BUILD_LOG_DIR
+
+    def __init__(self, name: str, max_lines: int = 5000, log_dir=BUILD_LOG_DIR):
+        # Só as linhas mais recentes ficam na memória (para o painel); as outras ficam só no arquivo
+        self._recent = collections.deque(maxlen=max_lines)
+        self.received = 0  # Total de linhas recebidas: a posição de quem acompanha o log
+        self._lock = threading.Lock()
+        self.log_dir = os.fspath(log_dir)
+        stem = os.path.join(self.log_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}")
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            # "x": dois logs com o mesmo nome no mesmo segundo não se sobrescrevem
+            for suffix in itertools.chain([""], (f"-{n}" for n in itertools.count(2))):
+                self.path = f"{stem}{suffix}.log"
+                try: self._file = open(self.path, "x", encoding="utf-8", buffering=1 << 16); break
+                except FileExistsError: continue
+        except OSError as e:
+            log.warning(f"Log de build não será gravado em arquivo: {e}")
+            self._file = None; self.path = None
+        self._prune_old_logs()
+
+    def write(self, text: str):
+        """Acrescenta uma ou mais linhas (de qualquer thread)."""
+        lines = str(text).split("\n")
+        with self._lock:
+            self._recent.extend(lines); self.received += len(lines)
+            if self._file: self._file.write(str(text) + "\n")
+
+    def since(self, position: int) -> tuple[list[str], int, int]:
+        """
+        Linhas recebidas depois de `position` (um valor anterior de `received`), quantas delas
+        já saíram da memória e a nova posição. Com position=0, o que há para reexibir o log.
+        """
+        with self._lock:
+            new = self.received - position
+            available = min(new, len(self._recent))
+            lines = list(itertools.islice(self._recent, len(self._recent) - available, None))
+            return lines, new - available, self.received
+
+    def close(self):
+        with self._lock:
+            if self._file: self._file.close(); self._file = None
+
+    def _prune_old_logs(self):
+        try:
+            with os.scandir(self.log_dir) as it:
+                logs = sorted((entry.path for entry in it if entry.name.endswith(".log")), reverse=True)
+            for path in logs[self.MAX_FILES:]: os.remove(path)
+        except OSError:
+            pass  # Limpeza é só uma conveniência
+
+
+def popen_group_kwargs() -> dict:
+    """Argumentos do Popen para o processo ficar em um grupo próprio, que kill_process_tree encerra inteiro."""
+    if os.name == "nt": return {"creationflags": subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def kill_process_tree(process: subprocess.Popen):
+    """Encerra o processo e todos os filhos dele (pip e PyInstaller criam subprocessos)."""
+    if process.poll() is not None: return
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True,
+                           creationflags=subprocess.CREATE_NO_WINDOW)
+        else:
+            os.killpg(process.pid, signal.SIGTERM)
+            try: process.wait(timeout=5)
+            except subprocess.TimeoutExpired: os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError) as e:
+        log.warning(f"Não foi possível encerrar o processo {process.pid}: {e}")
+        process.kill()
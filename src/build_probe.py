@@ -0,0 +1,199 @@
+# src/build_probe.py
+"""
+Perfil de um executável gerado pelo Build Master, sem dependência de Tk.
+
+- Inicialização: o executável é aberto algumas vezes minimizado e sem foco, e o tempo
+  vai até a primeira janela visível do processo (ou de um filho: no modo onefile a
+  janela é do processo extraído). A janela então recebe WM_CLOSE, para o onefile
+  apagar a pasta temporária. Só no Windows (EnumWindows); a 1ª execução logo após o
+  build é a "primeira", as outras contam como repetidas (cache de disco quente).
+- Importações: os imports de nível de módulo do script principal rodam no interpretador
+  do projeto com `-X importtime`, sem executar o app; mostra o que pesa na abertura.
+- Tamanho: os binários, dados e pacotes Python empacotados, lidos do Analysis-00.toc
+  do PyInstaller (ou, sem ele, os arquivos da pasta em dist/).
+"""
+import os
+import re
+import ast
+import time
+import statistics
+import subprocess
+import logging
+from pathlib import Path
+
+from .build_cache import NO_WINDOW
+from .build_log import popen_group_kwargs, kill_process_tree
+
+log = logging.getLogger(__name__)
+
+STARTUP_TIMEOUT = 60.0   # Segundos esperando a primeira janela
+POLL_INTERVAL = 0.01
+TOP_ITEMS = 10           # Itens listados em cada seção do relatório
+TOC_TYPES = {"PYMODULE", "PYSOURCE", "EXTENSION", "BINARY", "DATA", "ZIPFILE", "DEPENDENCY"}
+
+# --- Inicialização (Windows) ---
+if os.name == "nt":
+    import ctypes
+    from ctypes import wintypes
+
+    class _ProcessEntry(ctypes.Structure):
+        _fields_ = [("dwSize", wintypes.DWORD), ("cntUsage", wintypes.DWORD), ("th32ProcessID", wintypes.DWORD),
+                    ("th32DefaultHeapID", ctypes.c_size_t), ("th32ModuleID", wintypes.DWORD), ("cntThreads", wintypes.DWORD),
+                    ("th32ParentProcessID", wintypes.DWORD), ("pcPriClassBase", ctypes.c_long), ("dwFlags", wintypes.DWORD),
+                    ("szExeFile", ctypes.c_wchar * 260)]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True); _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    _TH32CS_SNAPPROCESS = 0x2; _WM_CLOSE = 0x0010; _SW_SHOWMINNOACTIVE = 7
+
+    def _descendants(pid: int) -> set:
+        """O processo e todos os descendentes dele."""
+        snapshot = _kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+        if snapshot in (None, wintypes.HANDLE(-1).value): return {pid}
+        children = {}
+        try:
+            entry = _ProcessEntry(); entry.dwSize = ctypes.sizeof(_ProcessEntry)
+            found = _kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while found:
+                children.setdefault(entry.th32ParentProcessID, []).append(entry.th32ProcessID)
+                found = _kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            _kernel32.CloseHandle(snapshot)
+        tree, stack = set(), [pid]
+        while stack:
+            current = stack.pop()
+            if current in tree: continue
+            tree.add(current); stack.extend(children.get(current, ()))
+        return tree
+
+    def _visible_windows() -> list[tuple[int, int]]:
+        """[(hwnd, pid)] das janelas de nível superior visíveis."""
+        windows = []
+        def callback(hwnd, _):
+            if _user32.IsWindowVisible(hwnd):
+                pid = wintypes.DWORD(); _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+                windows.append((hwnd, pid.value))
+            return True
+        _user32.EnumWindows(_WNDENUMPROC(callback), 0)
+        return windows
+
+
+def startup_time(executable, timeout: float = STARTUP_TIMEOUT, cancelled=lambda: False) -> float:
+    """Segundos até a primeira janela do executável aparecer. RuntimeError se ele fechar antes ou demorar demais."""
+    if os.name != "nt": raise RuntimeError("a medição da inicialização só está disponível no Windows")
+    startupinfo = subprocess.STARTUPINFO(); startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = _SW_SHOWMINNOACTIVE  # A 1ª ShowWindow do app usa este modo: minimizada, sem foco
+    start = time.perf_counter()
+    process = subprocess.Popen([os.fspath(executable)], cwd=os.path.dirname(os.fspath(executable)),
+                               startupinfo=startupinfo, **popen_group_kwargs())
+    try:
+        while not cancelled():
+            elapsed = time.perf_counter() - start
+            pids = _descendants(process.pid)
+            window = next((hwnd for hwnd, pid in _visible_windows() if pid in pids), None)
+            if window:
+                _user32.PostMessageW(window, _WM_CLOSE, 0, 0)
+                try: process.wait(timeout=10)
+                except subprocess.TimeoutExpired: pass  # Ex.: o app pede confirmação para fechar
+                return elapsed
+            if process.poll() is not None: raise RuntimeError(f"o executável fechou sem abrir janela (código {process.returncode})")
+            if elapsed > timeout: raise RuntimeError(f"nenhuma janela em {timeout:.0f}s")
+            time.sleep(POLL_INTERVAL)
+        raise RuntimeError("cancelado")
+    finally:
+        kill_process_tree(process)
+
+
+# --- Importações ---
+def module_imports(script) -> list[str]:
+    """Os imports absolutos que rodam ao abrir o script (fora de funções e classes), como código."""
+    tree = ast.parse(Path(script).read_bytes(), filename=os.fspath(script))
+    statements, stack = [], list(reversed(tree.body))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Import) or (isinstance(node, ast.ImportFrom) and not node.level):
+            statements.append(ast.unparse(node))
+        elif isinstance(node, (ast.If, ast.Try, ast.With)):  # Inclui `if __name__ == "__main__":` e os try/except ImportError
+            blocks = [node.body, *(handler.body for handler in getattr(node, "handlers", [])),
+                      getattr(node, "orelse", []), getattr(node, "finalbody", [])]
+            stack.extend(reversed([statement for block in blocks for statement in block]))
+    return statements
+
+
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)\s*$")
+
+def import_times(python_exe: str, script, timeout: float = 120) -> list[tuple[str, float, float]]:
+    """
+    [(módulo, próprio s, acumulado s)] dos módulos de primeiro nível importados pelo script, do mais lento.
+    Roda duas vezes e usa a segunda (a primeira pode incluir a compilação dos .pyc).
+    """
+    code = "\n".join(f"try: {statement}\nexcept Exception: pass" for statement in module_imports(script))
+    command = [python_exe, "-X", "importtime", "-c", code]
+    for _ in range(2):
+        result = subprocess.run(command, cwd=os.path.dirname(os.path.abspath(script)), capture_output=True, text=True,
+                                encoding="utf-8", errors="replace", timeout=timeout, creationflags=NO_WINDOW)
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        if match and not match.group(3):  # Sem recuo: importado diretamente, não por outro módulo
+            modules.append((match.group(4), int(match.group(1)) / 1e6, int(match.group(2)) / 1e6))
+    return sorted(modules, key=lambda module: module[2], reverse=True)
+
+
+# --- Tamanho ---
+def _toc_entries(data, found: dict):
+    """Entradas (destino, origem, tipo) de uma estrutura de TOC do PyInstaller, em qualquer nível."""
+    if isinstance(data, (tuple, list)):
+        if (len(data) == 3 and all(isinstance(item, str) or item is None for item in data) and data[2] in TOC_TYPES):
+            found.setdefault(data[0], (data[1], data[2])); return
+        for item in data: _toc_entries(item, found)
+
+
+def _size(path) -> int:
+    try: return os.path.getsize(path)
+    except (OSError, TypeError, ValueError): return 0
+
+
+def bundle_sizes(workpath, artifact) -> dict:
+    """
+    {"total": bytes do executável (ou da pasta onedir), "binaries"/"data": [(nome, bytes)],
+     "packages": [(pacote, bytes das fontes)]}, cada lista da maior para a menor.
+    """
+    artifact = Path(artifact)
+    folder = artifact.parent if artifact.parent.name == artifact.stem else None  # dist/<nome>/<nome>.exe no onedir
+    files = [Path(root) / name for root, _, names in os.walk(folder) for name in names] if folder else [artifact]
+    sizes = {"total": sum(map(_size, files)), "binaries": [], "data": [], "packages": []}
+    entries = {}
+    for toc in sorted(Path(workpath).glob("*/Analysis-00.toc")):
+        try: _toc_entries(ast.literal_eval(toc.read_text(encoding="utf-8")), entries)
+        except (OSError, ValueError, SyntaxError, MemoryError) as e: log.warning(f"TOC do PyInstaller ignorado ({toc}: {e})")
+    if entries:
+        packages = {}
+        for name, (source, kind) in entries.items():
+            if kind == "PYMODULE": packages[name.split(".")[0]] = packages.get(name.split(".")[0], 0) + _size(source)
+            elif kind in ("EXTENSION", "BINARY"): sizes["binaries"].append((name, _size(source)))
+            elif kind in ("DATA", "ZIPFILE"): sizes["data"].append((name, _size(source)))
+        sizes["packages"] = list(packages.items())
+    elif folder:  # Sem o TOC: os arquivos da pasta
+        sizes["binaries"] = [(str(path.relative_to(folder)), _size(path)) for path in files]
+    for key in ("binaries", "data", "packages"): sizes[key].sort(key=lambda item: item[1], reverse=True)
+    return sizes
+
+
+def profile_report(startup: list, imports: list, sizes: dict | None, top: int = TOP_ITEMS) -> list[str]:
+    """Linhas do relatório para o log do build."""
+    mb = lambda size: f"{size / 2**20:.1f} MB" if size >= 2**20 else f"{size / 2**10:.0f} KB"
+    lines = []
+    if startup:
+        warm = startup[1:]
+        lines.append(f"Inicialização: primeira {startup[0]:.2f}s" + (f", repetidas {statistics.median(warm):.2f}s (mediana de {len(warm)})" if warm else ""))
+    if imports:
+        lines.append("Importações mais lentas (acumulado / próprio):")
+        lines += [f"  {seconds * 1000:8.1f} ms / {own * 1000:8.1f} ms  {module}" for module, own, seconds in imports[:top]]
+    if sizes:
+        lines.append(f"Tamanho em dist/: {mb(sizes['total'])}")
+        for key, title in [("binaries", "Maiores binários"), ("packages", "Maiores pacotes Python (fontes)"), ("data", "Maiores dados")]:
+            if not sizes[key]: continue
+            lines.append(f"{title}:"); lines += [f"  {mb(size):>9}  {name}" for name, size in sizes[key][:top]]
+    return lines
@@ -3,11 +3,17 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from tkinter import filedialog, messagebox
 from pathlib import Path
-import subprocess, threading, queue, os, sys
+import queue, os, sys, time
+
+from .build_engine import BuildJob, BuildQueue
+from .build_history import BuildHistory, compare_run
 
 class BuildWindow(ttk.Toplevel):
+    LOG_MAX_LINES = 5000  # Linhas mantidas no painel; o log completo fica no arquivo do BuildLog
+    STEP_ABBREVIATIONS = {"Preparando ambiente": "dep", "Compilando": "pyi", "Analisando executável": "perf", "Criando instalador": "inst"}
+
     def __init__(self, parent):
-        super().__init__(parent); self.title("Build Master - Compilador e Instalador"); self.geometry("900x750")
+        super().__init__(parent); self.title("Build Master - Compilador e Instalador"); self.geometry("1100x800")
         self.transient(parent); self.grab_set()
 
         # --- Variáveis de UI ---
@@ -16,15 +22,22 @@ class BuildWindow(ttk.Toplevel):
         self.icon_path = tk.StringVar(); self.package_type = tk.StringVar(value="onefile")
         self.clean_build = tk.BooleanVar(value=True); self.create_installer = tk.BooleanVar(value=False)
         self.app_version = tk.StringVar(value="1.0.0"); self.app_publisher = tk.StringVar(value="Sua Empresa")
+        self.force_install = tk.BooleanVar(value=False); self.wheelhouse_path = tk.StringVar(); self.offline_install = tk.BooleanVar(value=False)
+        self.force_rebuild = tk.BooleanVar(value=False); self.profile_build = tk.BooleanVar(value=False)
         
-        self.queue = queue.Queue(); self._create_widgets(); self.after(100, self.process_queue)
+        self.max_parallel = tk.IntVar(value=min(2, os.cpu_count() or 1))
+        self.build_queue = BuildQueue(self.max_parallel.get())
+        self._jobs = {}; self._batch = []; self._polling = False
+        self._shown_job = None; self._shown_position = 0
+        self._create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         
     def _create_widgets(self):
         main_frame = ttk.Frame(self, padding=20); main_frame.pack(fill=tk.BOTH, expand=True)
 
         # Configuração do Grid para o main_frame
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(3, weight=1) # A linha do log irá expandir
+        main_frame.rowconfigure(3, weight=1) # A linha da fila e do log irá expandir
 
         # --- Seção de Configuração Unificada ---
         config_frame = ttk.Labelframe(main_frame, text="1. Configurações de Build", padding=10)
@@ -48,6 +61,10 @@ class BuildWindow(ttk.Toplevel):
         ttk.Entry(config_frame, textvariable=self.icon_path, state="readonly").grid(row=4, column=1, sticky="ew")
         ttk.Button(config_frame, text="Procurar...", command=self.select_icon).grid(row=4, column=2, padx=5)
 
+        ttk.Label(config_frame, text="Wheelhouse (opcional):").grid(row=5, column=0, sticky="w", padx=5, pady=2)
+        ttk.Entry(config_frame, textvariable=self.wheelhouse_path, state="readonly").grid(row=5, column=1, sticky="ew")
+        ttk.Button(config_frame, text="Procurar...", command=self.select_wheelhouse).grid(row=5, column=2, padx=5)
+
         # --- Seção de Opções ---
         options_frame = ttk.Labelframe(main_frame, text="2. Opções", padding=10)
         options_frame.grid(row=1, column=0, sticky="ew", pady=(0, 15))
@@ -55,16 +72,38 @@ class BuildWindow(ttk.Toplevel):
         ttk.Radiobutton(options_frame, text="Arquivo Único (.exe)", variable=self.package_type, value="onefile").grid(row=0, column=0, sticky="w", padx=5)
         ttk.Radiobutton(options_frame, text="Pasta com Arquivos", variable=self.package_type, value="onedir").grid(row=1, column=0, sticky="w", padx=5)
         ttk.Checkbutton(options_frame, text="Limpar cache antes do build (--clean)", variable=self.clean_build).grid(row=2, column=0, sticky="w", padx=5, pady=5)
+        ttk.Checkbutton(options_frame, text="Reinstalar dependências mesmo sem alterações", variable=self.force_install).grid(row=3, column=0, sticky="w", padx=5)
+        ttk.Checkbutton(options_frame, text="Instalar só da wheelhouse (offline)", variable=self.offline_install).grid(row=4, column=0, sticky="w", padx=5, pady=(5, 0))
+        ttk.Checkbutton(options_frame, text="Recompilar mesmo sem alterações", variable=self.force_rebuild).grid(row=5, column=0, sticky="w", padx=5, pady=(5, 0))
+        ttk.Checkbutton(options_frame, text="Perfilar o executável (inicialização, importações e tamanho)", variable=self.profile_build).grid(row=6, column=0, sticky="w", padx=5, pady=(5, 0))
         installer_check = ttk.Checkbutton(options_frame, text="Criar instalador após o build", variable=self.create_installer, bootstyle="success-round-toggle")
-        installer_check.grid(row=0, column=1, rowspan=3, sticky="w", padx=20)
+        installer_check.grid(row=0, column=1, rowspan=7, sticky="w", padx=20)
+        parallel_frame = ttk.Frame(options_frame); parallel_frame.grid(row=0, column=2, rowspan=7, sticky="e", padx=5)
+        ttk.Label(parallel_frame, text="Builds simultâneos:").pack(side=tk.LEFT)
+        ttk.Spinbox(parallel_frame, from_=1, to=max(1, os.cpu_count() or 1), width=4, textvariable=self.max_parallel,
+                    command=self._update_parallelism).pack(side=tk.LEFT, padx=5)
         
-        # --- Botão de Ação Único ---
-        self.btn_build = ttk.Button(main_frame, text="Iniciar Processo Completo de Build", bootstyle="success", state="disabled", command=self.run_full_process)
-        self.btn_build.grid(row=2, column=0, sticky="ew", pady=(0, 15), ipady=10)
+        # --- Botões de Ação ---
+        action_frame = ttk.Frame(main_frame); action_frame.grid(row=2, column=0, sticky="ew", pady=(0, 15))
+        action_frame.columnconfigure(0, weight=1)
+        self.btn_build = ttk.Button(action_frame, text="Adicionar Build à Fila", bootstyle="success", state="disabled", command=self.run_full_process)
+        self.btn_build.grid(row=0, column=0, sticky="ew", ipady=10)
+        self.btn_cancel = ttk.Button(action_frame, text="Cancelar", bootstyle="danger", state="disabled", command=self.cancel_build)
+        self.btn_cancel.grid(row=0, column=1, sticky="ns", padx=(10, 0))
+        ttk.Button(action_frame, text="Histórico...", bootstyle="info-outline", command=self.show_history).grid(row=0, column=2, sticky="ns", padx=(10, 0))
 
-        # --- Log ---
-        log_frame = ttk.Labelframe(main_frame, text="Log de Saída", padding=10)
-        log_frame.grid(row=3, column=0, sticky="nsew")
+        # --- Fila e Log (lado a lado) ---
+        queue_frame = ttk.Labelframe(main_frame, text="Fila de Builds e Log de Saída", padding=10)
+        queue_frame.grid(row=3, column=0, sticky="nsew")
+        panes = ttk.PanedWindow(queue_frame, orient=tk.HORIZONTAL); panes.pack(fill=tk.BOTH, expand=True)
+        jobs_frame = ttk.Frame(panes); panes.add(jobs_frame, weight=2)
+        self.jobs_tree = ttk.Treeview(jobs_frame, columns=("mode", "status", "time", "steps"), selectmode="extended")
+        for column, text, width in [("#0", "Projeto / App", 160), ("mode", "Modo", 60), ("status", "Status", 120),
+                                    ("time", "Tempo", 60), ("steps", "Etapas", 140)]:
+            self.jobs_tree.heading(column, text=text); self.jobs_tree.column(column, width=width, stretch=column == "#0")
+        self.jobs_tree.pack(fill=tk.BOTH, expand=True)
+        self.jobs_tree.bind("<<TreeviewSelect>>", self._on_job_select)
+        log_frame = ttk.Frame(panes); panes.add(log_frame, weight=3)
         log_frame.columnconfigure(0, weight=1); log_frame.rowconfigure(0, weight=1)
         self.log_text = tk.Text(log_frame, wrap=tk.WORD, state="disabled", bg="#2b2b2b", fg="white", font=("Courier New", 9))
         self.log_text.grid(row=0, column=0, sticky="nsew")
@@ -83,114 +122,146 @@ class BuildWindow(ttk.Toplevel):
             self.btn_build.config(state="normal")
         else: messagebox.showwarning("Atenção", "Não foi possível detectar 'python.exe' ou um arquivo '.py' principal. Verifique a estrutura."); self.btn_build.config(state="disabled")
 
-    # Resto do código da versão anterior estava correto, então é colado abaixo
-    # para garantir a integridade do arquivo.
     def select_icon(self): path = filedialog.askopenfilename(title="Selecione o ícone .ico", filetypes=[("Icon Files", "*.ico")]); self.icon_path.set(path) if path else None
-    def run_full_process(self): self.btn_build.config(state="disabled"); self._clear_log(); threading.Thread(target=self._build_thread, daemon=True).start()
-    def _build_thread(self):
-        python_exe = self.python_exe_path.get(); workdir = Path(self.project_root_path.get())
-        req_file = workdir / "requirements.txt"
-        self.queue.put(("log", "--- [ETAPA 1/3] Preparando Ambiente ---"))
-        install_commands = [[python_exe, "-m", "pip", "install", "--upgrade", "pip", "pyinstaller", "wheel"]]
-        if req_file.exists(): install_commands.append([python_exe, "-m", "pip", "install", "-r", str(req_file)])
-        for cmd in install_commands:
-            if not self.execute_command(cmd, workdir):
-                self.queue.put(("end", "ERRO FATAL: Falha na instalação de dependências.")); return
-        self.queue.put(("log", "Ambiente preparado com sucesso."))
-        
-        self.queue.put(("log", "\n--- [ETAPA 2/3] Compilando com PyInstaller ---"))
-        if not self._run_pyinstaller(force_onedir=self.create_installer.get()):
-            self.queue.put(("end", "ERRO FATAL: Falha na compilação.")); return
-        
-        if self.create_installer.get():
-            self.queue.put(("log", "\n--- [ETAPA 3/3] Criando Instalador ---"))
-            if not self._run_inno_setup(): self.queue.put(("end", "ERRO: Falha na criação do instalador."))
-            else: self.queue.put(("end", "SUCESSO: Processo concluído! Instalador criado."))
-        else:
-            self.queue.put(("end", "SUCESSO: Processo concluído! Executável criado."))
-    def _run_pyinstaller(self, force_onedir=False):
-        python_exe = Path(self.python_exe_path.get())
-        pyinstaller_exe = python_exe.parent / "pyinstaller.exe"
-        if not pyinstaller_exe.exists():
-            self.queue.put(("log", f"ERRO FATAL: '{pyinstaller_exe}' não encontrado.")); return False
-        
-        workdir = Path(self.project_root_path.get())
-        command = [str(pyinstaller_exe), self.script_path.get(), "--noconfirm"]
-        if force_onedir or self.package_type.get() == 'onedir': command.append("--onedir")
-        else: command.append("--onefile")
-        command.append("--windowed")
-        if self.output_name.get(): command.extend(["--name", self.output_name.get()])
-        if self.icon_path.get(): command.extend(["--icon", self.icon_path.get()])
-        if self.clean_build.get(): command.extend(["--clean"])
-        assets_path = workdir / "assets";
-        if assets_path.is_dir(): command.extend(["--add-data", f"{assets_path}{os.pathsep}assets"])
-        return self.execute_command(command, workdir)
-    def execute_command(self, command, workdir):
-        self.queue.put(("log", f"\nComando: {' '.join(command)}\nEm: {workdir}\n" + "-"*50))
-        try:
-            process = subprocess.Popen(command, cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8', errors='replace', creationflags=subprocess.CREATE_NO_WINDOW)
-            for line in iter(process.stdout.readline, ''): self.queue.put(("log", line.strip()))
-            ret_code = process.wait()
-            self.queue.put(("log", "-"*50 + f"\n---> Código de Saída: {ret_code} <---\n")); return ret_code == 0
-        except Exception as e: self.queue.put(("log", f"\nERRO CRÍTICO: {e}")); return False
+    def select_wheelhouse(self): path = filedialog.askdirectory(title="Selecione a pasta da wheelhouse (pacotes .whl locais)"); self.wheelhouse_path.set(path) if path else None
+
+    # --- Fila de builds ---
+    def run_full_process(self):
+        """Enfileira um build com a configuração atual do formulário (o formulário pode ser alterado para o próximo)."""
+        job = BuildJob(self.project_root_path.get(), self.python_exe_path.get(), self.script_path.get(), self.output_name.get(),
+                       self.package_type.get(), self.icon_path.get(), self.clean_build.get(), self.create_installer.get(),
+                       self.app_version.get(), self.app_publisher.get(), self.force_install.get(), self.wheelhouse_path.get(),
+                       self.offline_install.get(), self.force_rebuild.get(), self.profile_build.get())
+        if not self.build_queue.add(job):
+            messagebox.showwarning("Aviso", f"'{job.title}' ({job.package_type}) já está na fila."); return
+        iid = str(job.id); self._jobs[iid] = job; self._batch.append(job)
+        self.jobs_tree.insert("", tk.END, iid=iid, text=job.title, values=(job.package_type, job.status, "", ""))
+        self.jobs_tree.selection_set(iid); self.jobs_tree.see(iid)
+        self.btn_cancel.config(state="normal")
+        if not self._polling: self._polling = True; self.after(100, self.process_queue)
+    def cancel_build(self):
+        """Cancela os builds selecionados (ou todos, sem seleção): encerra os processos em execução e os filhos deles."""
+        jobs = [self._jobs[iid] for iid in self.jobs_tree.selection()]
+        if not jobs: self.build_queue.cancel_all()
+        for job in jobs: self.build_queue.cancel(job)
+    def _update_parallelism(self):
+        try: self.build_queue.set_parallelism(self.max_parallel.get())
+        except tk.TclError: pass  # Valor digitado inválido
+    def _on_close(self):
+        if self.build_queue.busy:
+            if not messagebox.askyesno("Builds em Andamento", "Cancelar os builds em andamento e fechar?"): return
+            self.build_queue.cancel_all()
+        self.destroy()
     def process_queue(self):
+        changed = set()
         try:
-            while True:
-                msg_type, value = self.queue.get_nowait()
-                if msg_type == "log": self._log(value)
-                elif msg_type == "end":
-                    self.btn_build.config(state="normal")
-                    if "ERRO" in value: messagebox.showerror("Processo Falhou", value)
-                    else: messagebox.showinfo("Processo Finalizado", value)
-                    return
-        except queue.Empty: pass; self.after(100, self.process_queue)
-    def _log(self, m): self.log_text.config(state="normal"); self.log_text.insert(tk.END, str(m) + "\n"); self.log_text.see(tk.END); self.log_text.config(state="disabled")
+            while True: changed.add(self.build_queue.queue.get_nowait()[1])
+        except queue.Empty: pass
+        running = [job for job in self._jobs.values() if job.started and not job.finished]
+        for job in changed | set(running): self._update_row(job)
+        self._flush_log()
+        if self.build_queue.busy or changed:
+            self.after(100, self.process_queue); return
+        self._polling = False; self.btn_cancel.config(state="disabled")
+        self._report_batch()
+    def _update_row(self, job):
+        iid = str(job.id)
+        if not self.jobs_tree.exists(iid): return
+        elapsed = f"{job.elapsed:.1f}s" if job.elapsed is not None else ""
+        steps = "  ".join(f"{self.STEP_ABBREVIATIONS.get(step, step)} {seconds:.1f}s" for step, seconds in job.timings.items())
+        status = f"{job.status} ⚠" if job.regressions else job.status  # Mais lento que os builds anteriores
+        self.jobs_tree.item(iid, values=(job.package_type, status, elapsed, steps))
+    def _report_batch(self):
+        """Fim de todos os builds enfileirados: um resumo (ou a mensagem do build, se era só um)."""
+        batch, self._batch = self._batch, []
+        if not batch: return
+        if len(batch) == 1:
+            value = batch[0].result or ""
+            if "ERRO" in value: messagebox.showerror("Processo Falhou", value)
+            else: messagebox.showinfo("Processo Finalizado", value)
+            return
+        failed = [job for job in batch if job.status == "Falhou"]
+        summary = f"{len(batch) - len(failed)} de {len(batch)} build(s) terminados sem erro."
+        if failed: messagebox.showerror("Builds com Falha", summary + "\n\nFalharam:\n" + "\n".join(job.title for job in failed))
+        else: messagebox.showinfo("Builds Finalizados", summary)
+
+    def show_history(self):
+        """Tempos do build selecionado (ou do último build do formulário) comparados com os anteriores."""
+        selection = self.jobs_tree.selection()
+        job = self._jobs.get(selection[-1]) if selection else None
+        if job is not None: project, name, mode = job.project_root, job.name, job.package_type
+        else:
+            project = self.project_root_path.get(); script = self.script_path.get()
+            if not project or not script: messagebox.showinfo("Histórico", "Selecione um build da fila ou um projeto."); return
+            name = self.output_name.get() or Path(script).stem
+            mode = "onedir" if self.create_installer.get() else self.package_type.get()
+        if job is not None and job.result is None:
+            messagebox.showinfo("Histórico", f"'{job.title}' ainda não terminou."); return
+        entries = BuildHistory().entries(project, name, mode)
+        if job is not None:  # Compara o build selecionado com os que vieram antes dele
+            index = next((i for i in range(len(entries) - 1, -1, -1) if entries[i].get("time") == job.started_at), None)
+            if index is None: messagebox.showinfo("Histórico", f"'{job.title}' não foi registrado no histórico."); return
+            entries = entries[:index + 1]
+        if not entries: messagebox.showinfo("Histórico", f"Nenhum build de '{name}' ({mode}) registrado."); return
+        BuildHistoryDialog(self, f"{Path(project).name} / {name} ({mode})", entries)
+
+    # --- Log do build selecionado ---
+    def _on_job_select(self, event=None):
+        selection = self.jobs_tree.selection()
+        job = self._jobs.get(selection[-1]) if selection else None
+        if job is self._shown_job: return
+        self._shown_job = job; self._shown_position = 0; self._clear_log()
+        self._flush_log()
+    def _flush_log(self):
+        """Insere de uma vez as linhas que chegaram desde o último ciclo e descarta as mais antigas do painel."""
+        job = self._shown_job
+        if job is None or job.log is None: return
+        lines, dropped, self._shown_position = job.log.since(self._shown_position)
+        if not lines: return
+        if dropped: lines.insert(0, f"[... {dropped} linha(s) omitida(s) no painel; veja o log completo ...]")
+        self.log_text.config(state="normal"); self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+        excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - self.LOG_MAX_LINES
+        if excess > 0: self.log_text.delete("1.0", f"{excess + 1}.0")
+        self.log_text.see(tk.END); self.log_text.config(state="disabled")
     def _clear_log(self): self.log_text.config(state="normal"); self.log_text.delete("1.0", tk.END); self.log_text.config(state="disabled")
-    # Dentro da classe BuildWindow em src/build_window.py
 
-    def _generate_inno_script(self):
-        app_name = self.output_name.get()
-        workdir = Path(self.project_root_path.get())
-        
-        # A compilação para instalador SEMPRE deve ser no modo "onedir"
-        dist_folder = workdir / "dist" / app_name
-        
-        # Validação crucial: verifica se a pasta de distribuição existe.
-        if not dist_folder.is_dir():
-            error_msg = f"ERRO FATAL: A pasta de distribuição '{dist_folder}' não foi encontrada. A compilação com PyInstaller (em modo 'pasta') falhou ou não foi executada."
-            self.queue.put(("log", error_msg))
-            return None # Retorna None para indicar falha
-
-        source_files = str(dist_folder / "*").replace("/", "\\")
-        main_exe = app_name + ".exe"
-        output_dir = workdir # Salva o setup.exe na raiz do projeto por padrão
-        
-        # --- CORREÇÃO DA SINTAXE: CADA DIRETIVA EM UMA NOVA LINHA ---
-        return f"""
-[Setup]
-AppName={app_name}
-AppVersion={self.app_version.get()}
-AppPublisher={self.app_publisher.get()}
-DefaultDirName={{autopf}}\\{app_name}
-OutputBaseFilename={app_name}-v{self.app_version.get()}-setup
-OutputDir={output_dir}
-Compression=lzma2
-SolidCompression=yes
-WizardStyle=modern
-
-[Languages]
-Name: "brazilianportuguese"; MessagesFile: "compiler:Languages\\BrazilianPortuguese.isl"
-
-[Tasks]
-Name: "desktopicon"; Description: "{{cm:CreateDesktopIcon}}"; GroupDescription: "Ícones Adicionais";
-
-[Files]
-Source: "{source_files}"; DestDir: "{{app}}"; Flags: ignoreversion recursesubdirs createallsubdirs
-
-[Icons]
-Name: "{{group}}\\{app_name}"; Filename: "{{app}}\\{main_exe}"
-Name: "{{autodesktop}}\\{app_name}"; Filename: "{{app}}\\{main_exe}"; Tasks: desktopicon
-
-[Run]
-Filename: "{{app}}\\{main_exe}"; Description: "{{cm:LaunchProgram, {app_name}}}"; Flags: nowait postinstall skipifsilent
-"""
\ No newline at end of file
+
+class BuildHistoryDialog(ttk.Toplevel):
+    """Último build de um app comparado fase a fase com a mediana dos anteriores, e a lista dos builds registrados."""
+    MAX_RUNS = 50  # Builds listados (os mais recentes)
+
+    def __init__(self, parent, title: str, entries: list[dict]):
+        super().__init__(parent); self.title(f"Histórico de Builds - {title}"); self.geometry("760x560")
+        self.transient(parent)
+        frame = ttk.Frame(self, padding=10); frame.pack(fill=tk.BOTH, expand=True)
+        frame.columnconfigure(0, weight=1); frame.rowconfigure(1, weight=1); frame.rowconfigure(3, weight=1)
+
+        current, previous = entries[-1], entries[:-1]
+        ttk.Label(frame, text=f"Build de {self._format_time(current)} ({current.get('status')}) comparado com a mediana dos anteriores:").grid(row=0, column=0, sticky="w")
+        phases = ttk.Treeview(frame, columns=("current", "baseline", "delta"), height=10)
+        for column, text, width in [("#0", "Fase", 220), ("current", "Atual", 90), ("baseline", "Mediana", 90), ("delta", "Diferença", 120)]:
+            phases.heading(column, text=text); phases.column(column, width=width, stretch=column == "#0")
+        phases.tag_configure("regression", foreground="#e74c3c")
+        for phase, seconds, baseline, regression in compare_run(current, previous):
+            delta = ""
+            if baseline is not None:
+                delta = f"{seconds - baseline:+.1f}s" + (f" ({(seconds / baseline - 1) * 100:+.0f}%)" if baseline else "")
+            phases.insert("", tk.END, text=("⚠ " if regression else "") + phase, tags=("regression",) if regression else (),
+                          values=(f"{seconds:.1f}s", "" if baseline is None else f"{baseline:.1f}s", delta))
+        phases.grid(row=1, column=0, sticky="nsew", pady=(5, 10))
+
+        ttk.Label(frame, text=f"Builds registrados ({len(entries)}):").grid(row=2, column=0, sticky="w")
+        runs = ttk.Treeview(frame, columns=("status", "total", "steps"), height=10)
+        for column, text, width in [("#0", "Data", 140), ("status", "Status", 90), ("total", "Total", 70), ("steps", "Etapas", 380)]:
+            runs.heading(column, text=text); runs.column(column, width=width, stretch=column == "steps")
+        for entry in reversed(entries[-self.MAX_RUNS:]):
+            skipped = set(entry.get("skipped", ()))
+            steps = "  ".join(f"{BuildWindow.STEP_ABBREVIATIONS.get(step, step)} " + ("pulada" if step in skipped else f"{seconds:.1f}s")
+                              for step, seconds in entry.get("steps", {}).items())
+            runs.insert("", tk.END, text=self._format_time(entry), values=(entry.get("status"), f"{entry.get('total', 0):.1f}s", steps))
+        runs.grid(row=3, column=0, sticky="nsew", pady=(5, 0))
+        ttk.Button(frame, text="Fechar", command=self.destroy).grid(row=4, column=0, sticky="e", pady=(10, 0))
+
+    @staticmethod
+    def _format_time(entry: dict) -> str:
+        return time.strftime("%d/%m/%Y %H:%M", time.localtime(entry["time"])) if entry.get("time") else "?"
@@ -0,0 +1,92 @@
+# src/cache_file.py
+"""
+Base dos caches persistentes por pasta (ScanCache, HashCache), sem dependência de Tk.
+
+Um arquivo por pasta (gzip + JSON) em `cache_dir`, nomeado pelo prefixo e pelo hash
+do caminho da pasta. O arquivo guarda um cabeçalho (versão, raiz e o que mais a
+subclasse exigir em `_header`) e as entradas em `_entries`; se o cabeçalho não bate,
+o cache é descartado. A gravação é atômica (arquivo temporário + os.replace) e só
+os MAX_FILES caches usados mais recentemente são mantidos.
+
+As subclasses definem PREFIX, SECTION (nome das entradas no JSON) e LABEL (para o
+log) e, ao consultar, marcam em `_visited` as entradas que ainda existem.
+"""
+import os
+import gzip
+import json
+import hashlib
+import threading
+import logging
+
+log = logging.getLogger(__name__)
+
+class CacheFile:
+    PREFIX = "cache"
+    SECTION = "entries"
+    LABEL = "cache"
+    VERSION = 1
+    MAX_FILES = 20  # Arquivos de cache mantidos (os menos usados recentemente são apagados)
+
+    def __init__(self, root_path, cache_dir):
+        self.root_path = os.path.normpath(os.path.abspath(os.fspath(root_path)))
+        self.cache_dir = os.fspath(cache_dir)
+        digest = hashlib.sha1(os.path.normcase(self.root_path).encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(self.cache_dir, f"{self.PREFIX}-{digest}.json.gz")
+        self.hits = self.misses = 0
+        self._entries = {}
+        self._visited = set()
+        self._dirty = False
+        self._loaded = False  # Lido no primeiro uso, na thread que o consultar
+        self._lock = threading.Lock()
+
+    def _header(self) -> dict:
+        return {"version": self.VERSION, "root": self.root_path}
+
+    def save(self, prune: bool = False):
+        """
+        Grava o cache se mudou. Com `prune=True` (após percorrer a pasta inteira), descarta
+        as entradas que não foram consultadas, ou seja, que não existem mais.
+        """
+        with self._lock:
+            if not self._loaded: return
+            if prune:
+                stale = self._entries.keys() - self._visited
+                for key in stale: del self._entries[key]
+                self._dirty = self._dirty or bool(stale)
+            if not self._dirty:
+                # Sem alterações: só marca o uso recente (ver _prune_old_caches)
+                try: os.utime(self.path)
+                except OSError: pass
+                return
+            data = dict(self._header(), **{self.SECTION: self._entries})
+            tmp_path = self.path + ".tmp"
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=1) as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                log.warning(f"Não foi possível gravar o cache {self.LABEL}: {e}"); return
+        self._prune_old_caches()
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, ValueError) as e:
+            log.warning(f"Cache {self.LABEL} ignorado ({e})"); return
+        if isinstance(data, dict) and all(data.get(key) == value for key, value in self._header().items()):
+            self._entries = data.get(self.SECTION, {})
+
+    def _prune_old_caches(self):
+        try:
+            with os.scandir(self.cache_dir) as it:
+                caches = [(entry.stat().st_mtime, entry.path) for entry in it
+                          if entry.name.startswith(f"{self.PREFIX}-") and entry.name.endswith(".json.gz")]
+            for _, path in sorted(caches, reverse=True)[self.MAX_FILES:]: os.remove(path)
+        except OSError:
+            pass  # Limpeza é só uma conveniência
@@ -0,0 +1,109 @@
+# src/dir_scanner.py
+"""
+Varredura de diretórios com os.scandir, sem dependência de Tk.
+
+Os padrões de IGNORED_DIRS_AND_FILES são compilados uma única vez em uma regex,
+e o tipo de cada entrada vem do cache do DirEntry (sem stat extra por arquivo).
+"""
+import os
+import re
+import fnmatch
+import queue
+import threading
+import logging
+
+from .app_config import IGNORED_DIRS_AND_FILES
+
+log = logging.getLogger(__name__)
+
+def compile_ignore_patterns(patterns) -> re.Pattern:
+    """Une os padrões glob em uma única regex (no Windows, sem diferenciar maiúsculas, como o fnmatch)."""
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns) or r"(?!)", flags)
+
+IGNORE_RE = compile_ignore_patterns(IGNORED_DIRS_AND_FILES)
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try: return entry.is_dir()
+    except OSError: return False
+
+def _sort_key(entry):
+    return (not _is_dir(entry), entry.name.lower())
+
+def scan_entries(path, ignore_re: re.Pattern = IGNORE_RE) -> list[os.DirEntry]:
+    """DirEntries de um diretório, sem os ignorados: pastas primeiro, depois por nome."""
+    with os.scandir(path) as it:
+        entries = [entry for entry in it if not ignore_re.match(entry.name)]
+    entries.sort(key=_sort_key)
+    return entries
+
+def scan_directory(path, ignore_re: re.Pattern = IGNORE_RE, cache=None) -> list[tuple[str, bool]]:
+    """Lista (nome, é_pasta) de um diretório, na mesma ordem de scan_entries (via `cache`, um ScanCache, se dado)."""
+    entries = cache.listing(path) if cache else list_directory(path, ignore_re)
+    return [(name, is_dir) for name, is_dir, _ in entries]
+
+def list_directory(path, ignore_re: re.Pattern = IGNORE_RE) -> list[tuple[str, bool, bool]]:
+    """(nome, é_pasta, é_link) de um diretório, na mesma ordem de scan_entries."""
+    return [(entry.name, _is_dir(entry), entry.is_symlink()) for entry in scan_entries(path, ignore_re)]
+
+
+class DirectoryImporter:
+    """
+    Varre uma árvore de diretórios em uma thread de trabalho e publica o resultado em lotes.
+
+    Mensagens em `self.queue`:
+      ("batch", [(chave_pai, chave, nome, é_pasta), ...])  -- pais sempre chegam antes dos filhos
+      ("end", total_de_itens, cancelado)
+    A chave da pasta raiz é 0. Com `cache` (um ScanCache do projeto), só as pastas cujo
+    mtime mudou desde a última varredura são listadas de novo, e o cache é gravado ao final.
+    """
+    BATCH_SIZE = 500
+
+    def __init__(self, root_path, ignore_re: re.Pattern = IGNORE_RE, batch_size: int = BATCH_SIZE, cache=None):
+        self.root_path = os.fspath(root_path)
+        self.ignore_re = ignore_re
+        self.cache = cache
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.count = 0
+        self._cancel_event = threading.Event()
+        self.thread = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _run(self):
+        batch = []; next_key = 1
+        stack = [(0, self.root_path)]
+        while stack and not self.cancelled:
+            parent_key, dir_path = stack.pop()
+            try:
+                entries = self.cache.listing(dir_path) if self.cache else list_directory(dir_path, self.ignore_re)
+            except PermissionError:
+                log.warning(f"Sem permissão para ler o diretório: {dir_path}"); continue
+            except OSError as e:
+                log.error(f"Erro ao ler o diretório {dir_path}: {e}"); continue
+
+            subdirs = []
+            for name, is_dir, is_link in entries:
+                batch.append((parent_key, next_key, name, is_dir))
+                # Links simbólicos para pastas aparecem na árvore, mas não são percorridos (evita ciclos)
+                if is_dir and not is_link: subdirs.append((next_key, os.path.join(dir_path, name)))
+                next_key += 1
+            stack.extend(reversed(subdirs))  # Pré-ordem: a primeira subpasta é a próxima a ser lida
+            self.count += len(entries)
+            if len(batch) >= self.batch_size:
+                self.queue.put(("batch", batch)); batch = []
+        if batch: self.queue.put(("batch", batch))
+        # Gravado na thread de trabalho; só uma varredura completa sabe quais pastas deixaram de existir
+        if self.cache: self.cache.save(prune=not self.cancelled)
+        self.queue.put(("end", self.count, self.cancelled))
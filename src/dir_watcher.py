@@ -0,0 +1,242 @@
+# src/dir_watcher.py
+"""
+Acompanhamento de alterações em uma pasta aberta como projeto, sem dependência de Tk.
+
+Só as pastas já carregadas na árvore são acompanhadas, cada uma sem as subpastas
+(add_folder, chamado ao abrir o projeto e ao expandir uma pasta): abrir um projeto
+grande continua custando só o primeiro nível. Uma pasta ainda não expandida é lida
+do disco quando for expandida, então não precisa de acompanhamento.
+
+Com o pacote opcional `watchdog` instalado, usa as notificações do sistema
+(inotify no Linux, ReadDirectoryChangesW no Windows, FSEvents no macOS), uma
+inscrição não recursiva por pasta. Sem ele, compara a cada POLL_INTERVAL segundos o
+mtime das pastas acompanhadas: só as que mudaram são relidas. Nos dois casos só
+importam criações, exclusões e renomeações (o conteúdo dos arquivos não aparece na árvore).
+
+Uma árvore importada por completo tem todas as pastas carregadas, então o número de
+pastas é limitado a MAX_FOLDERS. Com watchdog, ao passar do limite (ou se o sistema
+recusar uma inscrição, ex.: limite de inotify watches) as inscrições por pasta viram
+uma só, recursiva, na raiz; se nem essa for aceita, passa à verificação por mtime.
+Na verificação por mtime, as pastas além do limite ficam sem acompanhamento (as
+primeiras pedidas, mais perto da raiz, têm preferência). Cada troca é registrada uma vez.
+
+As alterações são agrupadas (debounce) e publicadas em `self.queue` como
+("changes", {caminhos absolutos afetados}). Quem consome confere o estado atual
+de cada caminho no disco, então a ordem e a repetição dos eventos não importam.
+"""
+import os
+import queue
+import threading
+import time
+import logging
+
+from .dir_scanner import IGNORE_RE, scan_entries
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+log = logging.getLogger(__name__)
+
+class DirectoryWatcher:
+    DEBOUNCE = 0.3        # Segundos sem novos eventos antes de publicar o lote
+    MAX_DELAY = 2.0       # Publica mesmo com eventos contínuos (ex.: uma cópia grande)
+    POLL_INTERVAL = 2.0   # Intervalo da verificação por mtime (sem watchdog)
+    MAX_FOLDERS = 1000    # Inscrições por pasta (watchdog) ou pastas verificadas por mtime
+    EVENT_TYPES = ("created", "deleted", "moved")
+
+    def __init__(self, root_path, ignore_re=IGNORE_RE, use_native: bool = True):
+        self.root_path = os.path.normpath(os.fspath(root_path))
+        self.ignore_re = ignore_re
+        self.backend = "watchdog" if use_native and Observer is not None else "polling"
+        self.queue = queue.Queue()
+        self._pending = set()
+        self._first_event = self._last_event = 0.0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._observer = None
+        self._watches = {}             # watchdog: {pasta: ObservedWatch}
+        self._recursive = False        # watchdog: uma inscrição recursiva na raiz no lugar das por pasta
+        self._folders = {}             # Pastas pedidas, na ordem (para passar à verificação por mtime)
+        self._limit_logged = False
+        self._requests = queue.SimpleQueue()  # Pastas a acompanhar (add_folder), tratadas na thread do watcher
+        self.thread = None
+        # Verificação por mtime: {pasta: (mtime_ns, {nome: é_pasta})}
+        self._listings = {}
+
+    def start(self):
+        if self.backend == "watchdog":
+            try:
+                self._observer = Observer()
+                self._observer.start()
+            except Exception as e:  # Ex.: inotify indisponível no sistema
+                log.warning(f"Notificações do sistema indisponíveis ({e}); usando verificação periódica.")
+                self._observer = None; self.backend = "polling"
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def add_folder(self, path, entries: dict | None = None):
+        """
+        Passa a acompanhar o conteúdo imediato de `path`. `entries` ({nome: é_pasta}) é o que quem
+        chamou leu da pasta: o que mudou entre essa leitura e o início do acompanhamento também é publicado.
+        """
+        self._requests.put((os.path.normpath(os.fspath(path)), entries))
+
+    def _process_requests(self) -> set:
+        """Começa a acompanhar as pastas pedidas; retorna os caminhos que já mudaram desde a leitura de quem pediu."""
+        changes = set()
+        while not self.stopped:
+            try: path, entries = self._requests.get_nowait()
+            except queue.Empty: return changes
+            if path != self.root_path and self._is_ignored(path): continue
+            self._folders[path] = None
+            followed = self._follow(path)  # Antes de ler: nada escapa entre as duas coisas
+            result = self._read_listing(path)
+            if result is None: continue
+            if followed and self.backend == "polling": self._listings[path] = result
+            if entries is not None:
+                listing = result[1]
+                changes.update(os.path.join(path, name) for name in entries.keys() | listing.keys()
+                               if entries.get(name) != listing.get(name))
+        return changes
+
+    def stop(self):
+        self._stop_event.set()
+        if self._observer:
+            self._observer.stop(); self._observer = None
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def _is_ignored(self, path: str) -> bool:
+        """Caminhos fora da raiz ou dentro de um item ignorado (ex.: .git, __pycache__)."""
+        rel = os.path.relpath(path, self.root_path)
+        if rel == "." or rel.startswith(os.pardir): return True
+        return any(self.ignore_re.match(part) for part in rel.split(os.sep))
+
+    def _add(self, paths, now: float):
+        paths = [p for p in paths if not self._is_ignored(p)]
+        if not paths: return
+        with self._lock:
+            if not self._pending: self._first_event = now
+            self._pending.update(paths); self._last_event = now
+
+    def _follow(self, path: str) -> bool:
+        """Inclui `path` no acompanhamento atual; False se ela ficou de fora (limite da verificação por mtime)."""
+        if self.backend == "watchdog":
+            if self._recursive: return True
+            if len(self._watches) >= self.MAX_FOLDERS and path not in self._watches: reason = f"mais de {self.MAX_FOLDERS} pastas"
+            else: reason = self._schedule(path)
+            if reason is None or self._watch_recursive(reason): return True
+        if path in self._listings or len(self._listings) < self.MAX_FOLDERS: return True
+        if not self._limit_logged:
+            self._limit_logged = True
+            log.warning(f"Mais de {self.MAX_FOLDERS} pastas carregadas: as demais não serão acompanhadas.")
+        return False
+
+    # --- watchdog ---
+    def dispatch(self, event):
+        """Chamado pelo Observer do watchdog (na thread dele) para cada evento."""
+        if event.event_type not in self.EVENT_TYPES: return
+        paths = [os.fsdecode(event.src_path)]
+        if event.event_type == "moved": paths.append(os.fsdecode(event.dest_path))
+        self._add(paths, time.monotonic())
+
+    def _schedule(self, path: str):
+        """Inscrição não recursiva em `path`. Retorna None ou, se o sistema a recusou, o erro."""
+        observer = self._observer
+        if observer is None: return None  # Parado
+        old = self._watches.pop(path, None)  # Pasta recriada com o mesmo nome: inscrição nova
+        if old is not None:
+            try: observer.unschedule(old)
+            except Exception: pass  # Já encerrada (a pasta foi excluída)
+        try: self._watches[path] = observer.schedule(self, path, recursive=False)
+        except FileNotFoundError: return None  # Pasta já excluída: a pasta pai relata a exclusão
+        except Exception as e:  # Ex.: limite de inotify watches atingido
+            return str(e)
+        return None
+
+    def _watch_recursive(self, reason: str) -> bool:
+        """Troca as inscrições por pasta por uma recursiva na raiz; sem ela, passa à verificação por mtime."""
+        observer = self._observer
+        if observer is None: return True  # Parado
+        for watch in self._watches.values():
+            try: observer.unschedule(watch)
+            except Exception: pass
+        self._watches.clear()
+        try:
+            self._watches[self.root_path] = observer.schedule(self, self.root_path, recursive=True)
+        except Exception as e:
+            log.warning(f"Notificações do sistema indisponíveis ({reason}; {e}); usando verificação periódica.")
+            self._fall_back_to_polling(); return False
+        self._recursive = True
+        log.warning(f"Acompanhando '{self.root_path}' com uma inscrição recursiva ({reason}).")
+        return True
+
+    def _fall_back_to_polling(self):
+        observer, self._observer = self._observer, None
+        self.backend = "polling"; self._watches.clear()
+        try: observer.stop()
+        except Exception: pass
+        for path in list(self._folders)[:self.MAX_FOLDERS]:
+            result = self._read_listing(path)
+            if result is not None: self._listings[path] = result
+
+    def _run(self):
+        """Recebe as pastas pedidas, faz a verificação por mtime (se for o caso) e publica os lotes agrupados."""
+        next_poll = time.monotonic() + self.POLL_INTERVAL
+        while not self._stop_event.wait(0.1):  # Pastas recém-expandidas entram logo; a verificação, a cada POLL_INTERVAL
+            now = time.monotonic()
+            self._add(self._process_requests(), now)
+            if self.backend == "polling" and now >= next_poll:
+                self._add(self._poll(), now); next_poll = time.monotonic() + self.POLL_INTERVAL
+            with self._lock:
+                if not self._pending: continue
+                if now - self._last_event < self.DEBOUNCE and now - self._first_event < self.MAX_DELAY: continue
+                changes, self._pending = self._pending, set()
+            self.queue.put(("changes", changes))
+
+    # --- Verificação por mtime ---
+    def _read_listing(self, path: str):
+        """(mtime_ns, {nome: é_pasta}) de uma pasta, sem os itens ignorados; None se não puder ser lida."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            entries = scan_entries(path, self.ignore_re)
+        except OSError:
+            return None
+        listing = {}
+        for entry in entries:
+            try: is_dir = entry.is_dir() and not entry.is_symlink()  # Não segue links (evita ciclos)
+            except OSError: is_dir = False
+            listing[entry.name] = is_dir
+        return mtime, listing
+
+    def _forget(self, top: str):
+        """Descarta a listagem de uma pasta removida e das subpastas dela."""
+        self._listings.pop(top, None)
+        prefix = top + os.sep
+        for path in [p for p in self._listings if p.startswith(prefix)]: del self._listings[path]
+
+    def _poll(self) -> set:
+        changes = set()
+        for path, (mtime, listing) in list(self._listings.items()):
+            if self.stopped: break
+            if path not in self._listings: continue  # Esquecida nesta mesma rodada (pasta pai removida)
+            try: current = os.stat(path).st_mtime_ns
+            except OSError: current = None
+            if current == mtime: continue
+            result = self._read_listing(path) if current is not None else None
+            if result is None:
+                self._forget(path); continue  # A pasta pai também mudou e relata a exclusão
+            self._listings[path] = result
+            new_listing = result[1]
+            for name in listing.keys() | new_listing.keys():
+                before, after = listing.get(name), new_listing.get(name)
+                if before == after: continue
+                child = os.path.join(path, name)
+                changes.add(child)
+                if before: self._forget(child)  # Uma pasta nova só é acompanhada quando for expandida
+        return changes
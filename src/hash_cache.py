@@ -0,0 +1,47 @@
+# src/hash_cache.py
+"""
+Cache persistente dos hashes de conteúdo calculados pelo organizador (modo Duplicados),
+sem dependência de Tk.
+
+Cada arquivo guarda [tamanho, mtime_ns, hash parcial, hash completo]; um hash só é
+reaproveitado se o tamanho e o mtime não mudaram, então repetir a busca em uma pasta
+já analisada custa um stat por arquivo. Um arquivo por pasta (gzip + JSON) em
+HASH_CACHE_DIR, nomeado pelo hash do caminho da pasta (ver cache_file).
+"""
+import os
+import time
+
+from .app_config import HASH_CACHE_DIR
+from .cache_file import CacheFile
+
+_SLOTS = {"partial": 2, "full": 3}
+
+class HashCache(CacheFile):
+    PREFIX = "hashes"; SECTION = "files"; LABEL = "de hashes"
+    MAX_FILES = 20       # Pastas mantidas
+    RACY_SECONDS = 2.0   # Arquivos alterados há menos que isso não são guardados (ver ScanCache)
+
+    def __init__(self, root_path, cache_dir=HASH_CACHE_DIR):
+        super().__init__(root_path, cache_dir)  # _entries: caminho relativo -> [tamanho, mtime_ns, parcial, completo]
+
+    def get(self, path: str, size: int, mtime_ns: int, kind: str) -> str | None:
+        """Hash ("partial" ou "full") guardado para o arquivo, se ele não mudou desde então."""
+        rel = os.path.relpath(path, self.root_path)
+        with self._lock:
+            if not self._loaded: self._load()
+            self._visited.add(rel)
+            cached = self._entries.get(rel)
+            digest = cached[_SLOTS[kind]] if cached and cached[0] == size and cached[1] == mtime_ns else None
+            if digest: self.hits += 1
+            else: self.misses += 1
+            return digest
+
+    def put(self, path: str, size: int, mtime_ns: int, kind: str, digest: str):
+        if time.time_ns() - mtime_ns < self.RACY_SECONDS * 1e9: return
+        rel = os.path.relpath(path, self.root_path)
+        with self._lock:
+            cached = self._entries.get(rel)
+            if not (cached and cached[0] == size and cached[1] == mtime_ns):
+                cached = self._entries[rel] = [size, mtime_ns, None, None]
+            cached[_SLOTS[kind]] = digest
+            self._dirty = True
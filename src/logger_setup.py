@@ -1,24 +1,57 @@
 # src/logger_setup.py
+"""
+Logging da aplicação. Quem registra (qualquer thread) só põe o registro em uma fila
+(QueueHandler); uma thread do QueueListener grava o app.log (com rotação) e entrega a
+mensagem à barra de status, que guarda apenas a última. A interface a exibe a cada
+StatusBarHandler.INTERVAL ms: operações que registram um log por item não inundam
+a fila de eventos do Tk.
+"""
+import atexit
+import queue
 import logging
+import logging.handlers
 import tkinter as tk
 
+LOG_FILE = "app.log"
+LOG_MAX_BYTES = 1_000_000  # Tamanho do app.log antes de passar para app.log.1
+LOG_BACKUPS = 3            # Arquivos antigos mantidos (app.log.1 ... app.log.3)
+
+_listener = None
+
 class StatusBarHandler(logging.Handler):
-    """Handler de log que envia registros para uma função de callback (status bar)."""
+    """Guarda a última mensagem; a thread da interface a repassa ao callback (status bar) no máximo a cada INTERVAL ms."""
+    INTERVAL = 100
+
     def __init__(self, status_callback):
         super().__init__()
         self.status_callback = status_callback
-    
+        self.widget = status_callback.__self__
+        self._latest = (0, "")  # (nº do registro, mensagem), trocado de uma vez pela thread do listener
+        self._shown = 0
+        self.widget.after(self.INTERVAL, self._refresh)
+
     def emit(self, record):
-        msg = self.format(record)
-        # Usa after(0, ...) para garantir que a atualização da UI seja thread-safe
-        self.status_callback.__self__.after(0, lambda: self.status_callback(msg))
+        self._latest = (self._latest[0] + 1, self.format(record))
+
+    def _refresh(self):
+        number, message = self._latest
+        if number != self._shown:
+            self._shown = number; self.status_callback(message)
+        try: self.widget.after(self.INTERVAL, self._refresh)
+        except tk.TclError: pass  # Janela destruída
 
 def setup_logging(status_update_callback):
     """Configura o sistema de logging global da aplicação."""
+    global _listener
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    # Evita adicionar handlers duplicados se a função for chamada mais de uma vez
+    if root_logger.handlers: return
+
     log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    # Handler para salvar logs detalhados em um arquivo 'app.log'
-    file_handler = logging.FileHandler('app.log', mode='w', encoding='utf-8')
+
+    # Handler para salvar logs detalhados em 'app.log' (os anteriores são mantidos com rotação)
+    file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8')
     file_handler.setFormatter(log_formatter)
     file_handler.setLevel(logging.INFO)
 
@@ -27,13 +60,19 @@ def setup_logging(status_update_callback):
     status_handler.setLevel(logging.INFO) # Apenas mensagens INFO ou superiores vão para o status
     status_handler.setFormatter(logging.Formatter('%(message)s')) # Formato simples para a UI
 
-    # Configura o logger raiz para usar os handlers
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    
-    # Evita adicionar handlers duplicados se a função for chamada mais de uma vez
-    if not root_logger.handlers:
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(status_handler)
+    # Quem registra só enfileira; a gravação e a formatação ficam na thread do listener
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, status_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    logging.info("Sistema de logging inicializado.")
 
-    logging.info("Sistema de logging inicializado.")
\ No newline at end of file
+def shutdown_logging():
+    """Grava os registros ainda na fila e fecha o app.log (ao fechar a aplicação)."""
+    global _listener
+    if _listener is None: return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers: handler.close()
@@ -5,6 +5,7 @@ from ttkbootstrap.constants import *
 from tkinter import filedialog, messagebox
 from pathlib import Path
 import logging
+import queue
 
 try: from PIL import Image, ImageTk
 except ImportError: Image = ImageTk = None
@@ -12,9 +13,12 @@ except ImportError: Image = ImageTk = None
 from . import app_config, project_templates
 from .preset_manager import PresetManager
 from .tree_manager import TreeManager
+from .tree_search import SEARCH_MODES
+from .structure_generator import build_generation_plan, StructureGenerator, GenerationJournal
+from .structure_diff import DirectoryDiff
 from .organizer_window import FolderOrganizerWindow
 from .build_window import BuildWindow
-from .logger_setup import setup_logging
+from .logger_setup import setup_logging, shutdown_logging
 
 class ProjectBuilderApp(ttk.Window):
     def __init__(self):
@@ -28,6 +32,9 @@ class ProjectBuilderApp(ttk.Window):
         # --- NOVO: Variável para rastrear o projeto ativo ---
         self.current_project_root = None 
         
+        self._export_job = None  # Renderização pendente da visualização (after_idle)
+        self._generator = None   # StructureGenerator em execução
+        self._differ = None      # DirectoryDiff (comparação com o disco) em execução
         self.status_text = tk.StringVar()
         setup_logging(self.update_status_from_log)
 
@@ -37,6 +44,7 @@ class ProjectBuilderApp(ttk.Window):
         self.preset_manager = PresetManager(app_config.PRESETS_DIR)
         self.current_preset = tk.StringVar()
         self.project_type = tk.StringVar(value="Vazio")
+        self.watch_disk = tk.BooleanVar(value=True)  # Manter a árvore de uma pasta aberta em sincronia com o disco
 
         self._create_widgets()
         
@@ -44,6 +52,7 @@ class ProjectBuilderApp(ttk.Window):
         self.tree_manager.set_on_update_callback(self._notify_update)
 
         self._bind_shortcuts()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         self._load_presets_to_combobox()
         self.update_visual_tree_export()
 
@@ -64,15 +73,20 @@ class ProjectBuilderApp(ttk.Window):
         menubar.add_cascade(label="Arquivo", menu=file_menu)
         file_menu.add_command(label="Novo Projeto", command=self.new_preset, accelerator="Ctrl+N")
         file_menu.add_command(label="Abrir Pasta...", command=self.open_folder_as_project)
+        file_menu.add_command(label="Importar Pasta Completa...", command=self.import_folder_as_project)
+        file_menu.add_checkbutton(label="Acompanhar Alterações no Disco", variable=self.watch_disk, command=self._update_watch)
         file_menu.add_separator()
         file_menu.add_command(label="Salvar como Preset...", command=self.save_preset, accelerator="Ctrl+S")
         file_menu.add_separator()
-        file_menu.add_command(label="Sair", command=self.quit)
+        file_menu.add_command(label="Sair", command=self.on_close)
 
         # Menu Ações
         actions_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Ações", menu=actions_menu)
+        actions_menu.add_command(label="Localizar...", command=self.show_search_bar, accelerator="Ctrl+F")
         actions_menu.add_command(label="Gerar Estrutura em Disco...", command=self.generate_structure_on_disk)
+        actions_menu.add_command(label="Simular Geração em Disco...", command=lambda: self.generate_structure_on_disk(dry_run=True))
+        actions_menu.add_command(label="Sincronizar com Pasta...", command=self.compare_with_folder)
         actions_menu.add_command(label="Compilar/Instalar App...", command=lambda: BuildWindow(self))
         actions_menu.add_command(label="Organizar Pasta...", command=lambda: FolderOrganizerWindow(self))
 
@@ -119,6 +133,7 @@ class ProjectBuilderApp(ttk.Window):
                   background=[('selected', select_bg)],
                   foreground=[('selected', 'white')])
 
+        self._create_search_bar(tree_frame)
         self.tree = ttk.Treeview(tree_frame, show='tree', selectmode='extended', style="Custom.Treeview")
         self.tree.pack(fill=BOTH, expand=True)
         main_panel.add(tree_frame, weight=3)
@@ -139,13 +154,69 @@ class ProjectBuilderApp(ttk.Window):
         
         main_panel.add(right_panel, weight=2)
         
+    def _create_search_bar(self, parent):
+        """Barra de busca (Ctrl+F): resultados enquanto digita, 'Próximo' e 'Selecionar Todos'."""
+        self.search_query = tk.StringVar(); self.search_mode = tk.StringVar(value="Contém")
+        self._search_job = None; self._search_results = []; self._search_pos = -1
+
+        self.search_bar = ttk.Frame(parent, padding=(5, 3))  # Só é exibida por show_search_bar
+        self.search_entry = ttk.Entry(self.search_bar, textvariable=self.search_query)
+        self.search_entry.pack(side=LEFT, fill=X, expand=True)
+        mode_cb = ttk.Combobox(self.search_bar, textvariable=self.search_mode, values=list(SEARCH_MODES), state="readonly", width=7)
+        mode_cb.pack(side=LEFT, padx=3)
+        ttk.Button(self.search_bar, text="Próximo", bootstyle="secondary", command=self.find_next).pack(side=LEFT)
+        ttk.Button(self.search_bar, text="Selecionar Todos", bootstyle="secondary", command=self.select_all_matches).pack(side=LEFT, padx=3)
+        ttk.Button(self.search_bar, text="✕", bootstyle="secondary-link", command=self.hide_search_bar).pack(side=LEFT)
+        self.search_info = ttk.Label(self.search_bar, width=14, anchor="e")
+        self.search_info.pack(side=LEFT, padx=(5, 0))
+
+        self.search_query.trace_add("write", lambda *args: self._schedule_search())
+        mode_cb.bind("<<ComboboxSelected>>", lambda e: self._schedule_search())
+        self.search_entry.bind("<Return>", lambda e: self.find_next())
+        self.search_entry.bind("<Escape>", lambda e: self.hide_search_bar())
+
+    def show_search_bar(self, event=None):
+        if not self.search_bar.winfo_ismapped(): self.search_bar.pack(fill=X, side=TOP, before=self.tree)
+        self.search_entry.focus_set(); self.search_entry.select_range(0, tk.END)
+
+    def hide_search_bar(self):
+        self.search_bar.pack_forget(); self.tree.focus_set()
+
+    def _schedule_search(self):
+        # Espera uma pausa na digitação antes de consultar o índice
+        if self._search_job: self.after_cancel(self._search_job)
+        self._search_job = self.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None; self._search_pos = -1
+        try:
+            self._search_results = self.tree_manager.search(self.search_query.get(), SEARCH_MODES[self.search_mode.get()])
+        except ValueError:
+            self._search_results = []; self.search_info.config(text="Padrão inválido"); return
+        if self._search_results: self.find_next()
+        else: self.search_info.config(text="Nenhum resultado" if self.search_query.get() else "")
+
+    def find_next(self):
+        if self._search_job: self._run_search(); return  # Ainda havia uma busca agendada
+        results = [i for i in self._search_results if i in self.tree_manager.model]
+        if not results: return
+        self._search_results = results
+        self._search_pos = (self._search_pos + 1) % len(results)
+        self.tree_manager.select_items([results[self._search_pos]])
+        self.search_info.config(text=f"{self._search_pos + 1} de {len(results)}")
+
+    def select_all_matches(self):
+        results = [i for i in self._search_results if i in self.tree_manager.model]
+        self.tree_manager.select_items(results)
+        self.search_info.config(text=f"{len(results)} selecionado(s)")
+
     def _create_details_controls(self, parent):
         parent.columnconfigure(0, weight=1)
         parent.rowconfigure(1, weight=1) # Ajustado para o Text expandir
         
         ttk.Label(parent, text="Nome do Projeto/Preset:").pack(fill=X, pady=(5,2), anchor="w")
         self.ent_name = ttk.Entry(parent); self.ent_name.pack(fill=X, pady=(0, 10))
-        self.ent_name.bind("<KeyRelease>", lambda e: self.update_visual_tree_export())
+        self.ent_name.bind("<KeyRelease>", lambda e: self.schedule_visual_tree_export())
 
         ttk.Label(parent, text="Descrição:").pack(fill=X, pady=(5,2), anchor="w")
         self.txt_desc = tk.Text(parent, height=5, wrap="word"); self.txt_desc.pack(fill=BOTH, expand=True, pady=(0, 15))
@@ -180,7 +251,7 @@ class ProjectBuilderApp(ttk.Window):
         self.context_menu.add_command(label="Novo Arquivo", command=lambda: self.tree_manager.add_file())
         self.context_menu.add_separator()
         self.context_menu.add_command(label="Copiar", accelerator="Ctrl+C", command=lambda: self.tree_manager.copy_item())
-        self.context_menu.add_command(label="Colar", accelerator="Ctrl+V", command=lambda: self.tree_manager.paste_item())
+        self.context_menu.add_command(label="Colar", accelerator="Ctrl+V", command=self.paste_items)
         self.context_menu.add_separator()
         self.context_menu.add_command(label="Renomear", accelerator="F2", command=lambda: self.tree_manager.rename_item())
         self.context_menu.add_command(label="Excluir", accelerator="Del", command=lambda: self.tree_manager.delete_selected_items())
@@ -190,6 +261,34 @@ class ProjectBuilderApp(ttk.Window):
         status_frame = ttk.Frame(self, bootstyle="primary"); status_frame.pack(side=BOTTOM, fill=X)
         self.status_label = ttk.Label(status_frame, textvariable=self.status_text, padding=(10, 5), anchor="w")
         self.status_label.pack(side=LEFT, fill=X, expand=True)
+        # Progresso e cancelamento de tarefas longas (só aparecem enquanto uma tarefa roda)
+        self.btn_cancel_task = ttk.Button(status_frame, text="Cancelar", bootstyle="danger")
+        self.task_label = ttk.Label(status_frame, padding=(10, 5))
+
+    def _begin_task(self, text, cancel_command):
+        self.task_label.config(text=text)
+        self.btn_cancel_task.config(command=cancel_command, state="normal")
+        self.btn_cancel_task.pack(side=RIGHT, padx=5, pady=2); self.task_label.pack(side=RIGHT)
+
+    def _update_task(self, text):
+        self.task_label.config(text=text)
+
+    def _end_task(self):
+        self.task_label.pack_forget(); self.btn_cancel_task.pack_forget()
+
+    def _run_tree_load(self, start_load):
+        """
+        Executa um carregamento em etapas do TreeManager: start_load(on_progress, on_done) deve iniciá-lo
+        e retornar se ele continua em segundo plano. Nesse caso mostra o progresso e o botão de cancelar.
+        """
+        def on_done(total, cancelled, error):
+            self._end_task()
+            if error: messagebox.showerror("Erro ao Carregar", f"Erro ao carregar a estrutura:\n{error}")
+        if start_load(lambda count: self._update_task(f"Carregando... {count} itens"), on_done):
+            self._begin_task("Carregando...", self.tree_manager.cancel_load)
+
+    def paste_items(self):
+        self._run_tree_load(lambda on_progress, on_done: self.tree_manager.paste_item(on_progress, on_done))
 
     def _bind_shortcuts(self):
         # --- MUDANÇA: Ligando a função diretamente ---
@@ -198,27 +297,44 @@ class ProjectBuilderApp(ttk.Window):
         self.tree.bind("<F2>", lambda e: self.tree_manager.rename_item())
         self.tree.bind("<Delete>", lambda e: self.tree_manager.delete_selected_items())
         self.tree.bind("<Control-c>", lambda e: self.tree_manager.copy_item())
-        self.tree.bind("<Control-v>", lambda e: self.tree_manager.paste_item())
-        self.tree.bind("<Control-f>", lambda e: self.tree_manager.find_item())
+        self.tree.bind("<Control-v>", lambda e: self.paste_items())
+        self.tree.bind("<Control-f>", self.show_search_bar)
         self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
         
     def _notify_update(self, message="Estrutura atualizada."):
-        self.update_visual_tree_export()
+        self.schedule_visual_tree_export()
         logging.info(message)
+
+    def schedule_visual_tree_export(self, *args):
+        """Agrupa várias alterações em uma única renderização, feita quando o loop de eventos fica ocioso."""
+        if self._export_job is None: self._export_job = self.after_idle(self._run_scheduled_export)
+
+    def _run_scheduled_export(self):
+        self._export_job = None
+        self.update_visual_tree_export()
     
     def update_status_from_log(self, message):
         self.status_text.set(message)
         
     def update_visual_tree_export(self, *args):
         project_name = self.ent_name.get().strip() or "MeuProjeto"
-        tree_text = self.tree_manager.export_to_text(project_name)
-        self.visual_tree_text.config(state="normal"); self.visual_tree_text.delete("1.0", tk.END)
-        self.visual_tree_text.insert("1.0", tree_text); self.visual_tree_text.config(state="disabled")
+        kind, payload = self.tree_manager.exporter.render(project_name)
+        text = self.visual_tree_text
+        text.config(state="normal")
+        if kind == "full":
+            text.delete("1.0", tk.END); text.insert("1.0", payload + "\n")
+        else:
+            # Reescreve só as linhas afetadas (linha 0 do exportador = linha 1 do widget)
+            for start, old_count, new_lines in payload:
+                text.delete(f"{start + 1}.0", f"{start + 1 + old_count}.0")
+                if new_lines: text.insert(f"{start + 1}.0", "\n".join(new_lines) + "\n")
+        text.config(state="disabled")
 
     def _on_tree_select(self, event=None):
-        self.tree.focus_set()
+        # Não rouba o foco da barra de busca enquanto o usuário digita
+        if self.focus_get() is not self.search_entry: self.tree.focus_set()
         item_id = self.tree_manager.get_selected_item()
-        if item_id: logging.info(f"Selecionado: {self.tree.item(item_id, 'text')}")
+        if item_id: logging.info(f"Selecionado: {self.tree_manager.model.name(item_id)}")
     
     def _show_context_menu(self, event):
         item_id = self.tree.identify_row(event.y)
@@ -247,7 +363,7 @@ class ProjectBuilderApp(ttk.Window):
 
     def open_folder_as_project(self):
         """Abre um diálogo para selecionar uma pasta e a carrega como o projeto ativo."""
-        if self.tree.get_children():
+        if self.tree_manager.has_items():
             if not messagebox.askyesno("Confirmar", "Isso substituirá a estrutura atual. Continuar?"):
                 return
 
@@ -256,32 +372,64 @@ class ProjectBuilderApp(ttk.Window):
 
         try:
             self.current_project_root = Path(path_str)
-            # Chama o método do TreeManager (que deve ter sido adicionado)
+            # Carregamento sob demanda: só o primeiro nível agora, o resto ao expandir cada pasta
             self.tree_manager.load_from_directory(self.current_project_root)
-            
-            self.ent_name.delete(0, tk.END)
-            self.ent_name.insert(0, self.current_project_root.name)
-            self.txt_desc.delete("1.0", tk.END)
-            self.txt_desc.insert("1.0", f"Estrutura carregada de: {self.current_project_root}")
-            self._update_window_title()
-            
+            self._show_opened_project()
+            self._update_watch()
             self._notify_update(f"Projeto '{self.current_project_root.name}' aberto.")
         except Exception as e:
             logging.error(f"Erro ao abrir pasta como projeto: {e}", exc_info=True)
             messagebox.showerror("Erro ao Abrir", f"Ocorreu um erro: {e}")
+
+    def import_folder_as_project(self):
+        """Importa a pasta inteira em segundo plano, com contador de progresso e botão de cancelar."""
+        if self.tree_manager.has_items():
+            if not messagebox.askyesno("Confirmar", "Isso substituirá a estrutura atual. Continuar?"):
+                return
+
+        path_str = filedialog.askdirectory(title="Selecione a Pasta do Projeto")
+        if not path_str: return
+
+        self.current_project_root = Path(path_str)
+        self._show_opened_project()
+        self._begin_task("Importando... 0 itens", self.tree_manager.cancel_import)
+        self.tree_manager.import_directory_async(
+            self.current_project_root,
+            on_progress=lambda count: self._update_task(f"Importando... {count} itens"),
+            on_done=self._on_import_done)
+
+    def _on_import_done(self, total, cancelled):
+        self._end_task()
+        if not cancelled: self._update_watch()
+
+    def _update_watch(self):
+        """Liga ou desliga o acompanhamento do disco para a pasta aberta como projeto."""
+        if self.watch_disk.get() and self.current_project_root and not self.tree_manager.is_watching():
+            self.tree_manager.watch_directory(self.current_project_root)
+        elif not self.watch_disk.get():
+            self.tree_manager.stop_watching()
+
+    def _show_opened_project(self):
+        self.ent_name.delete(0, tk.END)
+        self.ent_name.insert(0, self.current_project_root.name)
+        self.txt_desc.delete("1.0", tk.END)
+        self.txt_desc.insert("1.0", f"Estrutura carregada de: {self.current_project_root}")
+        self._update_window_title()
             
     def on_project_type_change(self, event=None):
         ptype = self.project_type.get()
         if ptype == "Vazio":
             # Se já estiver vazio, não faz nada. Se não, pergunta antes de limpar.
-            if self.tree.get_children():
+            if self.tree_manager.has_items():
                 if messagebox.askyesno("Confirmar", "Isso limpará a estrutura atual. Continuar?"):
                     self.new_preset()
         elif ptype == "App Python Básico":
-            if not self.tree.get_children() or messagebox.askyesno("Confirmar", "Isso substituirá a estrutura. Continuar?"):
-                self.new_preset() # Limpa tudo primeiro
-                self.ent_name.insert(0, "Meu App Python")
-                self.tree_manager.build_from_structure(project_templates.PYTHON_BASIC_APP)
+            if not self.tree_manager.has_items() or messagebox.askyesno("Confirmar", "Isso substituirá a estrutura. Continuar?"):
+                with self.tree_manager.batch_updates("Template 'App Python Básico' carregado."):
+                    self.new_preset() # Limpa tudo primeiro
+                    self.ent_name.insert(0, "Meu App Python")
+                    self._run_tree_load(lambda on_progress, on_done: self.tree_manager.build_from_structure(
+                        project_templates.PYTHON_BASIC_APP, on_progress=on_progress, on_done=on_done))
                 self.project_type.set("App Python Básico") # Reafirma
                 
     def _load_presets_to_combobox(self):
@@ -294,62 +442,190 @@ class ProjectBuilderApp(ttk.Window):
         if not name:
             messagebox.showwarning("Aviso", "O nome do preset não pode ser vazio.")
             return
-        if self.preset_manager.save(name, self.txt_desc.get("1.0", tk.END).strip(), self.tree_manager.get_structure()):
+        if self.tree_manager.is_loading():
+            messagebox.showwarning("Aviso", "Aguarde o fim do carregamento da estrutura.")
+            return
+        description = self.txt_desc.get("1.0", tk.END).strip()
+        self.tree_manager.load_pending()
+        compact = self._ask_compact_format(name)
+        if compact is None: return
+        if compact:
+            # Gravado direto do modelo, sem montar o dicionário aninhado
+            saved = self.preset_manager.save_compact(name, description, self.tree_manager.model.iter_nodes())
+        else:
+            saved = self.preset_manager.save(name, description, self.tree_manager.get_structure())
+        if saved:
             self._load_presets_to_combobox()
             self.current_preset.set(name)
             
+    def _ask_compact_format(self, name: str):
+        """
+        Formato do preset: um preset existente mantém o seu; um novo com muitos itens pode ir para
+        o formato compacto, se o usuário quiser. True = compacto, False = JSON, None = cancelado.
+        """
+        info = self.preset_manager.get_info(name)
+        if info: return info.get("format") == "compact"
+        count = len(self.tree_manager.model)
+        if count < app_config.COMPACT_PRESET_MIN_NODES: return False
+        return messagebox.askyesnocancel(
+            "Formato do Preset",
+            f"A estrutura tem {count} itens. Salvar no formato compacto (.archpreset), menor e mais rápido de abrir?\n\n"
+            "Sim: formato compacto (binário)\nNão: JSON (editável em qualquer editor de texto)")
+
     def load_preset_from_combobox(self, event=None):
         preset_name = self.current_preset.get()
         if not preset_name: return
 
-        if self.tree.get_children():
-            if not messagebox.askyesno("Confirmar", "Isso substituirá a estrutura atual. Continuar?"):
+        if self.tree_manager.has_items():
+            # Os metadados vêm do catálogo de presets, sem abrir o arquivo
+            info = self.preset_manager.get_info(preset_name) or {}
+            summary = f"'{preset_name}': {info.get('nodes', 0)} itens"
+            if info.get("description"): summary += f"\n{info['description'][:200]}"
+            if not messagebox.askyesno("Confirmar", f"{summary}\n\nIsso substituirá a estrutura atual. Continuar?"):
                 self.current_preset.set("") # Desfaz a seleção no combobox
                 return
         
-        preset_data = self.preset_manager.load(preset_name)
-        if preset_data:
-            self.new_preset() # Limpa o estado
-            meta = preset_data.get("metadata", {})
-            struct = preset_data.get("structure", {})
-            self.ent_name.insert(0, meta.get("name", ""))
-            self.txt_desc.insert("1.0", meta.get("description", ""))
-            self.tree_manager.build_from_structure(struct)
+        preset = self.preset_manager.load_nodes(preset_name)
+        if preset:
+            meta, nodes = preset
+            # Erros de leitura (ex.: preset compacto truncado) chegam pelo on_done do carregamento
+            with self.tree_manager.batch_updates(f"Preset '{preset_name}' carregado."):
+                self.new_preset() # Limpa o estado
+                self.ent_name.insert(0, meta.get("name", ""))
+                self.txt_desc.insert("1.0", meta.get("description", ""))
+                self._run_tree_load(lambda on_progress, on_done: self.tree_manager.build_from_nodes(
+                    nodes, on_progress=on_progress, on_done=on_done))
             self.current_preset.set(preset_name) # Reafirma a seleção
 
-    def generate_structure_on_disk(self):
-        if not self.tree.get_children():
+    def generate_structure_on_disk(self, dry_run=False):
+        """Gera a estrutura em disco em segundo plano (ou só mostra o resumo, com dry_run=True)."""
+        if not self.tree_manager.has_items():
             messagebox.showwarning("Aviso", "A estrutura da árvore está vazia. Nada a gerar.")
             return
+        if self._generator or self._differ:
+            messagebox.showwarning("Aviso", "Aguarde a tarefa em andamento terminar.")
+            return
+        if self.tree_manager.is_loading():
+            messagebox.showwarning("Aviso", "Aguarde o fim do carregamento da estrutura.")
+            return
             
         base_dir = filedialog.askdirectory(title="Selecione o diretório onde a estrutura será criada")
         if not base_dir: return
         
         try:
+            self.tree_manager.load_pending()  # Pastas abertas sob demanda ainda não varridas
             # O nome do projeto será o nome da pasta raiz no diretório de destino
             project_root_name = self.ent_name.get().strip() or "NovoProjeto"
-            project_path = Path(base_dir) / project_root_name
-            project_path.mkdir(exist_ok=True)
-            
-            self._create_recursive(project_path, "")
-            messagebox.showinfo("Sucesso", f"Estrutura do projeto '{project_root_name}' criada em:\n{base_dir}")
+            plan = build_generation_plan(self.tree_manager.model, Path(base_dir) / project_root_name, self._content_for())
         except Exception as e:
-            logging.error(f"Erro ao gerar estrutura: {e}", exc_info=True)
+            logging.error(f"Erro ao preparar a geração: {e}", exc_info=True)
             messagebox.showerror("Erro", f"Ocorreu um erro: {e}")
+            return
+
+        if dry_run:
+            messagebox.showinfo("Simulação da Geração", plan.summary())
+            return
+        self._start_generation(plan)
+
+    def _content_for(self):
+        # Usa o template se o tipo de projeto estiver definido, caso contrário cria arquivo vazio
+        return project_templates.get_template_content if self.project_type.get() != "Vazio" else lambda name: ""
+
+    def _start_generation(self, plan):
+        journal = GenerationJournal(plan.root)
+        if journal.exists():
+            answer = messagebox.askyesnocancel(
+                "Geração Incompleta",
+                f"Uma geração anterior em '{plan.root}' não foi concluída.\n\n"
+                "Sim: retomar (só o que falta ou difere será gravado)\n"
+                "Não: desfazer a geração anterior")
+            if answer is None: return
+            if not answer:
+                undone = journal.rollback()
+                self._notify_update(f"Geração anterior desfeita ({undone} alterações revertidas).")
+                return
+        self._generator = StructureGenerator(plan).start()
+        self._begin_task(f"Gerando... 0/{plan.total}", self._generator.cancel)
+        self.after(100, self._process_generation_queue)
 
-    def _create_recursive(self, base_path: Path, parent_item_id):
-        for item_id in self.tree.get_children(parent_item_id):
-            name = self.tree.item(item_id, "text")
-            current_path = base_path / name
-            if self.tree_manager.is_folder_node(item_id):
-                current_path.mkdir(parents=True, exist_ok=True)
-                self._create_recursive(current_path, item_id)
+    def _process_generation_queue(self):
+        generator = self._generator
+        try:
+            _, error, cancelled = generator.queue.get_nowait()
+        except queue.Empty:
+            self._update_task(f"Gerando... {generator.done}/{generator.plan.total}")
+            self.after(100, self._process_generation_queue); return
+
+        self._generator = None; self._end_task()
+        project_path = Path(generator.plan.root)
+        if error or cancelled:
+            if error: logging.error(f"Erro ao gerar estrutura: {error}", exc_info=error)
+            reason = f"Ocorreu um erro: {error}" if error else "A geração foi cancelada."
+            if messagebox.askyesno("Geração Interrompida", f"{reason}\n\nDesfazer as alterações feitas até aqui?\n"
+                                   "(Não: mantê-las para retomar depois, gerando novamente)"):
+                undone = generator.journal.rollback()
+                self._notify_update(f"Geração de '{project_path.name}' desfeita ({undone} alterações revertidas).")
             else:
-                # Usa o template se o tipo de projeto estiver definido, caso contrário cria arquivo vazio
-                content = project_templates.get_template_content(name) if self.project_type.get() != "Vazio" else ""
-                current_path.write_text(content, encoding="utf-8")
-        self._notify_update(f"Estrutura '{base_path.name}' criada com sucesso.")
+                self._notify_update(f"Geração de '{project_path.name}' interrompida; pode ser retomada.")
+        else:
+            self.tree_manager.clear_diff_highlight()  # Destaques de uma sincronização já aplicada
+            self._notify_update(f"Estrutura '{project_path.name}' criada com sucesso "
+                                f"({generator.done - generator.skipped} gravados, {generator.skipped} já existentes).")
+            messagebox.showinfo("Sucesso", f"Estrutura do projeto '{project_path.name}' criada em:\n{project_path.parent}")
         
+    def compare_with_folder(self):
+        """Compara a árvore com uma pasta do disco, destaca as diferenças e oferece criar só o que falta."""
+        if not self.tree_manager.has_items():
+            messagebox.showwarning("Aviso", "A estrutura da árvore está vazia. Nada a comparar.")
+            return
+        if self._generator or self._differ:
+            messagebox.showwarning("Aviso", "Aguarde a tarefa em andamento terminar.")
+            return
+        if self.tree_manager.is_loading():
+            messagebox.showwarning("Aviso", "Aguarde o fim do carregamento da estrutura.")
+            return
+        path_str = filedialog.askdirectory(title="Selecione a pasta correspondente à raiz da árvore",
+                                           initialdir=self.current_project_root)
+        if not path_str: return
+
+        self.tree_manager.load_pending()  # Pastas abertas sob demanda ainda não varridas
+        self._differ = DirectoryDiff(self.tree_manager.model, path_str).start()
+        self._begin_task("Comparando com o disco...", self._differ.cancel)
+        self.after(100, self._process_diff_queue)
+
+    def _process_diff_queue(self):
+        try:
+            _, diff, error, cancelled = self._differ.queue.get_nowait()
+        except queue.Empty:
+            self.after(100, self._process_diff_queue); return
+
+        self._differ = None; self._end_task()
+        if error:
+            logging.error(f"Erro ao comparar com o disco: {error}", exc_info=error)
+            messagebox.showerror("Erro", f"Ocorreu um erro: {error}")
+            return
+        if cancelled:
+            self._notify_update("Comparação cancelada."); return
+
+        self.tree_manager.highlight_diff(diff)
+        if diff.is_clean:
+            self._notify_update("A pasta já corresponde à árvore.")
+            messagebox.showinfo("Sincronizar com a Pasta", diff.summary()); return
+        # Itens excluídos da árvore enquanto a comparação rodava ficam de fora
+        new_ids = [node_id for node_id, _ in diff.only_in_tree if node_id in self.tree_manager.model]
+        if not new_ids:
+            messagebox.showinfo("Sincronizar com a Pasta", diff.summary()); return
+        plan = build_generation_plan(self.tree_manager.model, diff.root, self._content_for(), node_ids=new_ids)
+        if messagebox.askyesno("Sincronizar com a Pasta", f"{diff.summary()}\n\nCriar os {plan.total} item(s) "
+                               "que faltam no disco? Nada existente será alterado ou removido."):
+            self._start_generation(plan)
+
+    def on_close(self):
+        self.tree_manager.stop_watching()
+        self.tree_manager.save_scan_cache()  # Reabrir a mesma pasta só relista o que mudou
+        shutdown_logging()
+        self.destroy()
+
     def run(self):  
         """Inicia o loop principal da aplicação."""
         self.mainloop()
\ No newline at end of file
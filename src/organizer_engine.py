@@ -0,0 +1,526 @@
+# src/organizer_engine.py
+"""
+Motor do organizador de pastas (FolderOrganizerWindow), sem dependência de Tk.
+
+A classificação (extensão -> categoria, palavra-chave -> subpasta) e a varredura,
+opcionalmente recursiva, rodam em uma thread de trabalho; o resultado chega à
+janela em lotes pela fila, como na importação de pastas da árvore.
+
+As regras podem ser substituídas por um arquivo JSON do usuário (ver RuleMatcher.from_file):
+  {"extensions": {"Categoria": [".ext", ...]},
+   "keywords": {"Categoria": {"Subpasta": ["palavra", ...]}}}
+Cada seção é opcional; a que faltar usa as regras padrão abaixo.
+"""
+import os
+import re
+import json
+import errno
+import queue
+import shutil
+import hashlib
+import threading
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from .app_config import ORGANIZER_JOURNAL_DIR
+from .dir_scanner import IGNORE_RE
+from .hash_cache import HashCache
+
+log = logging.getLogger(__name__)
+
+# Dicionário principal de categorias por extensão
+EXT_MAP = {
+    "Imagens": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"],
+    "Documentos": [".pdf", ".docx", ".doc", ".txt", ".pptx", ".xlsx", ".csv", ".md", ".odt"],
+    "Apresentações": [".ppt", ".pptx"], "Planilhas": [".xls", ".xlsx"],
+    "PDFs": [".pdf"], "Textos": [".txt", ".md", ".log"], "Arquivos de Código": [".py", ".js", ".html", ".css", ".java", ".c", ".cpp"],
+    "Audio": [".mp3", ".wav", ".flac", ".m4a"], "video": [".mp4", ".mov", ".avi", ".mkv"],
+    "Arquivos": [".zip", ".rar", ".7z", ".tar", ".gz"], "code": [".py", ".js", ".html", ".css"],
+}
+REVERSE_EXT_MAP = {ext: type for type, exts in EXT_MAP.items() for ext in exts}
+
+# --- NOVO: REGRAS DE SUBPASTAS POR PALAVRA-CHAVE ---
+# Formato: CategoriaPrincipal: { NomeDaSubpasta: [lista_de_palavras_chave_em_minúsculo] }
+KEYWORD_MAP = {
+    "Documentos": {
+        "Invoices": ["invoice", "nota fiscal", "nf", "fatura"],
+        "Reports": ["report", "relatorio", "relatório"],
+        "Resumes": ["resume", "cv", "curriculo", "currículo"],
+        "Contracts": ["contract", "contrato"]
+    },
+    "Imagens": {
+        "Screenshots": ["screenshot", "captura de tela"],
+        "Logos": ["logo"]
+    },
+    "Audio": {
+        "Podcasts": ["podcast"],
+        "Music": ["music", "musica", "canção", "canção"]
+    },
+    # Você pode adicionar mais categorias e regras aqui!
+}
+OTHER_CATEGORY = "Outros"
+
+class RuleMatcher:
+    """
+    Regras de classificação compiladas uma única vez. Chamado com o nome de um arquivo,
+    devolve a pasta de destino (relativa): a categoria e, se alguma palavra-chave casar,
+    a subpasta.
+
+    A extensão leva direto (um dicionário) à categoria e às regras dela. Uma única regex
+    com todas as palavras-chave da categoria descarta de uma vez os nomes sem nenhuma;
+    só nos que casam as subpastas são testadas, cada uma com sua regex, na ordem do
+    mapa: a primeira que casar vence, como no KEYWORD_MAP.
+    """
+    def __init__(self, ext_map: dict = EXT_MAP, keyword_map: dict = KEYWORD_MAP, default: str = OTHER_CATEGORY):
+        self.categories = set(ext_map) | {default}
+        # Extensão sem o ponto -> (categoria, filtro, [(destino, busca)]); a última categoria
+        # que lista uma extensão vence, como no REVERSE_EXT_MAP
+        rules = {category: self._compile(category, keyword_map.get(category, {})) for category in self.categories}
+        self._by_ext = {ext.lower().lstrip("."): rules[category] for category, exts in ext_map.items() for ext in exts}
+        self._default = rules[default]
+
+    @staticmethod
+    def _compile(category: str, subfolders: dict):
+        def alternation(keywords):
+            # Mais longas primeiro só por eficiência; o resultado é "alguma está contida no nome"
+            return re.compile("|".join(re.escape(k.lower()) for k in sorted(keywords, key=len, reverse=True)))
+        ordered = [(os.path.join(category, name), alternation(keywords).search)
+                   for name, keywords in subfolders.items() if keywords]
+        any_keyword = alternation([k for keywords in subfolders.values() for k in keywords]).search if ordered else None
+        return category, any_keyword, ordered
+
+    def __call__(self, file_name: str) -> str:
+        lower = file_name.lower()
+        head, dot, ext = lower.rpartition(".")
+        # Mesma extensão de os.path.splitext: pontos no início do nome não contam
+        category, any_keyword, ordered = self._by_ext.get(ext, self._default) if dot and head.lstrip(".") else self._default
+        if any_keyword and any_keyword(lower):
+            for dest, search in ordered:
+                if search(lower): return dest  # Encontrou a primeira regra, para aqui
+        return category
+
+    @classmethod
+    def from_file(cls, path):
+        """Matcher com as regras de um arquivo JSON; sem o arquivo, ou se ele for inválido, as regras padrão."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            ext_map = data.get("extensions", EXT_MAP)
+            keyword_map = data.get("keywords", KEYWORD_MAP)
+            if not (isinstance(ext_map, dict) and all(isinstance(exts, list) and all(isinstance(e, str) for e in exts) for exts in ext_map.values())):
+                raise ValueError("'extensions' deve mapear categoria -> lista de extensões")
+            if not (isinstance(keyword_map, dict) and all(
+                    isinstance(subs, dict) and all(isinstance(kws, list) and all(isinstance(k, str) and k for k in kws) for kws in subs.values())
+                    for subs in keyword_map.values())):
+                raise ValueError("'keywords' deve mapear categoria -> {subpasta: lista de palavras-chave}")
+            return cls(ext_map, keyword_map)
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError, AttributeError) as e:
+            log.warning(f"Regras do organizador em '{path}' ignoradas ({e}); usando as padrão.")
+            return cls()
+
+# Classificação com as regras padrão
+classify = RuleMatcher()
+
+class OrganizePlanner:
+    """
+    Calcula em uma thread de trabalho o destino de cada arquivo de `root`.
+
+    Mensagens em `self.queue`:
+      ("batch", [(caminho de origem, pasta de destino relativa), ...])
+      ("end", nº de arquivos a mover, cancelado)
+    Ao final, `actions` tem todas as movimentações e `summary` conta os arquivos por
+    pasta de destino. No modo recursivo as subpastas também são percorridas, exceto as
+    pastas de categoria no nível da raiz (já organizadas), links simbólicos e as ignoradas
+    (IGNORED_DIRS_AND_FILES).
+    """
+    BATCH_SIZE = 1000
+
+    def __init__(self, root, recursive: bool = False, classifier=classify, ignore_re=IGNORE_RE):
+        self.root = os.fspath(root)
+        self.recursive = recursive
+        self.classifier = classifier
+        self.ignore_re = ignore_re
+        self.queue = queue.Queue()
+        self.actions = []
+        self.summary = Counter()
+        self.scanned = 0
+        self._cancel_event = threading.Event()
+        self.thread = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _skipped_dirs(self) -> set:
+        """Pastas do nível da raiz que não são percorridas no modo recursivo."""
+        return getattr(self.classifier, "categories", None) or set(EXT_MAP) | {OTHER_CATEGORY}
+
+    def _walk(self):
+        """Arquivos (os.DirEntry) de `root`, em pré-ordem e por nome; no modo recursivo, também os das subpastas."""
+        skipped = self._skipped_dirs()
+        stack = [(self.root, "")]
+        while stack and not self.cancelled:
+            dir_path, rel_dir = stack.pop()
+            try:
+                with os.scandir(dir_path) as it: entries = sorted(it, key=lambda e: e.name.lower())
+            except OSError:
+                continue  # Sem permissão ou removida durante a varredura
+            subdirs = []
+            for entry in entries:
+                try: is_file = entry.is_file(follow_symlinks=False)
+                except OSError: continue
+                if is_file:
+                    self.scanned += 1
+                    yield entry
+                elif self.recursive and entry.is_dir(follow_symlinks=False) and not self.ignore_re.match(entry.name):
+                    if rel_dir or entry.name not in skipped:
+                        subdirs.append((entry.path, os.path.join(rel_dir, entry.name)))
+            stack.extend(reversed(subdirs))
+
+    def _run(self):
+        batch = []
+        for entry in self._walk():
+            batch.append((entry.path, self.classifier(entry.name)))
+            if len(batch) >= self.BATCH_SIZE: self._flush(batch); batch = []
+        if batch: self._flush(batch)
+        self.queue.put(("end", len(self.actions), self.cancelled))
+
+    def _flush(self, batch):
+        self.actions.extend(batch)
+        self.summary.update(dest for _, dest in batch)
+        self.queue.put(("batch", batch))
+
+
+# --- Duplicados ---
+DUPLICATES_FOLDER = "Duplicados"
+PARTIAL_BLOCK = 64 * 1024  # Bytes lidos do início e do fim de cada arquivo no hash parcial
+READ_BUFFER = 1 << 20      # Buffer das leituras do hash completo
+
+def partial_hash(path: str, size: int) -> str:
+    """Hash do primeiro e do último bloco. Arquivos de até 2 blocos são lidos inteiros (o hash já é completo)."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        digest.update(f.read(PARTIAL_BLOCK))
+        if size > 2 * PARTIAL_BLOCK: f.seek(-PARTIAL_BLOCK, os.SEEK_END)
+        digest.update(f.read(PARTIAL_BLOCK))
+    return digest.hexdigest()
+
+def full_hash(path: str, cancelled=lambda: False) -> str | None:
+    """Hash do conteúdo inteiro, lido em blocos grandes em um único buffer; None se cancelado no meio."""
+    digest = hashlib.blake2b(digest_size=20)
+    buffer = bytearray(READ_BUFFER); view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buffer):
+            digest.update(view[:n])  # O hashlib libera o GIL em blocos grandes: o pool lê e calcula em paralelo
+            if cancelled(): return None
+    return digest.hexdigest()
+
+
+class DuplicateFinder(OrganizePlanner):
+    """
+    Encontra em uma thread de trabalho os arquivos de conteúdo idêntico em `root` (modo Duplicados).
+
+    Os arquivos são agrupados pelo tamanho; só os grupos com mais de um arquivo têm o
+    hash parcial (início e fim) calculado, e só os que continuam iguais têm o hash
+    completo. Os hashes são calculados em um pool de threads e guardados no HashCache.
+    Em cada grupo o arquivo mais antigo é mantido e os demais vão para DUPLICATES_FOLDER;
+    as mensagens e `actions` seguem o formato do OrganizePlanner, e `groups` tem
+    (original, [duplicados], tamanho).
+    """
+    def __init__(self, root, recursive: bool = False, ignore_re=IGNORE_RE, cache=None, max_workers: int | None = None):
+        super().__init__(root, recursive, ignore_re=ignore_re)
+        self.cache = cache if cache is not None else HashCache(self.root)
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.groups = []
+        self.original_of = {}  # duplicado -> original mantido
+        self.hashed = 0        # Arquivos comparados por conteúdo
+        self.wasted = 0        # Bytes ocupados pelos duplicados
+        self._lock = threading.Lock()
+
+    def _skipped_dirs(self) -> set:
+        return {DUPLICATES_FOLDER}
+
+    def _run(self):
+        by_size = {}
+        for entry in self._walk():
+            try: st = entry.stat(follow_symlinks=False)
+            except OSError: continue
+            if st.st_size: by_size.setdefault(st.st_size, []).append((entry.path, st.st_size, st.st_mtime_ns))
+        groups = [files for files in by_size.values() if len(files) > 1]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            groups = self._split(pool, groups, "partial")
+            # Até 2 blocos o hash parcial já cobriu o arquivo inteiro
+            exact = [files for files in groups if files[0][1] <= 2 * PARTIAL_BLOCK]
+            groups = exact + self._split(pool, [files for files in groups if files[0][1] > 2 * PARTIAL_BLOCK], "full")
+        if not self.cancelled:
+            batch = []
+            for files in sorted(groups, key=lambda files: min(path for path, _, _ in files)):
+                original, *duplicates = sorted(files, key=lambda f: (f[2], len(f[0]), f[0]))  # Mais antigo fica
+                self.groups.append((original[0], [path for path, _, _ in duplicates], original[1]))
+                self.wasted += original[1] * len(duplicates)
+                for path, _, _ in duplicates:
+                    self.original_of[path] = original[0]; batch.append((path, DUPLICATES_FOLDER))
+                if len(batch) >= self.BATCH_SIZE: self._flush(batch); batch = []
+            if batch: self._flush(batch)
+        self.cache.save(prune=self.recursive and not self.cancelled)
+        self.queue.put(("end", len(self.actions), self.cancelled))
+
+    def _split(self, pool, groups, kind: str) -> list:
+        """Subdivide cada grupo pelo hash (`kind`) dos arquivos; mantém só os subgrupos com mais de um arquivo."""
+        digests = pool.map(lambda f: self._hash(f, kind), [f for group in groups for f in group])
+        result = []
+        for group in groups:
+            by_hash = {}
+            for f in group:
+                digest = next(digests)
+                if digest: by_hash.setdefault(digest, []).append(f)
+            result += [same for same in by_hash.values() if len(same) > 1]
+        return [] if self.cancelled else result
+
+    def _hash(self, file, kind: str) -> str | None:
+        if self.cancelled: return None
+        path, size, mtime_ns = file
+        digest = self.cache.get(path, size, mtime_ns, kind)
+        if digest is None:
+            try:
+                digest = partial_hash(path, size) if kind == "partial" else full_hash(path, lambda: self.cancelled)
+            except OSError:
+                return None  # Sem permissão ou removido durante a busca: fica de fora
+            if digest: self.cache.put(path, size, mtime_ns, kind, digest)
+        with self._lock: self.hashed += 1
+        return digest
+
+    def report(self) -> str:
+        """Relatório dos grupos de duplicados, em texto, para salvar ou exibir."""
+        lines = [f"Duplicados em: {self.root}",
+                 f"{len(self.actions)} duplicado(s) em {len(self.groups)} grupo(s), {self.wasted / 2**20:.1f} MB recuperáveis.", ""]
+        for original, duplicates, size in self.groups:
+            lines.append(f"{os.path.relpath(original, self.root)}  ({size} bytes)")
+            lines += [f"  = {os.path.relpath(path, self.root)}" for path in duplicates]
+        return "\n".join(lines)
+
+
+class OrganizeJournal:
+    """
+    Diário de desfazer das organizações de uma pasta, em ORGANIZER_JOURNAL_DIR (fora da
+    pasta organizada, para não ser classificado junto com os arquivos dela).
+
+    Uma linha JSON por alteração, registrada antes de a alteração acontecer:
+      {"op": "mkdir", "path": ...} ou {"op": "move", "src": ..., "dest": ...}
+    Organizações seguidas se acumulam; undo() desfaz todas, da última para a primeira.
+    """
+    def __init__(self, root, journal_dir=ORGANIZER_JOURNAL_DIR):
+        self.root = os.path.normpath(os.path.abspath(os.fspath(root)))
+        digest = hashlib.sha1(os.path.normcase(self.root).encode("utf-8")).hexdigest()[:16]
+        self.journal_dir = os.fspath(journal_dir)
+        self.path = os.path.join(self.journal_dir, f"organize-{digest}.jsonl")
+        self._file = None
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def record(self, op: str, **fields):
+        line = json.dumps({"op": op, **fields}, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self.journal_dir, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line); self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file: self._file.close(); self._file = None
+
+    def entries(self) -> list[dict]:
+        if not self.exists(): return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try: entries.append(json.loads(line))
+                except json.JSONDecodeError: pass  # Última linha incompleta (interrupção no meio da gravação)
+        return entries
+
+    def rewrite(self, entries: list[dict]):
+        """Substitui o diário pelas entradas dadas (as que não puderam ser desfeitas); sem entradas, apaga-o."""
+        self.close()
+        if not entries:
+            if self.exists(): os.remove(self.path)
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries: f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+def _move(source: str, target: str) -> bool:
+    """os.rename quando origem e destino estão no mesmo sistema de arquivos; False se for preciso copiar."""
+    try:
+        os.rename(source, target)
+        return True
+    except OSError as e:
+        if e.errno == errno.EXDEV: return False
+        raise
+
+
+def _free_name(dest_dir: str, name: str, reserved: set) -> str:
+    """Caminho livre em dest_dir para `name`: "nome (2).ext", "nome (3).ext"... se já houver um item com o mesmo nome."""
+    stem, ext = os.path.splitext(name)
+    candidate, n = name, 1
+    while True:
+        target = os.path.join(dest_dir, candidate)
+        key = os.path.normcase(target)
+        if key not in reserved and not os.path.lexists(target):
+            reserved.add(key); return target
+        n += 1; candidate = f"{stem} ({n}){ext}"
+
+
+class _MoveWorker:
+    """
+    Base dos executores de movimentação: renomeações em série na thread de trabalho e,
+    quando a origem está em outro sistema de arquivos, cópias em um pool limitado de threads.
+    `done` conta os itens processados; `errors` guarda (origem, mensagem). Ao final publica ("end", cancelado).
+    """
+    def __init__(self, total: int, max_workers: int | None = None):
+        self.total = total
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.queue = queue.Queue()
+        self.done = 0
+        self.errors = []
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self.thread = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _advance(self, source: str | None = None, error=None):
+        with self._lock:
+            self.done += 1
+            if error is not None: self.errors.append((source, str(error)))
+
+    def _copy_move(self, source: str, target: str):
+        if self.cancelled: return
+        try: shutil.move(source, target)  # Copia e remove a origem
+        except (OSError, shutil.Error) as e: self._advance(source, e)
+        else: self._advance()
+
+    def _move_all(self, moves):
+        """Executa (origem, destino) de um iterável; as cópias vão para o pool à medida que aparecem."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for source, target in moves:
+                if self.cancelled: break
+                try:
+                    if _move(source, target): self._advance()
+                    else: pool.submit(self._copy_move, source, target)
+                except OSError as e:
+                    self._advance(source, e)
+
+
+class MoveExecutor(_MoveWorker):
+    """
+    Executa as movimentações de um OrganizePlanner em uma thread de trabalho.
+
+    Cada pasta de destino é criada uma única vez; um arquivo com o mesmo nome de outro já
+    existente no destino recebe um sufixo ("nome (2).ext"). Tudo é registrado antes no
+    OrganizeJournal, para a organização poder ser desfeita (UndoExecutor).
+    """
+    def __init__(self, root, actions, max_workers: int | None = None, journal: OrganizeJournal | None = None):
+        super().__init__(len(actions), max_workers)
+        self.root = os.fspath(root)
+        self.actions = actions
+        self.journal = journal or OrganizeJournal(self.root)
+
+    def _run(self):
+        try:
+            self._move_all(self._targets())
+        except OSError as e:  # Sem o diário não há como desfazer: nada mais é movido
+            log.error(f"Erro ao gravar o diário de organização: {e}")
+            self.errors.append((self.journal.path, str(e)))
+        finally:
+            self.journal.close()
+            self.queue.put(("end", self.cancelled))
+
+    def _targets(self):
+        ready = {}      # Pasta de destino relativa -> caminho absoluto (ou None se não pôde ser criada)
+        reserved = set()
+        for source, dest in self.actions:
+            if dest not in ready: ready[dest] = self._make_dirs(dest)
+            dest_dir = ready[dest]
+            if dest_dir is None: self._advance(source, f"não foi possível criar '{dest}'"); continue
+            target = _free_name(dest_dir, os.path.basename(source), reserved)
+            self.journal.record("move", src=source, dest=target)
+            yield source, target
+
+    def _make_dirs(self, dest: str):
+        dest_dir = os.path.join(self.root, dest)
+        missing, path = [], dest_dir
+        while not os.path.isdir(path) and path != self.root:
+            missing.append(path); path = os.path.dirname(path)
+        try:
+            for path in reversed(missing):
+                self.journal.record("mkdir", path=path); os.mkdir(path)
+        except OSError as e:
+            log.warning(f"Pasta de destino '{dest_dir}' não criada: {e}"); return None
+        return dest_dir
+
+
+class UndoExecutor(_MoveWorker):
+    """
+    Desfaz em uma thread de trabalho as organizações registradas no OrganizeJournal: devolve
+    cada arquivo ao lugar de origem e remove as pastas criadas que ficaram vazias. O que não
+    pôde ser desfeito (ex.: origem ocupada por outro arquivo) ou ficou para trás por um
+    cancelamento continua no diário, para uma nova tentativa.
+    """
+    def __init__(self, root, max_workers: int | None = None, journal: OrganizeJournal | None = None):
+        self.journal = journal or OrganizeJournal(root)
+        self.entries = self.journal.entries()
+        super().__init__(len(self.entries), max_workers)
+
+    def _run(self):
+        try:
+            self._move_all(self._targets())  # Aguarda as cópias do pool terminarem
+            if not self.cancelled:
+                for entry in reversed(self.entries):
+                    if entry.get("op") != "mkdir": continue
+                    try: os.rmdir(entry["path"])
+                    except OSError: pass  # Já removida, ou recebeu outros arquivos depois da organização
+                    self._advance()
+            # O estado do disco decide o que ainda falta desfazer
+            left = [entry for entry in self.entries if entry.get("op") == "move" and os.path.lexists(entry["dest"])]
+            if left: left = [entry for entry in self.entries if entry.get("op") == "mkdir"] + left
+            self.journal.rewrite(left)
+        except OSError as e:
+            log.warning(f"Diário de organização não atualizado: {e}")
+        finally:
+            self.queue.put(("end", self.cancelled))
+
+    def _targets(self):
+        for entry in reversed(self.entries):
+            if entry.get("op") != "move": continue
+            source, target = entry["dest"], entry["src"]
+            if not os.path.lexists(source): self._advance(); continue  # Não chegou a ser movido
+            if os.path.lexists(target): self._advance(source, f"'{target}' já existe"); continue
+            try: os.makedirs(os.path.dirname(target), exist_ok=True)
+            except OSError as e: self._advance(source, e); continue
+            yield source, target
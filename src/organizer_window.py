@@ -3,47 +3,27 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from tkinter import filedialog, messagebox
 from pathlib import Path
-import shutil, os
-
-# Dicionário principal de categorias por extensão
-EXT_MAP = {
-    "Imagens": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"],
-    "Documentos": [".pdf", ".docx", ".doc", ".txt", ".pptx", ".xlsx", ".csv", ".md", ".odt"],
-    "Apresentações": [".ppt", ".pptx"], "Planilhas": [".xls", ".xlsx"],
-    "PDFs": [".pdf"], "Textos": [".txt", ".md", ".log"], "Arquivos de Código": [".py", ".js", ".html", ".css", ".java", ".c", ".cpp"],
-    "Audio": [".mp3", ".wav", ".flac", ".m4a"], "video": [".mp4", ".mov", ".avi", ".mkv"],
-    "Arquivos": [".zip", ".rar", ".7z", ".tar", ".gz"], "code": [".py", ".js", ".html", ".css"],
-}
-REVERSE_EXT_MAP = {ext: type for type, exts in EXT_MAP.items() for ext in exts}
-
-# --- NOVO: REGRAS DE SUBPASTAS POR PALAVRA-CHAVE ---
-# Formato: CategoriaPrincipal: { NomeDaSubpasta: [lista_de_palavras_chave_em_minúsculo] }
-KEYWORD_MAP = {
-    "Documentos": {
-        "Invoices": ["invoice", "nota fiscal", "nf", "fatura"],
-        "Reports": ["report", "relatorio", "relatório"],
-        "Resumes": ["resume", "cv", "curriculo", "currículo"],
-        "Contracts": ["contract", "contrato"]
-    },
-    "Imagens": {
-        "Screenshots": ["screenshot", "captura de tela"],
-        "Logos": ["logo"]
-    },
-    "Audio": {
-        "Podcasts": ["podcast"],
-        "Music": ["music", "musica", "canção", "canção"]
-    },
-    # Você pode adicionar mais categorias e regras aqui!
-}
+import queue, os, time
+
+# Regras e motor de classificação (sem Tk)
+from .organizer_engine import RuleMatcher, OrganizePlanner, MoveExecutor, UndoExecutor, OrganizeJournal, DuplicateFinder, DUPLICATES_FOLDER
+from .app_config import ORGANIZER_RULES_FILE
 
 class FolderOrganizerWindow(ttk.Toplevel):
-    # O __init__ e _create_widgets podem ser mantidos, a mudança principal é na lógica.
+    PREVIEW_LIMIT = 2000  # Linhas de ação mostradas; o resto aparece só no resumo
+    MODE_DUPLICATES = "Duplicados"
+
     def __init__(self, parent):
         super().__init__(parent); self.title("Organizador de Pastas Avançado"); self.geometry("750x550")
         self.transient(parent); self.grab_set()
         self.target_dir = tk.StringVar(); self.organize_mode = tk.StringVar(value="Por Tipo e Palavra-Chave")
+        self.recursive = tk.BooleanVar(value=False); self.progress_text = tk.StringVar()
+        self._planner = None; self._executor = None; self._preview_lines = 0
+        self._after_ids = {}  # Ciclo de acompanhamento agendado ("preview"/"move") -> id do after(), cancelado ao fechar
+        self._matcher = RuleMatcher.from_file(ORGANIZER_RULES_FILE)  # Relido a cada abertura da janela
         self._create_widgets()
-    
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
     def _create_widgets(self):
         main_frame = ttk.Frame(self, padding=15); main_frame.pack(fill=tk.BOTH, expand=True)
         top_frame = ttk.Frame(main_frame); top_frame.pack(fill=tk.X, expand=False, pady=(0, 10))
@@ -53,57 +33,178 @@ class FolderOrganizerWindow(ttk.Toplevel):
         ttk.Entry(dir_frame, textvariable=self.target_dir, state="readonly").grid(row=0, column=0, sticky="ew", padx=(0, 5))
         ttk.Button(dir_frame, text="Procurar...", command=self.select_directory).grid(row=0, column=1)
         mode_frame = ttk.Labelframe(top_frame, text="2. Modo de Organização", padding=10); mode_frame.grid(row=0, column=1, sticky="ns", padx=(10, 0))
-        modes = ["Por Tipo e Palavra-Chave"]; ttk.Combobox(mode_frame, textvariable=self.organize_mode, values=modes, state="readonly").pack()
+        modes = ["Por Tipo e Palavra-Chave", self.MODE_DUPLICATES]
+        mode_combo = ttk.Combobox(mode_frame, textvariable=self.organize_mode, values=modes, state="readonly"); mode_combo.pack()
+        mode_combo.bind("<<ComboboxSelected>>", lambda e: self.run_preview())
+        ttk.Checkbutton(mode_frame, text="Incluir subpastas", variable=self.recursive, command=self.run_preview).pack(anchor="w", pady=(5, 0))
+
         log_frame = ttk.Labelframe(main_frame, text="3. Pré-visualização das Ações", padding=10); log_frame.pack(fill=tk.BOTH, expand=True, pady=10)
-        self.log_text = tk.Text(log_frame, wrap=tk.WORD, height=10, state="disabled"); self.log_text.pack(fill=tk.BOTH, expand=True)
+        notebook = ttk.Notebook(log_frame); notebook.pack(fill=tk.BOTH, expand=True)
+        # Resumo: arquivos por categoria e subpasta de destino
+        summary_frame = ttk.Frame(notebook); notebook.add(summary_frame, text="Resumo")
+        self.summary_tree = ttk.Treeview(summary_frame, columns=("count",), height=8)
+        self.summary_tree.heading("#0", text="Destino"); self.summary_tree.heading("count", text="Arquivos")
+        self.summary_tree.column("count", width=100, anchor="e", stretch=False)
+        self.summary_tree.pack(fill=tk.BOTH, expand=True)
+        actions_frame = ttk.Frame(notebook); notebook.add(actions_frame, text="Ações")
+        self.log_text = tk.Text(actions_frame, wrap=tk.WORD, height=10, state="disabled"); self.log_text.pack(fill=tk.BOTH, expand=True)
+
         action_frame = ttk.Frame(main_frame); action_frame.pack(fill=tk.X, expand=False)
+        ttk.Label(action_frame, textvariable=self.progress_text).pack(side=tk.LEFT)
         self.btn_organize = ttk.Button(action_frame, text="Organizar Agora!", bootstyle="success", state="disabled", command=self.run_organize); self.btn_organize.pack(side=tk.RIGHT)
+        self.btn_cancel = ttk.Button(action_frame, text="Cancelar", bootstyle="danger", state="disabled", command=self.cancel); self.btn_cancel.pack(side=tk.RIGHT, padx=5)
+        self.btn_undo = ttk.Button(action_frame, text="Desfazer Organização", bootstyle="secondary", state="disabled", command=self.run_undo); self.btn_undo.pack(side=tk.RIGHT)
+        self.btn_report = ttk.Button(action_frame, text="Salvar Relatório...", bootstyle="secondary", state="disabled", command=self.save_report); self.btn_report.pack(side=tk.RIGHT, padx=5)
 
-    def _organize_directory(self, dry_run=True):
-        self._clear_log(); path = Path(self.target_dir.get())
-        if not path.is_dir(): return
-        self._log(f"Analisando '{path.name}'...\n")
-        
-        files_to_move = [f for f in path.iterdir() if f.is_file()]
-        if not files_to_move: self._log("Nenhum arquivo encontrado para organizar."); return
-
-        for file_path in files_to_move:
-            file_name_lower = file_path.name.lower()
-            main_category = REVERSE_EXT_MAP.get(file_path.suffix.lower(), "Outros")
-            
-            # --- NOVA LÓGICA DE SUBPASTA ---
-            subfolder = None
-            if main_category in KEYWORD_MAP:
-                for subfolder_name, keywords in KEYWORD_MAP[main_category].items():
-                    if any(keyword in file_name_lower for keyword in keywords):
-                        subfolder = subfolder_name
-                        break # Encontrou a primeira regra, para aqui
-            
-            # Monta o caminho final
-            if subfolder:
-                dest_path = path / main_category / subfolder
-            else:
-                dest_path = path / main_category
-            
-            if not dry_run:
-                dest_path.mkdir(parents=True, exist_ok=True)
-                shutil.move(str(file_path), str(dest_path))
-            relative_dest = dest_path.relative_to(path)
-            self._log(f"Mover: '{file_path.name}'  ->  '\\{relative_dest}\\'")
-        
-        self._log("\nAnálise concluída.")
-
-    # O resto das funções (select_directory, run_preview, run_organize, log, etc.) permanece o mesmo.
+    # --- Pré-visualização (OrganizePlanner em segundo plano) ---
     def select_directory(self):
         path = filedialog.askdirectory(title="Selecione uma pasta")
         if path:
-            self.target_dir.set(path); self.btn_organize.config(state="normal"); self.run_preview()
+            self.target_dir.set(path); self.run_preview()
+
     def run_preview(self):
-        if self.target_dir.get(): self._organize_directory(dry_run=True)
+        if not self.target_dir.get() or self._executor: return
+        path = Path(self.target_dir.get())
+        if not path.is_dir(): return
+        if self._planner: self._planner.cancel()
+        self._clear_log(); self.summary_tree.delete(*self.summary_tree.get_children()); self._preview_lines = 0
+        self._log(f"Analisando '{path.name}'...\n")
+        self.btn_undo.config(state="normal" if OrganizeJournal(path).exists() else "disabled")
+        if self.organize_mode.get() == self.MODE_DUPLICATES:
+            self._planner = DuplicateFinder(path, recursive=self.recursive.get()).start()
+        else:
+            self._planner = OrganizePlanner(path, recursive=self.recursive.get(), classifier=self._matcher).start()
+        self.btn_organize.config(state="disabled"); self.btn_report.config(state="disabled"); self.btn_cancel.config(state="normal")
+        self._schedule("preview", 50, self._process_preview_queue, self._planner)
+
+    def _process_preview_queue(self, planner):
+        if planner is not self._planner: return  # Pré-visualização substituída
+        lines = []; deadline = time.perf_counter() + 0.05
+        try:
+            while time.perf_counter() < deadline:
+                msg = planner.queue.get_nowait()
+                if msg[0] == "batch":
+                    lines += self._preview_batch(msg[1])
+                elif msg[0] == "end":
+                    self._log_lines(lines); self._finish_preview(planner, msg[1], msg[2]); return
+        except queue.Empty: pass
+        self._log_lines(lines)  # Um único insert por ciclo, em vez de um por arquivo
+        progress = f"{planner.scanned} arquivo(s) analisado(s)"
+        if isinstance(planner, DuplicateFinder) and planner.hashed: progress += f", {planner.hashed} comparado(s) por conteúdo"
+        self.progress_text.set(progress + "...")
+        self._schedule("preview", 50, self._process_preview_queue, planner)
+
+    def _preview_batch(self, batch):
+        room = self.PREVIEW_LIMIT - self._preview_lines
+        if room <= 0: return []
+        self._preview_lines += min(room, len(batch))
+        root = self.target_dir.get()
+        if isinstance(self._planner, DuplicateFinder):
+            return [f"Duplicado: '{os.path.relpath(source, root)}'  =  '{os.path.relpath(self._planner.original_of[source], root)}'"
+                    for source, _ in batch[:room]]
+        return [f"Mover: '{os.path.relpath(source, root)}'  ->  '\\{dest}\\'" for source, dest in batch[:room]]
+
+    def _finish_preview(self, planner, total, cancelled):
+        self.btn_cancel.config(state="disabled")
+        if cancelled:
+            self._planner = None; self.progress_text.set("Análise cancelada."); return
+        self._show_summary(planner)
+        if isinstance(planner, DuplicateFinder):
+            self._log(f"{total} duplicado(s) em {len(planner.groups)} grupo(s), {planner.wasted / 2**20:.1f} MB recuperáveis.")
+            if planner.groups: self.btn_report.config(state="normal")
+        if not total: self._log("Nenhum arquivo encontrado para organizar.")
+        elif total > self._preview_lines: self._log(f"... e mais {total - self._preview_lines} arquivo(s) (veja o Resumo).")
+        self._log("\nAnálise concluída.")
+        self.progress_text.set(f"{total} arquivo(s) a mover.")
+        if total: self.btn_organize.config(state="normal")
+
+    def _show_summary(self, planner):
+        if isinstance(planner, DuplicateFinder):
+            # Um item por grupo: o arquivo mantido e quantas cópias dele serão movidas
+            if not planner.groups: return
+            parent = self.summary_tree.insert("", tk.END, text=DUPLICATES_FOLDER, values=(len(planner.actions),), open=True)
+            for original, duplicates, _ in planner.groups[:self.PREVIEW_LIMIT]:
+                self.summary_tree.insert(parent, tk.END, text=os.path.relpath(original, planner.root), values=(len(duplicates),))
+            return
+        categories = {}
+        for dest, count in sorted(planner.summary.items()):
+            category, _, subfolder = dest.partition(os.sep)
+            if category not in categories:
+                categories[category] = [self.summary_tree.insert("", tk.END, text=category, values=(0,)), 0]
+            categories[category][1] += count
+            if subfolder: self.summary_tree.insert(categories[category][0], tk.END, text=subfolder, values=(count,))
+        for item_id, total in categories.values(): self.summary_tree.item(item_id, values=(total,))
+
+    def save_report(self):
+        planner = self._planner
+        if not isinstance(planner, DuplicateFinder) or not planner.groups: return
+        path = filedialog.asksaveasfilename(title="Salvar Relatório de Duplicados", defaultextension=".txt",
+                                            initialfile="duplicados.txt", filetypes=[("Texto", "*.txt")])
+        if not path: return
+        try:
+            with open(path, "w", encoding="utf-8") as f: f.write(planner.report() + "\n")
+        except OSError as e:
+            messagebox.showerror("Erro", f"Não foi possível salvar o relatório: {e}")
+
+    # --- Execução (MoveExecutor / UndoExecutor em segundo plano) ---
     def run_organize(self):
-        if messagebox.askyesno("Confirmar Organização", "Isso moverá os arquivos permanentemente. Tem certeza?"):
-            self._organize_directory(dry_run=False); messagebox.showinfo("Sucesso", "A pasta foi organizada com sucesso!")
+        planner = self._planner
+        if not planner or not planner.actions: return
+        if messagebox.askyesno("Confirmar Organização", f"Isso moverá {len(planner.actions)} arquivo(s). "
+                               "A organização poderá ser desfeita depois. Continuar?"):
+            self._start_executor(MoveExecutor(planner.root, planner.actions), "Movendo")
+
+    def run_undo(self):
+        if not self.target_dir.get() or self._executor: return
+        if messagebox.askyesno("Desfazer Organização", "Devolver os arquivos movidos pelas organizações desta pasta aos lugares de origem?"):
+            if self._planner: self._planner.cancel(); self._planner = None
+            self._start_executor(UndoExecutor(self.target_dir.get()), "Desfazendo")
+
+    def _start_executor(self, executor, verb):
+        self._executor = executor.start()
+        self.btn_organize.config(state="disabled"); self.btn_undo.config(state="disabled"); self.btn_cancel.config(state="normal")
+        self._schedule("move", 100, self._process_move_queue, verb)
+
+    def _process_move_queue(self, verb):
+        executor = self._executor
+        try:
+            _, cancelled = executor.queue.get_nowait()
+        except queue.Empty:
+            self.progress_text.set(f"{verb}... {executor.done}/{executor.total}")
+            self._schedule("move", 100, self._process_move_queue, verb); return
+        self._executor = None; self.btn_cancel.config(state="disabled")
+        moved = executor.done - len(executor.errors)
+        undo = isinstance(executor, UndoExecutor)
+        if executor.errors:
+            self._log(f"\n{len(executor.errors)} arquivo(s) não puderam ser {'devolvidos' if undo else 'movidos'}:")
+            self._log_lines([f"  {os.path.basename(source)}: {error}" for source, error in executor.errors[:self.PREVIEW_LIMIT]])
+        if cancelled: messagebox.showinfo("Cancelado", f"Operação interrompida: {moved} item(ns) processado(s).")
+        elif executor.errors: messagebox.showwarning("Concluído com Erros", f"{moved} item(ns) processado(s), {len(executor.errors)} com erro.")
+        elif undo: messagebox.showinfo("Sucesso", "A organização foi desfeita.")
+        else: messagebox.showinfo("Sucesso", "A pasta foi organizada com sucesso!")
+        self.run_preview()
+
+    def cancel(self):
+        if self._executor: self._executor.cancel()
+        elif self._planner: self._planner.cancel()
+
+    def _schedule(self, key, ms, callback, *args):
+        """after() que substitui o ciclo anterior do mesmo tipo e guarda o id para _on_close."""
+        if key in self._after_ids: self.after_cancel(self._after_ids[key])
+        self._after_ids[key] = self.after(ms, callback, *args)
+
+    def _on_close(self):
+        # As threads de trabalho param no próximo item; movimentações já feitas permanecem
+        if self._planner: self._planner.cancel()
+        if self._executor: self._executor.cancel()
+        for after_id in self._after_ids.values(): self.after_cancel(after_id)  # Nada mais roda sobre os widgets destruídos
+        self._after_ids.clear()
+        self.destroy()
+
     def _log(self, message):
-        self.log_text.config(state="normal"); self.log_text.insert(tk.END, message + "\n"); self.log_text.see(tk.END); self.log_text.config(state="disabled")
+        self._log_lines([message])
+    def _log_lines(self, lines):
+        if not lines: return
+        self.log_text.config(state="normal"); self.log_text.insert(tk.END, "\n".join(lines) + "\n"); self.log_text.see(tk.END); self.log_text.config(state="disabled")
     def _clear_log(self):
-        self.log_text.config(state="normal"); self.log_text.delete("1.0", tk.END); self.log_text.config(state="disabled")
\ No newline at end of file
+        self.log_text.config(state="normal"); self.log_text.delete("1.0", tk.END); self.log_text.config(state="disabled")
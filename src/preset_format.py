@@ -0,0 +1,99 @@
+# src/preset_format.py
+"""
+Formato compacto de presets (.archpreset), para estruturas muito grandes.
+
+Em vez do dicionário aninhado do JSON, a árvore é gravada como uma lista plana em
+pré-ordem com colunas de profundidade, flags e índice do nome, e uma tabela de nomes
+sem repetição (ex.: "__init__.py" é gravado uma só vez). O arquivo pode ser
+comprimido com gzip. A leitura é em fluxo: os nós vão direto para o TreeModel, sem
+montar o dicionário aninhado.
+
+Layout (após descompressão, se houver):
+    MAGIC | u32 tamanho + metadados JSON | u32 tamanho + nomes UTF-8, cada um seguido de "\\0"
+    | u32 nº de nós | nós: registros "<HBI" (profundidade, flags, índice do nome)
+
+Arquivos antigos gravavam os nomes só separados por "\\0" (sem o último); os dois jeitos
+são lidos igual, já que o nome vazio extra no fim nunca é referenciado por um nó.
+Dados corrompidos (gzip inválido, blocos truncados, índices fora da tabela) sempre
+resultam em ValueError.
+"""
+import gzip
+import json
+import zlib
+import struct
+
+MAGIC = b"ARCHPRESET\x01"
+GZIP_MAGIC = b"\x1f\x8b"
+FLAG_FOLDER = 0x01
+_U32 = struct.Struct("<I")
+_NODE = struct.Struct("<HBI")
+_READ_NODES = 4096  # Nós decodificados por leitura
+
+def write_compact_preset(path, metadata: dict, nodes, compress: bool = True) -> int:
+    """
+    Grava os nós (iterável de (profundidade, é_pasta, nome), como TreeModel.iter_nodes).
+    Retorna o nº de nós gravados.
+    """
+    name_index = {}; records = bytearray(); count = 0
+    for depth, is_folder, name in nodes:
+        index = name_index.setdefault(name, len(name_index))
+        records += _NODE.pack(depth, FLAG_FOLDER if is_folder else 0, index)
+        count += 1
+    meta_bytes = json.dumps(dict(metadata, nodes=count), ensure_ascii=False).encode("utf-8")
+    names_bytes = "".join(f"{name}\0" for name in name_index).encode("utf-8")  # Um nome vazio também ocupa espaço
+    opener = gzip.open if compress else open
+    with opener(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_U32.pack(len(meta_bytes))); f.write(meta_bytes)
+        f.write(_U32.pack(len(names_bytes))); f.write(names_bytes)
+        f.write(_U32.pack(count)); f.write(records)
+    return count
+
+def _open(path):
+    with open(path, "rb") as f: compressed = f.read(2) == GZIP_MAGIC
+    f = gzip.open(path, "rb") if compressed else open(path, "rb")
+    try: header = _read(f, len(MAGIC))
+    except ValueError: header = b""
+    if header != MAGIC:
+        f.close(); raise ValueError("Arquivo não está no formato de preset compacto.")
+    return f
+
+def _read(f, size: int) -> bytes:
+    """Lê exatamente `size` bytes; erros de descompressão e fim prematuro viram ValueError."""
+    try: data = f.read(size)
+    except (zlib.error, EOFError) as e: raise ValueError(f"Preset compacto corrompido ({e}).") from e
+    if len(data) != size: raise ValueError("Preset compacto truncado.")
+    return data
+
+def _read_u32(f) -> int:
+    return _U32.unpack(_read(f, _U32.size))[0]
+
+def _read_block(f) -> bytes:
+    return _read(f, _read_u32(f))
+
+def read_compact_metadata(path) -> dict:
+    """Lê só o cabeçalho (metadados, incluindo o nº de nós), sem tocar nos nós."""
+    with _open(path) as f:
+        return json.loads(_read_block(f).decode("utf-8"))
+
+def read_compact_preset(path):
+    """Retorna (metadados, gerador de (profundidade, é_pasta, nome)); o arquivo é lido em fluxo."""
+    f = _open(path)
+    try:
+        metadata = json.loads(_read_block(f).decode("utf-8"))
+        names_bytes = _read_block(f)
+        names = names_bytes.decode("utf-8").split("\0") if names_bytes else []
+        count = _read_u32(f)
+    except Exception:
+        f.close(); raise
+    return metadata, _iter_nodes(f, names, count)
+
+def _iter_nodes(f, names: list[str], count: int):
+    with f:
+        remaining = count
+        while remaining:
+            chunk = _read(f, min(remaining, _READ_NODES) * _NODE.size)
+            for depth, flags, index in _NODE.iter_unpack(chunk):
+                if index >= len(names): raise ValueError("Preset compacto corrompido.")
+                yield depth, bool(flags & FLAG_FOLDER), names[index]
+            remaining -= len(chunk) // _NODE.size
@@ -1,19 +1,82 @@
 # src/preset_manager.py
+import os
 import json
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 from tkinter import messagebox
 
+from .tree_model import iter_structure_nodes
+from .preset_format import write_compact_preset, read_compact_metadata, read_compact_preset
+
+# Índice persistente dos presets (não termina em .json para não ser listado como preset)
+CATALOG_FILE = ".catalog"
+CATALOG_VERSION = 2
+# Extensões reconhecidas: JSON legível e o formato compacto (ver preset_format)
+PRESET_FORMATS = {".json": "json", ".archpreset": "compact"}
+
+def count_nodes(structure: dict | None) -> int:
+    """Conta pastas e arquivos de uma estrutura aninhada, sem recursão."""
+    count = 0; stack = [structure]
+    while stack:
+        current = stack.pop()
+        if current:
+            count += len(current)
+            stack.extend(children for children in current.values() if children)
+    return count
+
+def _check_preset_data(data) -> dict:
+    """O conteúdo de um preset JSON, se for um objeto com "metadata" e "structure" (quando presentes) também objetos."""
+    if not isinstance(data, dict): raise ValueError("O preset não é um objeto JSON.")
+    for key in ("metadata", "structure"):
+        if not isinstance(data.get(key) or {}, dict): raise ValueError(f"O campo '{key}' do preset não é um objeto JSON.")
+    return data
+
 class PresetManager:
-    """Gerencia o salvamento e carregamento de presets."""
+    """
+    Gerencia o salvamento e carregamento de presets.
+
+    Presets podem estar em JSON (.json) ou no formato compacto (.archpreset); load_nodes
+    lê os dois como uma sequência de nós em pré-ordem.
 
-    def __init__(self, presets_dir: Path):
+    Um catálogo em `presets/.catalog` guarda nome, formato, descrição, data de criação,
+    nº de itens, mtime e tamanho de cada preset. Listar e exibir metadados só consulta o catálogo e o
+    mtime dos arquivos; um preset só é aberto se o arquivo mudou desde a última indexação.
+    As estruturas lidas ficam em um cache LRU limitado.
+    """
+    CACHE_SIZE = 16
+
+    def __init__(self, presets_dir: Path, cache_size: int = CACHE_SIZE):
         self.presets_dir = presets_dir
         self.presets_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog_path = self.presets_dir / CATALOG_FILE
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # nome -> (mtime_ns, tamanho, dados do preset)
+        self._catalog = self._read_catalog()
 
     def list_presets(self) -> list[str]:
         """Retorna uma lista ordenada com os nomes dos presets disponíveis."""
-        return sorted([f.stem for f in self.presets_dir.glob("*.json")])
+        self._refresh_catalog()
+        return sorted(self._catalog)
+
+    def get_info(self, name: str) -> dict | None:
+        """Metadados do preset (name, format, description, created, nodes, mtime_ns, size), sem abrir o arquivo."""
+        file_path = self._preset_path(name)
+        if file_path is None: return None
+        st = file_path.stat()
+        info = self._catalog.get(name)
+        if not self._is_current(info, st):
+            info = self._index_file(name, file_path, st); self._write_catalog()
+        return info
+
+    def _preset_path(self, name: str) -> Path | None:
+        """Arquivo do preset, em qualquer um dos formatos (o do catálogo primeiro)."""
+        info = self._catalog.get(name)
+        suffixes = sorted(PRESET_FORMATS, key=lambda suffix: PRESET_FORMATS[suffix] != (info or {}).get("format"))
+        for suffix in suffixes:
+            path = self.presets_dir / f"{name}{suffix}"
+            if path.is_file(): return path
+        return None
 
     def save(self, name: str, description: str, structure: dict):
         """Salva a estrutura atual como um preset JSON."""
@@ -34,22 +97,159 @@ class PresetManager:
         try:
             with open(file_path, "w", encoding="utf-8") as f:
                 json.dump(preset_data, f, indent=2, ensure_ascii=False)
-            messagebox.showinfo("Sucesso", f"Preset '{name}' salvo com sucesso.")
+            st = file_path.stat()
+            self._catalog[name] = self._make_info(name, preset_data, st)
+            self._cache_put(name, st, preset_data)
+            self._after_save(name, file_path)
+            return True
+        except Exception as e:
+            messagebox.showerror("Erro ao Salvar", f"Não foi possível salvar o preset:\n{e}")
+            return False
+
+    def save_compact(self, name: str, description: str, nodes):
+        """
+        Salva no formato compacto (.archpreset) a partir de uma sequência de nós em pré-ordem
+        (ex.: TreeModel.iter_nodes()), sem montar o dicionário aninhado.
+        """
+        if not name:
+            messagebox.showwarning("Aviso", "Informe um nome para o preset antes de salvar.")
+            return False
+        metadata = {"name": name, "description": description, "created": datetime.now().isoformat()}
+        file_path = self.presets_dir / f"{name}.archpreset"
+        try:
+            count = write_compact_preset(file_path, metadata, nodes)
+            st = file_path.stat()
+            self._catalog[name] = self._info_from_metadata(name, "compact", dict(metadata, nodes=count), st)
+            self._cache.pop(name, None)
+            self._after_save(name, file_path)
             return True
         except Exception as e:
             messagebox.showerror("Erro ao Salvar", f"Não foi possível salvar o preset:\n{e}")
             return False
 
+    def _after_save(self, name: str, file_path: Path):
+        # Um preset com o mesmo nome no outro formato ficaria duplicado na lista: só é apagado se o usuário confirmar
+        for suffix in PRESET_FORMATS:
+            other = self.presets_dir / f"{name}{suffix}"
+            if other != file_path and other.exists() and messagebox.askyesno(
+                    "Confirmar", f"Também existe o preset '{other.name}', no outro formato. Excluí-lo?"):
+                other.unlink()
+        self._write_catalog()
+        messagebox.showinfo("Sucesso", f"Preset '{name}' salvo com sucesso.")
+
+    def load_nodes(self, name: str):
+        """
+        Abre um preset em qualquer formato. Retorna (metadados, nós em pré-ordem como
+        (profundidade, é_pasta, nome)) ou None. No formato compacto os nós são lidos em fluxo.
+        """
+        file_path = self._preset_path(name)
+        if file_path is None:
+            messagebox.showerror("Erro ao Carregar", f"O preset '{name}' não foi encontrado.")
+            return None
+        if PRESET_FORMATS[file_path.suffix] == "json":
+            data = self.load(name)
+            if data is None: return None
+            return data.get("metadata", {}), iter_structure_nodes(data.get("structure", {}))
+        try:
+            return read_compact_preset(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Erro ao Carregar", f"Erro ao ler o arquivo de preset:\n{e}")
+            return None
+
     def load(self, name: str) -> dict | None:
-        """Carrega um preset a partir de um arquivo JSON."""
+        """Carrega um preset JSON como dicionário (ou do cache, se o arquivo não mudou)."""
         file_path = self.presets_dir / f"{name}.json"
-        if not file_path.exists():
+        try: st = file_path.stat()
+        except OSError: st = None
+        if st is None:
             messagebox.showerror("Erro ao Carregar", f"O arquivo de preset '{name}.json' não foi encontrado.")
             return None
 
+        cached = self._cache.get(name)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            self._cache.move_to_end(name)
+            return cached[2]
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                data = _check_preset_data(json.load(f))
         except (json.JSONDecodeError, Exception) as e:
             messagebox.showerror("Erro ao Carregar", f"Erro ao ler o arquivo de preset:\n{e}")
-            return None
\ No newline at end of file
+            return None
+        self._cache_put(name, st, data)
+        if not self._is_current(self._catalog.get(name), st):
+            self._catalog[name] = self._make_info(name, data, st); self._write_catalog()
+        return data
+
+    # --- Catálogo ---
+    def _read_catalog(self) -> dict:
+        try:
+            with open(self.catalog_path, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+            if catalog.get("version") == CATALOG_VERSION: return catalog.get("presets", {})
+        except (OSError, ValueError, AttributeError):
+            pass  # Catálogo ausente ou corrompido: é reconstruído a partir dos arquivos
+        return {}
+
+    def _write_catalog(self):
+        tmp_path = self.catalog_path.with_name(CATALOG_FILE + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CATALOG_VERSION, "presets": self._catalog}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.catalog_path)
+        except OSError:
+            pass  # Sem permissão de escrita (ex.: compartilhamento somente leitura): o catálogo fica só em memória
+
+    def _refresh_catalog(self):
+        """Confere o catálogo com o mtime/tamanho dos arquivos; reindexa apenas os que mudaram."""
+        current = {}
+        with os.scandir(self.presets_dir) as it:
+            for entry in it:
+                stem, suffix = os.path.splitext(entry.name)
+                if suffix not in PRESET_FORMATS or not entry.is_file(): continue
+                # O mesmo nome nos dois formatos: vale o que está no catálogo (o último salvo)
+                if stem in current and PRESET_FORMATS[suffix] != self._catalog.get(stem, {}).get("format"): continue
+                current[stem] = (entry.path, entry.stat())
+        changed = False
+        for name in [n for n in self._catalog if n not in current]:
+            del self._catalog[name]; self._cache.pop(name, None); changed = True
+        for name, (path, st) in current.items():
+            if not self._is_current(self._catalog.get(name), st):
+                self._index_file(name, Path(path), st); changed = True
+        if changed: self._write_catalog()
+
+    def _is_current(self, info: dict | None, st) -> bool:
+        return bool(info) and info.get("mtime_ns") == st.st_mtime_ns and info.get("size") == st.st_size
+
+    def _index_file(self, name: str, file_path: Path, st) -> dict:
+        preset_format = PRESET_FORMATS[file_path.suffix]
+        try:
+            if preset_format == "compact":
+                # O cabeçalho já traz o nº de nós: os nós em si não são lidos
+                meta = read_compact_metadata(file_path)
+                if not isinstance(meta, dict): raise ValueError("Cabeçalho do preset compacto inválido.")
+                info = self._info_from_metadata(name, preset_format, meta, st)
+            else:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    data = _check_preset_data(json.load(f))
+                self._cache_put(name, st, data)
+                info = self._make_info(name, data, st)
+        except (OSError, ValueError) as e:
+            # Guarda o erro também: o arquivo só é relido quando mudar
+            info = {"name": name, "format": preset_format, "description": "", "created": "", "nodes": 0,
+                    "mtime_ns": st.st_mtime_ns, "size": st.st_size, "error": str(e)}
+        self._catalog[name] = info
+        return info
+
+    def _make_info(self, name: str, data: dict, st) -> dict:
+        meta = dict(data.get("metadata", {}), nodes=count_nodes(data.get("structure")))
+        return self._info_from_metadata(name, "json", meta, st)
+
+    def _info_from_metadata(self, name: str, preset_format: str, meta: dict, st) -> dict:
+        return {"name": meta.get("name", name), "format": preset_format, "description": meta.get("description", ""),
+                "created": meta.get("created", ""), "nodes": meta.get("nodes", 0),
+                "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    def _cache_put(self, name: str, st, data: dict):
+        self._cache[name] = (st.st_mtime_ns, st.st_size, data)
+        self._cache.move_to_end(name)
+        while len(self._cache) > self.cache_size: self._cache.popitem(last=False)
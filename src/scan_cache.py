@@ -0,0 +1,52 @@
+# src/scan_cache.py
+"""
+Cache persistente das listagens de diretórios de um projeto aberto, sem dependência de Tk.
+
+Cada pasta lida guarda (mtime_ns, [(nome, é_pasta, é_link)]). O mtime de uma pasta
+muda quando um item é criado, removido ou renomeado diretamente nela, então ao reabrir
+o projeto basta um stat por pasta: só as que mudaram são listadas de novo.
+
+Um arquivo por projeto (gzip + JSON) em SCAN_CACHE_DIR, nomeado pelo hash do caminho
+da raiz (ver cache_file). O cache é descartado se os padrões ignorados mudarem.
+"""
+import os
+import time
+
+from .app_config import SCAN_CACHE_DIR
+from .cache_file import CacheFile
+from .dir_scanner import IGNORE_RE, list_directory
+
+class ScanCache(CacheFile):
+    PREFIX = "scan"; SECTION = "dirs"; LABEL = "de varredura"
+    MAX_FILES = 20  # Projetos mantidos
+    # Pastas alteradas há menos que isso não são guardadas: outra alteração no mesmo
+    # "tique" do relógio do sistema de arquivos não mudaria o mtime
+    RACY_SECONDS = 2.0
+
+    def __init__(self, root_path, cache_dir=SCAN_CACHE_DIR, ignore_re=IGNORE_RE):
+        self.ignore_re = ignore_re
+        super().__init__(root_path, cache_dir)  # _entries: caminho relativo -> [mtime_ns, [[nome, é_pasta, é_link], ...]]
+
+    def _header(self) -> dict:
+        return dict(super()._header(), ignore=self.ignore_re.pattern)
+
+    def listing(self, dir_path) -> list[tuple[str, bool, bool]]:
+        """Listagem (nome, é_pasta, é_link) de uma pasta do projeto, vinda do cache se o mtime não mudou."""
+        dir_path = os.fspath(dir_path)
+        rel = os.path.relpath(dir_path, self.root_path)
+        mtime = os.stat(dir_path).st_mtime_ns  # OSError sobe para quem chamou, como em os.scandir
+        with self._lock:
+            if not self._loaded: self._load()
+            self._visited.add(rel)
+            cached = self._entries.get(rel)
+            if cached and cached[0] == mtime:
+                self.hits += 1
+                return [tuple(entry) for entry in cached[1]]
+        entries = list_directory(dir_path, self.ignore_re)
+        racy = time.time_ns() - mtime < self.RACY_SECONDS * 1e9
+        with self._lock:
+            self.misses += 1
+            if racy: self._entries.pop(rel, None)
+            else: self._entries[rel] = [mtime, entries]
+            self._dirty = True
+        return entries
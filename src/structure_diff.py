@@ -0,0 +1,120 @@
+# src/structure_diff.py
+"""
+Comparação estrutural entre a árvore (TreeModel) e uma pasta em disco, sem dependência de Tk.
+
+A árvore guia a varredura: cada pasta que existe nos dois lados é lida uma única vez
+com os.scandir e seus nomes são comparados com os filhos do nó. Subárvores que só
+existem de um lado não são percorridas (basta o item do topo), então o custo é
+proporcional ao que já coincide mais o nº de diferenças, e a sincronização grava
+apenas o que falta (ver structure_generator.build_generation_plan com node_ids).
+"""
+import os
+import queue
+import threading
+
+from .dir_scanner import IGNORE_RE
+
+class StructureDiff:
+    """Diferenças encontradas. Caminhos relativos à pasta comparada; só o topo de cada subárvore diferente."""
+    def __init__(self, root: str):
+        self.root = root
+        self.only_in_tree = []   # [(id do nó, caminho)]: itens da árvore que não existem no disco
+        self.only_on_disk = []   # [(id da pasta pai na árvore, caminho, é_pasta)]: itens do disco fora da árvore
+        self.type_mismatch = []  # [(id do nó, caminho, é_pasta na árvore)]: pasta de um lado, arquivo do outro
+        self.errors = []         # [(caminho, mensagem)]: pastas que não puderam ser lidas
+        self.compared = 0        # Itens da árvore comparados
+
+    @property
+    def is_clean(self) -> bool:
+        return not (self.only_in_tree or self.only_on_disk or self.type_mismatch)
+
+    def summary(self, max_items: int = 10) -> str:
+        """Resumo para o diálogo de sincronização."""
+        sections = [
+            ("Só na árvore (serão criados)", [path for _, path in self.only_in_tree]),
+            ("Só no disco (mantidos)", [path for _, path, _ in self.only_on_disk]),
+            ("Tipo diferente (pasta x arquivo)", [path for _, path, _ in self.type_mismatch]),
+            ("Não foi possível ler", [f"{path}: {message}" for path, message in self.errors]),
+        ]
+        lines = [f"{self.compared} item(s) da árvore comparados com:", self.root]
+        for title, paths in sections:
+            if not paths: continue
+            lines += ["", f"{title}: {len(paths)}"]
+            lines += [f"  {path}" for path in paths[:max_items]]
+            if len(paths) > max_items: lines.append(f"  ... e mais {len(paths) - max_items}")
+        return "\n".join(lines)
+
+
+def snapshot_children(model) -> dict:
+    """{id da pasta: [(nome, id, é_pasta)]} da árvore inteira, para a comparação rodar fora da thread da interface."""
+    return {node.id: [(child.name, child.id, model.is_folder(child.id)) for child in node.children]
+            for node, _ in model.walk(include_self=True) if node.children}
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try: return entry.is_dir()
+    except OSError: return False
+
+
+def diff_structure(children: dict, root_path, root_id: str = "", ignore_re=IGNORE_RE,
+                   cancelled=lambda: False) -> StructureDiff:
+    """
+    Compara o retrato da árvore (snapshot_children) com a pasta `root_path`.
+    Itens só do disco que casam com os padrões ignorados (ex.: .git) não são relatados.
+    No Windows a comparação de nomes não diferencia maiúsculas, como o sistema de arquivos.
+    """
+    root = os.fspath(root_path)
+    diff = StructureDiff(root)
+    stack = [(root_id, root, "")]
+    while stack and not cancelled():
+        folder_id, path, rel = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                on_disk = {os.path.normcase(entry.name): (entry.name, _is_dir(entry)) for entry in it}
+        except OSError as e:
+            diff.errors.append((rel or ".", str(e))); continue
+
+        subfolders = []
+        for name, node_id, is_folder in children.get(folder_id, ()):
+            diff.compared += 1
+            child_rel = os.path.join(rel, name)
+            entry = on_disk.pop(os.path.normcase(name), None)
+            if entry is None: diff.only_in_tree.append((node_id, child_rel))
+            elif entry[1] != is_folder: diff.type_mismatch.append((node_id, child_rel, is_folder))
+            elif is_folder: subfolders.append((node_id, os.path.join(path, name), child_rel))
+        for name, is_dir in on_disk.values():
+            if not ignore_re.match(name): diff.only_on_disk.append((folder_id, os.path.join(rel, name), is_dir))
+        stack.extend(reversed(subfolders))  # Pré-ordem, como a árvore
+    return diff
+
+
+class DirectoryDiff:
+    """
+    Executa diff_structure em uma thread de trabalho. O retrato da árvore é tirado no
+    construtor (na thread da interface). Ao terminar publica ("end", diff, erro_ou_None, cancelado).
+    """
+    def __init__(self, model, root_path):
+        self.children = snapshot_children(model)
+        self.root_path = os.fspath(root_path)
+        self.queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self.thread = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _run(self):
+        try:
+            diff = diff_structure(self.children, self.root_path, cancelled=lambda: self.cancelled)
+            self.queue.put(("end", diff, None, self.cancelled))
+        except Exception as e:
+            self.queue.put(("end", None, e, False))
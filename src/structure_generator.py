@@ -0,0 +1,235 @@
+# src/structure_generator.py
+"""
+Geração da estrutura em disco ("Gerar Estrutura em Disco"), sem dependência de Tk.
+
+A árvore é primeiro convertida em um plano plano e ordenado (pastas em pré-ordem
+e arquivos com seus conteúdos). A execução cria todas as pastas e depois grava os
+arquivos em lotes, em um pool de threads, fora da thread da interface.
+
+Cada alteração é registrada antes em um diário (GenerationJournal). Uma geração
+que falhar pode ser desfeita (rollback) ou simplesmente executada de novo: itens
+que já correspondem ao plano são pulados com um único stat.
+"""
+import os
+import json
+import itertools
+import queue
+import shutil
+import stat
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+class GenerationPlan:
+    """Retrato da árvore no momento da geração: nada aqui consulta o modelo ou o Tk."""
+    def __init__(self, root: str, dirs: list[str], files: list[tuple[str, str]]):
+        self.root = root
+        self.dirs = dirs      # Caminhos absolutos, pais antes dos filhos
+        self.files = files    # [(caminho absoluto, conteúdo)]
+
+    @property
+    def total(self) -> int:
+        return len(self.dirs) + len(self.files)
+
+    def summary(self, max_items: int = 15) -> str:
+        """Resumo para a simulação (dry-run)."""
+        lines = [f"{len(self.dirs)} pasta(s) e {len(self.files)} arquivo(s) seriam criados em:", self.root, ""]
+        paths = self.dirs + [path for path, _ in self.files]
+        for path in paths[:max_items]: lines.append(os.path.relpath(path, self.root))
+        if len(paths) > max_items: lines.append(f"... e mais {len(paths) - max_items} item(s)")
+        return "\n".join(lines)
+
+
+def build_generation_plan(model, project_path, content_for=lambda name: "", node_ids=None) -> GenerationPlan:
+    """
+    Converte o TreeModel em um GenerationPlan. `content_for(nome)` dá o conteúdo de cada arquivo.
+    Com `node_ids`, só essas subárvores entram no plano (as pastas pai delas já existem em disco),
+    como na sincronização a partir de uma comparação (structure_diff).
+    """
+    root = os.fspath(project_path)
+    dirs, files = [], []
+    paths = {model.ROOT_ID: root}
+    if node_ids is None:
+        nodes = model.walk()
+    else:
+        for node_id in node_ids: _add_parent_path(model.get(node_id).parent, paths)
+        nodes = itertools.chain.from_iterable(model.walk(node_id, include_self=True) for node_id in node_ids)
+    for node, _ in nodes:
+        path = os.path.join(paths[node.parent.id], node.name)
+        if model.is_folder(node.id):
+            dirs.append(path); paths[node.id] = path
+        else:
+            files.append((path, content_for(node.name)))
+    return GenerationPlan(root, dirs, files)
+
+
+def _add_parent_path(node, paths: dict):
+    """Registra em `paths` o caminho de `node` e dos ancestrais que ainda não estão lá."""
+    missing = []
+    while node.id not in paths: missing.append(node); node = node.parent
+    for node in reversed(missing): paths[node.id] = os.path.join(paths[node.parent.id], node.name)
+
+
+class GenerationJournal:
+    """
+    Diário de uma geração, gravado ao lado da pasta do projeto (.<nome>.archmanager-journal).
+
+    Uma linha JSON por alteração, registrada antes de a alteração acontecer:
+      {"op": "mkdir" | "create", "path": ...} ou {"op": "replace", "path": ..., "backup": ...}
+    Arquivos substituídos são antes movidos para a pasta de backup, para o rollback devolvê-los.
+    """
+    def __init__(self, root: str):
+        parent, name = os.path.split(os.path.normpath(root))
+        self.path = os.path.join(parent, f".{name}.archmanager-journal")
+        self.backup_dir = self.path + "-backup"
+        self._file = None
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def record(self, op: str, path: str, backup: str | None = None):
+        entry = {"op": op, "path": path}
+        if backup: entry["backup"] = backup
+        with self._lock:
+            if self._file is None: self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n"); self._file.flush()
+
+    def backup(self, path: str) -> str:
+        """Move um arquivo existente para a pasta de backup e registra a substituição."""
+        # Nome único: uma execução retomada não pode sobrescrever backups da anterior
+        backup = os.path.join(self.backup_dir, f"{uuid.uuid4().hex}-{os.path.basename(path)}")
+        os.makedirs(self.backup_dir, exist_ok=True)
+        self.record("replace", path, backup)
+        os.replace(path, backup)
+        return backup
+
+    def close(self):
+        with self._lock:
+            if self._file: self._file.close(); self._file = None
+
+    def commit(self):
+        """Geração concluída: descarta o diário e os backups."""
+        self.close()
+        if os.path.exists(self.path): os.remove(self.path)
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+
+    def entries(self) -> list[dict]:
+        if not self.exists(): return []
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try: entries.append(json.loads(line))
+                except json.JSONDecodeError: pass  # Última linha incompleta (interrupção no meio da gravação)
+        return entries
+
+    def rollback(self) -> int:
+        """Desfaz as alterações registradas, da última para a primeira. Retorna quantas foram desfeitas."""
+        self.close()
+        undone = 0
+        for entry in reversed(self.entries()):
+            path = entry["path"]
+            try:
+                if entry["op"] == "mkdir": os.rmdir(path)  # Só remove se estiver vazia
+                elif entry["op"] == "create": os.remove(path)
+                elif entry["op"] == "replace": os.replace(entry["backup"], path)
+                undone += 1
+            except OSError:
+                pass  # Já removido, ou a pasta recebeu outros arquivos depois da geração
+        self.commit()
+        return undone
+
+
+def _file_bytes(content: str) -> bytes:
+    """Mesmos bytes que a gravação em modo texto produziria (quebras de linha da plataforma)."""
+    return content.replace("\n", os.linesep).encode("utf-8") if content else b""
+
+
+class StructureGenerator:
+    """
+    Executa um GenerationPlan em uma thread de trabalho.
+
+    `done` conta os itens processados (para a barra de progresso) e `skipped` os que já
+    existiam exatamente como no plano. Ao terminar, publica ("end", erro_ou_None, cancelado)
+    em `self.queue`. Em caso de sucesso o diário é descartado; em caso de erro ou
+    cancelamento ele fica em disco para um rollback (journal.rollback()) ou para retomar.
+    """
+    CHUNK_SIZE = 64
+
+    def __init__(self, plan: GenerationPlan, max_workers: int | None = None):
+        self.plan = plan
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.journal = GenerationJournal(plan.root)
+        self.queue = queue.Queue()
+        self.done = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self.thread = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _advance(self, skipped: bool = False):
+        with self._lock:
+            self.done += 1
+            if skipped: self.skipped += 1
+
+    def _make_dir(self, path: str):
+        if os.path.isdir(path): self._advance(skipped=True); return
+        self.journal.record("mkdir", path)
+        os.mkdir(path)  # O pai já existe: o plano está em pré-ordem
+        self._advance()
+
+    def _run(self):
+        try:
+            if not os.path.isdir(self.plan.root):
+                self.journal.record("mkdir", self.plan.root); os.makedirs(self.plan.root)
+            for path in self.plan.dirs:
+                if self.cancelled: break
+                self._make_dir(path)
+
+            files = self.plan.files
+            chunks = [files[i:i + self.CHUNK_SIZE] for i in range(0, len(files), self.CHUNK_SIZE)]
+            if chunks and not self.cancelled:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    try:
+                        for _ in pool.map(self._write_chunk, chunks): pass
+                    except Exception:
+                        self.cancel()  # Os demais lotes param no próximo arquivo
+                        raise
+            if self.cancelled: self.journal.close()
+            else: self.journal.commit()
+            self.queue.put(("end", None, self.cancelled))
+        except Exception as e:
+            self.journal.close()
+            self.queue.put(("end", e, False))
+
+    def _write_chunk(self, chunk):
+        for path, content in chunk:
+            if self.cancelled: return
+            data = _file_bytes(content)
+            try: st = os.stat(path)
+            except FileNotFoundError: st = None
+            if st is not None:
+                if not stat.S_ISREG(st.st_mode): raise FileExistsError(f"'{path}' já existe e não é um arquivo.")
+                if st.st_size == len(data) and (not data or self._read(path) == data):
+                    self._advance(skipped=True); continue
+                self.journal.backup(path)
+            else:
+                self.journal.record("create", path)
+            with open(path, "wb") as f:
+                if data: f.write(data)
+            self._advance()
+
+    def _read(self, path: str) -> bytes:
+        with open(path, "rb") as f: return f.read()
@@ -1,53 +1,393 @@
 # tests/test_runner.py
+import os
 import sys
+import json
+import shutil
+import tempfile
+import time
+import queue
 from pathlib import Path
 
 # Adiciona o diretório raiz ao path do Python para que possamos importar de 'src'
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from src.tree_manager import TreeManager
+from src.tree_model import TreeModel
+from src.tree_export import TreeTextExporter
+from src.tree_search import NameIndex
+from src.structure_diff import diff_structure, snapshot_children
+from src.structure_generator import build_generation_plan, GenerationPlan, StructureGenerator
+from src.preset_format import write_compact_preset, read_compact_metadata, read_compact_preset
+from src.preset_manager import PresetManager, CATALOG_FILE
+from src.organizer_engine import RuleMatcher, classify, OrganizeJournal, MoveExecutor, UndoExecutor, DuplicateFinder, PARTIAL_BLOCK
+from src.hash_cache import HashCache
+from src.build_cache import FingerprintStore, requirement_files, changed_files
+from src.build_log import BuildLog
+from src.build_history import BuildHistory, PyInstallerPhases, compare_run
+from src.build_probe import module_imports, bundle_sizes
+from src.dir_watcher import DirectoryWatcher
+from src.dir_scanner import scan_directory
+from src.scan_cache import ScanCache
+
+STRUCTURE = {
+    "src": {
+        "main.py": None,
+        "utils.py": None
+    },
+    "README.md": None
+}
 
 def test_export_to_text():
-    """Testa a função de exportação visual da árvore."""
+    """Testa a função de exportação visual da árvore (sem precisar de Tkinter)."""
     print("--- Testando export_to_text ---")
-    
-    # Simulação de um widget Treeview e ícones para o teste
-    class MockTree:
-        def get_children(self, parent_id=""):
-            if parent_id == "": return ["item1"]
-            if parent_id == "item1": return ["item2", "item3"]
-            return []
-        def item(self, item_id, key=None):
-            return {"text": item_id}
-            
-    mock_tree = MockTree()
-    mock_icons = {} # Não precisamos de ícones reais para este teste
-    
-    tm = TreeManager(mock_tree, mock_icons)
-    
-    # Simula a construção da árvore a partir de uma estrutura
-    structure = {
-        "src": {
-            "main.py": None,
-            "utils.py": None
-        },
-        "README.md": None
-    }
-    
-    # Esta função não existe mais no TreeManager, então vamos simular o resultado
-    # O teste real seria verificar a estrutura criada vs a esperada
-    
-    print("Teste de exportação visual (simulação):")
-    # Para testar de verdade, precisaríamos de uma instância Tkinter rodando.
-    # Mas podemos testar a lógica da estrutura.
-    
-    print("Teste de get_structure:")
-    # Para testar get_structure, precisaríamos simular as chamadas `insert`
-    # O que é complexo sem uma UI.
-    
-    print("\nEste arquivo demonstra como você pode chamar funções isoladamente.")
-    print("Testes de UI completos geralmente requerem frameworks como PyTest com plugins de Tkinter.")
+    model = TreeModel()
+    model.build_from_structure(STRUCTURE)
+    expected = "\n".join([
+        "Proj/",
+        "    ├── src",
+        "    │   ├── main.py",
+        "    │   └── utils.py",
+        "    └── README.md",
+    ])
+    assert model.export_to_text("Proj") == expected
+    assert TreeModel().export_to_text("Vazio") == "Vazio/"
+
+def test_get_structure_roundtrip():
+    """A estrutura lida do modelo deve ser a mesma que foi carregada."""
+    print("--- Testando get_structure ---")
+    model = TreeModel()
+    model.build_from_structure(STRUCTURE)
+    assert model.get_structure() == STRUCTURE
+    assert len(model) == 4
+
+def test_edit_operations():
+    """Renomear, mover e excluir atualizam os índices de pai/filhos."""
+    print("--- Testando operações de edição ---")
+    model = TreeModel()
+    src_id, readme_id = model.build_from_structure(STRUCTURE)
+    main_id, utils_id = model.children(src_id)
+
+    model.rename(utils_id, "helpers.py")
+    assert model.name(utils_id) == "helpers.py"
+
+    assert model.move(readme_id, src_id, 0) == 0
+    assert model.parent(readme_id) == src_id
+    assert model.children(src_id) == [readme_id, main_id, utils_id]
+    try:
+        model.move(src_id, main_id); assert False, "mover para dentro de si mesmo deveria falhar"
+    except ValueError: pass
+
+    assert set(model.delete(src_id)) == {src_id, readme_id, main_id, utils_id}
+    assert model.is_empty() and main_id not in model
+
+def test_is_folder_heuristic():
+    model = TreeModel()
+    empty_folder = model.insert("", "static")
+    marked = model.insert("", "v1.0", is_folder=True)
+    file_id = model.insert("", "app.py")
+    assert model.is_folder(empty_folder) and model.is_folder(marked)
+    assert not model.is_folder(file_id)
+
+def test_incremental_export():
+    """Os patches do exportador aplicados em sequência devem reproduzir a exportação completa."""
+    print("--- Testando exportação incremental ---")
+    def apply(lines, kind, payload):
+        if kind == "full": return payload.split("\n")
+        for start, old_count, new_lines in payload: lines[start:start + old_count] = new_lines
+        return lines
+
+    model = TreeModel(); exporter = TreeTextExporter(model)
+    src_id, readme_id = model.build_from_structure(STRUCTURE)
+    lines = apply([], *exporter.render("Proj"))
+    main_id, utils_id = model.children(src_id)
+
+    model.insert(src_id, "config.py")             # Novo último filho: o anterior troca └── por ├──
+    model.rename(main_id, "app.py")
+    model.move(readme_id, src_id, 0)
+    model.delete(utils_id)
+    kind, patches = exporter.render("Novo")
+    assert kind == "patch"
+    assert "\n".join(apply(lines, kind, patches)) == model.export_to_text("Novo")
+
+def test_name_index_search():
+    """O índice acompanha inserções, renomeações e exclusões e devolve os ids na ordem da árvore."""
+    print("--- Testando busca indexada ---")
+    model = TreeModel(); index = NameIndex(model)
+    src_id, readme_id = model.build_from_structure(STRUCTURE)
+    main_id, utils_id = model.children(src_id)
+
+    assert index.search("MAIN") == [main_id]
+    assert index.search("*.py", "glob") == [main_id, utils_id]
+    assert index.search(r"^(readme|utils)\.", "regex") == [utils_id, readme_id]
+    model.rename(utils_id, "helpers.py"); model.delete(main_id)
+    assert index.search("*.py", "glob") == [utils_id]
+    try:
+        index.search("(", "regex"); assert False, "regex inválida deveria falhar"
+    except ValueError: pass
+
+def test_compact_preset_roundtrip():
+    """O formato compacto preserva a árvore (inclusive pastas vazias) e é lido em fluxo para o modelo."""
+    print("--- Testando preset compacto ---")
+    model = TreeModel()
+    model.build_from_structure(STRUCTURE)
+    model.insert("", "static", is_folder=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "teste.archpreset"
+        assert write_compact_preset(path, {"name": "teste"}, model.iter_nodes()) == 5
+        assert read_compact_metadata(path) == {"name": "teste", "nodes": 5}
+        metadata, nodes = read_compact_preset(path)
+        loaded = TreeModel(); loaded.build_from_nodes(nodes)
+        # Um nome vazio também volta; um índice fora da tabela de nomes é erro de formato
+        write_compact_preset(path, {}, [(0, True, "")], compress=False)
+        assert list(read_compact_preset(path)[1]) == [(0, True, "")]
+        data = bytearray(path.read_bytes()); data[-4:] = (7).to_bytes(4, "little"); path.write_bytes(data)
+        try: list(read_compact_preset(path)[1]); assert False, "índice inválido aceito"
+        except ValueError: pass
+    assert loaded.export_to_text() == model.export_to_text()
+    assert loaded.get(loaded.children()[-1]).is_folder
+
+def test_preset_catalog():
+    """O catálogo só reindexa arquivos com mtime/tamanho novos, sobrevive a um .catalog corrompido e o LRU guarda 16 presets."""
+    print("--- Testando catálogo de presets ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        presets = Path(tmp)
+        def write(name, description):
+            data = {"metadata": {"name": name, "description": description}, "structure": STRUCTURE}
+            (presets / f"{name}.json").write_text(json.dumps(data), encoding="utf-8")
+        names = [f"p{i:02}" for i in range(20)]
+        for name in names: write(name, "antigo")
+        (presets / "lista.json").write_text("[1, 2]", encoding="utf-8")  # JSON válido, mas não é um objeto
+        manager = PresetManager(presets)
+        assert manager.list_presets() == ["lista"] + names
+        assert manager.get_info("p05")["nodes"] == 4 and "error" in manager.get_info("lista")
+        for name in names: manager.load(name)
+        assert list(manager._cache) == names[-PresetManager.CACHE_SIZE:]
+
+        # Mesmo mtime e tamanho: vale o catálogo, o arquivo não é relido; mudou: é reindexado
+        st = (presets / "p06.json").stat()
+        (presets / "p06.json").write_text("x" * st.st_size); os.utime(presets / "p06.json", ns=(st.st_atime_ns, st.st_mtime_ns))
+        write("p05", "novo")
+        manager = PresetManager(presets)
+        assert manager.get_info("p06")["description"] == "antigo" and manager.get_info("p05")["description"] == "novo"
+
+        (presets / CATALOG_FILE).write_text("{corrompido")
+        manager = PresetManager(presets)
+        assert manager.list_presets() == ["lista"] + names and "error" in manager.get_info("p06")
+        assert json.loads((presets / CATALOG_FILE).read_text(encoding="utf-8"))["presets"]["p05"]["description"] == "novo"
+
+def test_structure_diff():
+    """A comparação com o disco aponta só o topo de cada diferença e o plano de sincronização cria só o que falta."""
+    print("--- Testando comparação com o disco ---")
+    model = TreeModel()
+    src_id, readme_id = model.build_from_structure(STRUCTURE)
+    utils_id = model.children(src_id)[1]
+    docs_id = model.insert("", "docs", is_folder=True); model.insert(docs_id, "guia.md")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "src").mkdir(); (root / "src" / "main.py").touch(); (root / "src" / "old.py").touch()
+        (root / "README.md").mkdir(); (root / ".git").mkdir()
+        diff = diff_structure(snapshot_children(model), root)
+        assert diff.only_in_tree == [(docs_id, "docs"), (utils_id, str(Path("src", "utils.py")))]
+        assert diff.only_on_disk == [(src_id, str(Path("src", "old.py")), False)]  # .git é ignorado
+        assert diff.type_mismatch == [(readme_id, "README.md", False)]
+        plan = build_generation_plan(model, root, node_ids=[node_id for node_id, _ in diff.only_in_tree])
+        assert plan.dirs == [str(root / "docs")]
+        assert [path for path, _ in plan.files] == [str(root / "docs" / "guia.md"), str(root / "src" / "utils.py")]
+
+def test_generation_journal():
+    """Geração que falha no meio: rollback devolve o disco ao estado anterior; executar de novo pula o que já existe."""
+    print("--- Testando diário da geração ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "proj"; root.mkdir()
+        (root / "b.txt").write_text("original"); (root / "c.txt").mkdir()  # Uma pasta onde o plano quer um arquivo
+        plan = GenerationPlan(str(root), [str(root / "a")],
+                              [(str(root / "a" / "x.txt"), "um"), (str(root / "b.txt"), "dois"), (str(root / "c.txt"), "")])
+        def generate():
+            generator = StructureGenerator(plan, max_workers=1).start(); generator.thread.join()
+            return generator, generator.queue.get()
+        generator, (_, error, cancelled) = generate()
+        assert isinstance(error, FileExistsError) and not cancelled and generator.journal.exists()
+        assert generator.journal.rollback() == 3 and not generator.journal.exists()
+        assert sorted(p.name for p in root.iterdir()) == ["b.txt", "c.txt"] and (root / "b.txt").read_text() == "original"
+
+        generator, (_, error, _) = generate()
+        assert error is not None
+        (root / "c.txt").rmdir()
+        generator, (_, error, cancelled) = generate()
+        assert error is None and not cancelled and generator.skipped == 3 and generator.done == 4
+        assert not generator.journal.exists() and not os.path.exists(generator.journal.backup_dir)
+        assert (root / "b.txt").read_text() == "dois" and (root / "c.txt").is_file()
+
+def test_organizer_rules():
+    """A primeira subpasta do mapa que casar vence; extensões como em os.path.splitext; regras de arquivo."""
+    print("--- Testando regras do organizador ---")
+    assert classify("Invoice Report.DOCX") == str(Path("Documentos", "Invoices"))  # Invoices vem antes de Reports
+    assert classify("relatorio_cv.docx") == str(Path("Documentos", "Reports"))
+    assert classify("logo.png") == str(Path("Imagens", "Logos"))
+    assert classify("relatorio.xyz") == "Outros" and classify(".pdf") == "Outros" and classify("pdf") == "Outros"
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_file = Path(tmp) / "rules.json"
+        rules_file.write_text('{"extensions": {"Fotos": ["JPG"]}, "keywords": {"Fotos": {"Viagens": ["praia"]}}}', encoding="utf-8")
+        matcher = RuleMatcher.from_file(rules_file)
+        assert matcher("Praia 01.jpg") == str(Path("Fotos", "Viagens")) and matcher("a.pdf") == "Outros"
+        rules_file.write_text('{"keywords": []}', encoding="utf-8")
+        assert RuleMatcher.from_file(rules_file)("invoice.docx") == str(Path("Documentos", "Invoices"))  # Inválido: padrão
+
+def test_organize_undo():
+    """Organização com colisão de nomes e desfazer pelo diário."""
+    print("--- Testando organização e desfazer ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "pasta"; (root / "Imagens").mkdir(parents=True)
+        (root / "Imagens" / "foto.png").write_text("antiga"); (root / "foto.png").write_text("nova")
+        (root / "nota.txt").write_text("texto")
+        journal = OrganizeJournal(root, Path(tmp) / "diarios")
+        executor = MoveExecutor(root, [(str(root / "foto.png"), "Imagens"), (str(root / "nota.txt"), "Textos")], journal=journal).start()
+        executor.thread.join()
+        assert executor.queue.get() == ("end", False) and not executor.errors
+        assert (root / "Imagens" / "foto (2).png").read_text() == "nova" and (root / "Textos" / "nota.txt").exists()
+        undo = UndoExecutor(root, journal=journal).start(); undo.thread.join()
+        assert sorted(p.name for p in root.iterdir()) == ["Imagens", "foto.png", "nota.txt"]
+        assert (root / "foto.png").read_text() == "nova" and not journal.exists()
+
+def test_duplicate_finder():
+    """Duplicados só com conteúdo idêntico (mesmo início e fim não bastam); o mais antigo é mantido."""
+    print("--- Testando busca de duplicados ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "pasta"; (root / "sub").mkdir(parents=True)
+        data = bytes(range(256)) * (3 * PARTIAL_BLOCK // 256)
+        changed = bytearray(data); changed[len(data) // 2] ^= 1
+        for name, content in [("a.bin", data), ("sub/b.bin", data), ("c.bin", bytes(changed)), ("d.txt", b"x"), ("e.txt", b"x")]:
+            (root / name).write_bytes(content)
+        os.utime(root / "sub" / "b.bin", (1, 1)); os.utime(root / "e.txt", (1, 1))
+        finder = DuplicateFinder(root, recursive=True, cache=HashCache(root, Path(tmp) / "cache")).start(); finder.thread.join()
+        assert sorted((Path(o).name, [Path(d).name for d in dups]) for o, dups, _ in finder.groups) == [("b.bin", ["a.bin"]), ("e.txt", ["d.txt"])]
+        assert sorted(Path(source).name for source, _ in finder.actions) == ["a.bin", "d.txt"]
+
+def test_build_fingerprint():
+    """Registro de etapas do build: includes do requirements.txt e componentes alterados."""
+    print("--- Testando registro de build ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "requirements.txt").write_text("-r base.txt\nrequests\n"); (Path(tmp) / "base.txt").write_text("six\n")
+        assert [Path(p).name for p in requirement_files(Path(tmp) / "requirements.txt")] == ["requirements.txt", "base.txt"]
+        store = FingerprintStore("env", "python", Path(tmp) / "cache")
+        assert store.changes({"a": "1"}) == ["sem registro anterior"]
+        store.save({"a": "1", "b": "2"})
+        assert store.changes({"a": "1", "b": "2"}) == [] and store.changes({"a": "1", "b": "3"}) == ["b"]
+        assert changed_files({"a.py": "1", "b.py": "2"}, {"a.py": "9", "c.py": "3"}) == ["+ c.py", "- b.py", "~ a.py"]
+
+def test_build_log():
+    """Só as linhas mais recentes ficam na memória; o arquivo recebe todas."""
+    print("--- Testando log de build ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        build_log = BuildLog("app", max_lines=100, log_dir=tmp)
+        for i in range(1000): build_log.write(f"linha {i}")
+        lines, dropped, position = build_log.since(0)
+        assert len(lines) == 100 and dropped == 900 and lines[-1] == "linha 999" and position == 1000
+        build_log.write("a\nb"); assert build_log.since(position) == (["a", "b"], 0, 1002)
+        build_log.close()
+        assert Path(build_log.path).read_text(encoding="utf-8").count("\n") == 1002
+        # Mesmo nome no mesmo segundo (ex.: onefile e onedir do mesmo app): arquivos diferentes
+        first, second = BuildLog("app", log_dir=tmp), BuildLog("app", log_dir=tmp)
+        assert first.path != second.path; first.close(); second.close()
+
+def test_build_history():
+    """Subfases lidas do log do PyInstaller e regressões contra a mediana dos builds anteriores."""
+    print("--- Testando histórico de builds ---")
+    phases = PyInstallerPhases()
+    for line in ["120 INFO: PyInstaller: 6.3.0", "500 INFO: checking Analysis", "900 INFO: Building Analysis because Analysis-00.toc is non existent",
+                 "20500 INFO: checking PYZ", "23500 INFO: checking PKG", "30500 INFO: checking EXE", "31000 INFO: Build complete! The results are available in: dist"]:
+        phases.feed(line)
+    assert phases.result() == {"Inicialização": 0.5, "Analysis": 20.0, "PYZ": 3.0, "PKG": 7.0, "EXE": 0.5}
+    with tempfile.TemporaryDirectory() as tmp:
+        history = BuildHistory(Path(tmp) / "history.jsonl")
+        for total in (30, 32, 31):
+            history.append({"project": tmp, "name": "App", "mode": "onefile", "status": "Concluído", "total": total,
+                            "steps": {"Preparando ambiente": 0.1, "Compilando": total}, "skipped": ["Preparando ambiente"]})
+        history.append({"project": tmp, "name": "Outro", "mode": "onefile", "status": "Concluído", "total": 1, "steps": {}})
+        previous = history.entries(tmp, "app", "onefile")
+        assert len(previous) == 3
+        current = {"status": "Concluído", "total": 50, "steps": {"Preparando ambiente": 20, "Compilando": 30}, "skipped": []}
+        rows = {phase: (baseline, regression) for phase, _, baseline, regression in compare_run(current, previous)}
+        # A etapa pulada antes não tem base; o total só se compara com builds que pularam as mesmas etapas
+        assert rows == {"Preparando ambiente": (None, False), "Compilando": (31, False), "Total": (None, False)}
+        current["skipped"] = ["Preparando ambiente"]
+        assert [phase for phase, _, _, regression in compare_run(current, previous) if regression] == ["Total"]
+
+def test_build_probe():
+    """Imports que rodam ao abrir o script e tamanhos lidos do TOC do PyInstaller."""
+    print("--- Testando perfil do executável ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp); script = root / "main.py"
+        script.write_text("import os, json\ntry:\n    import ujson\nexcept ImportError:\n    pass\n"
+                          "from . import local\ndef f():\n    import csv\nif __name__ == '__main__':\n    from email import message\n")
+        assert module_imports(script) == ["import os, json", "import ujson", "from email import message"]
+        (root / "dist").mkdir(); (root / "dist" / "app.exe").write_bytes(b"x" * 100)
+        (root / "lib.dll").write_bytes(b"x" * 30); (root / "build" / "app").mkdir(parents=True)
+        toc = ([], [("json", str(script), "PYMODULE"), ("json.decoder", str(script), "PYMODULE")], [("lib.dll", str(root / "lib.dll"), "BINARY")])
+        (root / "build" / "app" / "Analysis-00.toc").write_text(repr(toc), encoding="utf-8")
+        sizes = bundle_sizes(root / "build", root / "dist" / "app.exe")
+        assert sizes == {"total": 100, "binaries": [("lib.dll", 30)], "data": [], "packages": [("json", 2 * script.stat().st_size)]}
+
+def test_scan_cache():
+    """Listagens guardadas por mtime: a pasta que não mudou vem do cache, mesmo após gravar e reabrir."""
+    print("--- Testando cache de varredura ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "proj"; (root / "src").mkdir(parents=True); (root / "src" / "main.py").touch(); (root / "README.md").touch()
+        for folder in (root, root / "src"): os.utime(folder, (1, 1))  # Fora da janela de mtime "recente" (RACY_SECONDS)
+        cache = ScanCache(root, Path(tmp) / "cache")
+        assert scan_directory(root, cache=cache) == [("src", True), ("README.md", False)]
+        scan_directory(root / "src", cache=cache); cache.save()
+        cache = ScanCache(root, Path(tmp) / "cache")
+        assert scan_directory(root, cache=cache) == [("src", True), ("README.md", False)] and (cache.hits, cache.misses) == (1, 0)
+        (root / "src" / "utils.py").touch(); os.utime(root / "src", (2, 2))
+        assert scan_directory(root / "src", cache=cache) == [("main.py", False), ("utils.py", False)] and cache.misses == 1
+        cache.save(); shutil.rmtree(root / "src"); os.utime(root, (3, 3))
+        cache = ScanCache(root, Path(tmp) / "cache")
+        scan_directory(root, cache=cache); cache.save(prune=True)  # Varredura completa sem "src": ela sai do cache
+        reopened = ScanCache(root, Path(tmp) / "cache"); reopened._load()
+        assert list(reopened._entries) == ["."]
+
+def test_directory_watcher():
+    """Verificação por mtime: criação, exclusão e renomeação nas pastas acompanhadas chegam em ("changes", ...)."""
+    print("--- Testando acompanhamento de pastas ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp); (root / "sub").mkdir(); (root / "old.txt").touch(); (root / "sub" / "a.txt").touch()
+        (root / "sub" / "nested").mkdir(); (root / ".git").mkdir()
+        watcher = DirectoryWatcher(root, use_native=False); watcher.POLL_INTERVAL = 0.1
+        watcher.start()
+        try:
+            watcher.add_folder(root, {"sub": True, "old.txt": False}); watcher.add_folder(root / "sub", {"a.txt": False, "nested": True})
+            time.sleep(0.3)
+            (root / "new.txt").touch(); (root / "old.txt").unlink(); (root / "sub" / "a.txt").rename(root / "sub" / "b.txt")
+            (root / "sub" / "nested" / "ignorado.txt").touch(); (root / ".git" / "HEAD").touch()  # Não acompanhadas
+            expected = {str(root / "new.txt"), str(root / "old.txt"), str(root / "sub" / "a.txt"), str(root / "sub" / "b.txt")}
+            changes, deadline = set(), time.monotonic() + 5
+            while changes != expected and time.monotonic() < deadline:
+                try: kind, paths = watcher.queue.get(timeout=0.1)
+                except queue.Empty: continue
+                assert kind == "changes"; changes |= paths
+            assert changes == expected
+        finally:
+            watcher.stop()
 
 
 if __name__ == "__main__":
-    test_export_to_text()
\ No newline at end of file
+    test_export_to_text()
+    test_get_structure_roundtrip()
+    test_edit_operations()
+    test_is_folder_heuristic()
+    test_incremental_export()
+    test_name_index_search()
+    test_compact_preset_roundtrip()
+    test_preset_catalog()
+    test_structure_diff()
+    test_generation_journal()
+    test_organizer_rules()
+    test_organize_undo()
+    test_duplicate_finder()
+    test_build_fingerprint()
+    test_build_log()
+    test_build_history()
+    test_build_probe()
+    test_scan_cache()
+    test_directory_watcher()
+    print("\nTodos os testes passaram.")
@@ -0,0 +1,151 @@
+# src/tree_export.py
+"""
+Exportação ASCII incremental da árvore para o painel "Visualização da Estrutura".
+
+O exportador escuta as mutações do TreeModel e mantém o número de linhas de cada
+subárvore. Com isso sabe em que faixa de linhas cada nó está e, para cada
+alteração, gera só o trecho afetado (um "patch") em vez do texto inteiro.
+"""
+
+class TreeTextExporter:
+    # Acima deste número de patches pendentes, regenerar tudo sai mais barato
+    MAX_PENDING_PATCHES = 200
+
+    def __init__(self, model):
+        self.model = model
+        self.sizes = {}        # id do nó -> nº de linhas da subárvore (o próprio nó incluído)
+        self._patches = []     # [(linha_inicial, nº_linhas_antigas, novas_linhas)]; linha 0 = cabeçalho
+        self._full = True      # Próxima renderização deve ser completa
+        self._project_name = None
+        self._prefixes = {}    # (prefixo_do_pai, é_último) -> prefixo dos filhos (strings reaproveitadas)
+        model.add_listener(self._on_model_event)
+
+    # --- API usada pela janela principal ---
+    def render(self, project_name: str = "MeuProjeto"):
+        """
+        Retorna ("full", texto) ou ("patch", [(linha_inicial, nº_linhas_antigas, novas_linhas), ...]).
+        Os patches devem ser aplicados em ordem, cada um sobre o resultado do anterior.
+        """
+        if self._full or len(self._patches) > self.MAX_PENDING_PATCHES:
+            self._full = False; self._patches = []
+            self._project_name = project_name
+            return "full", "\n".join(self._full_lines(project_name))
+        patches, self._patches = self._patches, []
+        if project_name != self._project_name:
+            self._project_name = project_name
+            patches.append((0, 1, [f"{project_name}/"]))
+        return "patch", patches
+
+    def invalidate(self):
+        """Força a próxima renderização a ser completa."""
+        self._full = True; self._patches = []
+
+    # --- Renderização ---
+    def _child_prefix(self, prefix: str, is_last: bool) -> str:
+        key = (prefix, is_last)
+        cached = self._prefixes.get(key)
+        if cached is None:
+            cached = self._prefixes[key] = prefix + ("    " if is_last else "│   ")
+        return cached
+
+    def _render_into(self, node, prefix: str, is_last: bool, lines: list):
+        stack = [(node, prefix, is_last)]
+        while stack:
+            node, prefix, is_last = stack.pop()
+            lines.append(f"{prefix}{'└── ' if is_last else '├── '}{node.name}")
+            if node.children:
+                child_prefix = self._child_prefix(prefix, is_last)
+                last = len(node.children) - 1
+                stack.extend((c, child_prefix, i == last) for i, c in reversed(list(enumerate(node.children))))
+
+    def _full_lines(self, project_name: str) -> list[str]:
+        lines = [f"{project_name}/"]
+        children = self.model.root.children
+        for i, child in enumerate(children): self._render_into(child, "    ", i == len(children) - 1, lines)
+        self._recompute_sizes()
+        return lines
+
+    def _recompute_sizes(self):
+        self.sizes = {}
+        self._compute_subtree_sizes(self.model.root)
+
+    def _compute_subtree_sizes(self, node) -> int:
+        """Calcula (em pós-ordem, sem recursão) o tamanho de cada nó da subárvore."""
+        order = [node]
+        for current in order: order.extend(current.children)
+        sizes = self.sizes
+        for current in reversed(order):
+            sizes[current.id] = 1 + sum(sizes[c.id] for c in current.children)
+        return sizes[node.id]
+
+    def _is_last(self, node) -> bool:
+        return node.parent.children[-1] is node
+
+    def _prefix_of(self, node) -> str:
+        """Prefixo da linha de `node`, montado a partir dos ancestrais."""
+        chain = []; ancestor = node.parent
+        while ancestor is not None and ancestor is not self.model.root:
+            chain.append(ancestor); ancestor = ancestor.parent
+        prefix = "    "
+        for ancestor in reversed(chain): prefix = self._child_prefix(prefix, self._is_last(ancestor))
+        return prefix
+
+    def _line_of(self, node) -> int:
+        """Linha do nó: a do pai + 1 + as linhas dos irmãos anteriores."""
+        line = 0
+        while node is not self.model.root:
+            parent = node.parent; sizes = self.sizes
+            for sibling in parent.children:
+                if sibling is node: break
+                line += sizes[sibling.id]
+            line += 1; node = parent
+        return line
+
+    def _node_line(self, node) -> str:
+        return f"{self._prefix_of(node)}{'└── ' if self._is_last(node) else '├── '}{node.name}"
+
+    def _render_node(self, node) -> list[str]:
+        lines = []
+        self._render_into(node, self._prefix_of(node), self._is_last(node), lines)
+        return lines
+
+    def _add_to_ancestors(self, node, delta: int):
+        while node is not None:
+            self.sizes[node.id] += delta; node = node.parent
+
+    # --- Eventos do modelo ---
+    def _on_model_event(self, event, node=None, **data):
+        # Com uma renderização completa já pendente, não há o que manter até lá
+        if event == "clear" or self._full or len(self._patches) > self.MAX_PENDING_PATCHES:
+            self.invalidate(); return
+        if event == "insert": self._on_insert(node)
+        elif event == "remove": self._on_remove(node, data["parent"], data["index"])
+        elif event == "rename": self._patches.append((self._line_of(node), 1, [self._node_line(node)]))
+
+    def _on_insert(self, node):
+        parent = node.parent
+        size = self._compute_subtree_sizes(node)
+        self._add_to_ancestors(parent, size)
+        index = parent.children.index(node)
+        if index > 0 and index == len(parent.children) - 1:
+            # O irmão anterior deixou de ser o último: a subárvore dele muda de "└──" para "├──"
+            previous = parent.children[index - 1]
+            start = self._line_of(previous)
+            self._patches.append((start, self.sizes[previous.id], self._render_node(previous) + self._render_node(node)))
+        else:
+            self._patches.append((self._line_of(node), 0, self._render_node(node)))
+
+    def _on_remove(self, node, parent, index):
+        size = self.sizes[node.id]
+        stack = [node]
+        while stack:
+            current = stack.pop(); self.sizes.pop(current.id, None); stack.extend(current.children)
+        self._add_to_ancestors(parent, -size)
+        if index > 0 and index == len(parent.children):
+            # O item removido era o último: o irmão anterior passa a ser o último
+            previous = parent.children[index - 1]
+            start = self._line_of(previous)
+            self._patches.append((start, self.sizes[previous.id] + size, self._render_node(previous)))
+        else:
+            start = self._line_of(parent) + 1 + sum(self.sizes[c.id] for c in parent.children[:index])
+            self._patches.append((start, size, []))
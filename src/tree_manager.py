@@ -3,22 +3,70 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from tkinter import simpledialog, messagebox
 from pathlib import Path
+import os
 import logging
-import fnmatch  # Import para correspondência de padrões de arquivo
+import queue
+import time
+from contextlib import contextmanager
 
 # Imports que adicionamos para a nova funcionalidade
 from .ui_dialogs import CreateFileDialog
-from .app_config import IGNORED_DIRS_AND_FILES
+from .tree_model import TreeModel, iter_structure_nodes
+from .tree_export import TreeTextExporter
+from .tree_search import NameIndex
+from .dir_scanner import DirectoryImporter, scan_directory
+from .dir_watcher import DirectoryWatcher
+from .scan_cache import ScanCache
 
 log = logging.getLogger(__name__)
 
+class _TreeLoad:
+    """Estado de um carregamento em etapas (ver TreeManager.build_from_nodes)."""
+    def __init__(self, nodes, parent_id, on_progress, on_done):
+        self.nodes = iter(nodes)
+        self.parents = [parent_id]  # Pai de cada profundidade; None = pai excluído durante o carregamento
+        self.created = []           # Ids de primeiro nível, para desfazer ao cancelar
+        self.count = 0
+        self.cancelled = False
+        self.on_progress, self.on_done = on_progress, on_done
+
 class TreeManager:
+    """
+    Controla a árvore do projeto. A estrutura vive em `self.model` (TreeModel);
+    o Treeview é apenas a visualização, mantida em sincronia a cada operação.
+    """
+    LOAD_SLICE = 0.03  # Segundos de inserção por etapa de um carregamento (ver build_from_nodes)
+    # Destaques da comparação com o disco (ver highlight_diff)
+    DIFF_TAGS = {"diff_new": "#2e7d32", "diff_type": "#c62828", "diff_extra": "#ef6c00"}
+
     def __init__(self, tree_widget: ttk.Treeview, icons: dict):
         self.tree = tree_widget
+        self.model = TreeModel()
+        self.exporter = TreeTextExporter(self.model)
+        self.search_index = NameIndex(self.model)
         self.icons = icons
         self.clipboard = None
         self.drag_data = {"item": None}
         self.on_update_callback = None
+        # Notificações suspensas durante operações em lote (ver batch_updates)
+        self._suspend_count = 0
+        self._suspended_message = None
+        # Pastas do disco ainda não varridas (carregamento sob demanda): {item_id: Path}
+        self._lazy_paths = {}
+        # Cache das listagens da pasta aberta (ScanCache), gravado ao trocar de projeto ou sair
+        self._scan_cache = None
+        # Importação em segundo plano (DirectoryImporter) em andamento, se houver
+        self._importer = None
+        self._import_keys = {}
+        self._import_callbacks = (None, None)
+        # Carregamento em etapas (preset, template ou colar) em andamento, se houver
+        self._load = None
+        # Acompanhamento da pasta espelhada pela árvore (DirectoryWatcher), se ativo
+        self._watcher = None
+        self._watch_root = None
+        self._diff_marked = set()  # Itens com destaque de comparação
+        for tag, color in self.DIFF_TAGS.items(): self.tree.tag_configure(tag, foreground=color)
+        self.model.add_listener(self._on_model_event)
         self._bind_events()
 
     def set_on_update_callback(self, callback):
@@ -45,117 +93,430 @@ class TreeManager:
     def rename_item(self):
         item_id = self.get_selected_item()
         if not item_id: return
-        current_name = self.tree.item(item_id, "text")
+        current_name = self.model.name(item_id)
         new_name = simpledialog.askstring("Renomear", "Novo nome:", initialvalue=current_name)
         if new_name and new_name.strip():
             name = new_name.strip()
+            self.model.rename(item_id, name)
             self.tree.item(item_id, text=name); self._update_icon(item_id)
             self._notify_update(f"'{current_name}' renomeado para '{name}'.")
 
     def delete_selected_items(self):
         selected_ids = self.tree.selection()
         if not selected_ids: return
-        item_names = [f"'{self.tree.item(i, 'text')}'" for i in selected_ids]
+        item_names = [f"'{self.model.name(i)}'" for i in selected_ids]
         if messagebox.askyesno("Confirmar Exclusão", f"Tem certeza que deseja excluir {', '.join(item_names)}?"):
-            for item_id in selected_ids: self.tree.delete(item_id)
+            for item_id in selected_ids:
+                # Um item selecionado pode já ter sido removido junto com o pai
+                if item_id in self.model: self._delete_item(item_id)
             self._notify_update(f"{len(item_names)} item(s) excluído(s).")
             
     def copy_item(self):
         item_id = self.get_selected_item()
         if not item_id: return
-        item_text = self.tree.item(item_id, "text")
+        item_text = self.model.name(item_id)
         self.clipboard = {item_text: self.get_structure(item_id)}
         self._notify_update(f"Item '{item_text}' copiado.")
 
-    def paste_item(self):
-        if not self.clipboard: return
+    def paste_item(self, on_progress=None, on_done=None):
+        if not self.clipboard: return False
+        if self._load:
+            messagebox.showwarning("Aviso", "Aguarde o fim do carregamento atual."); return False
         parent_id = self.get_selected_item_as_folder()
-        self.build_from_structure(self.clipboard, parent_id=parent_id)
+        return self.build_from_structure(self.clipboard, parent_id, on_progress, on_done)
+
+    def search(self, query, mode="contains"):
+        """Consulta o índice de nomes (ver tree_search.NameIndex). Retorna ids na ordem da árvore."""
+        return self.search_index.search(query, mode)
 
-    def find_item(self):
-        search_term = simpledialog.askstring("Localizar", "Digite o nome do item:")
-        if not search_term: return
-        found_item = self._find_recursive(search_term.lower())
-        if found_item:
-            self.tree.selection_set(found_item); self.tree.see(found_item); self.tree.focus(found_item)
-        else: messagebox.showinfo("Não Encontrado", f"Nenhum item contendo '{search_term}' foi encontrado.")
+    def select_items(self, item_ids):
+        """Seleciona os itens e traz o primeiro para a área visível."""
+        if not item_ids: return
+        self.tree.selection_set(item_ids); self.tree.see(item_ids[0]); self.tree.focus(item_ids[0])
 
     def clear_tree(self):
+        if self._importer: self._finish_import(self._importer.count, cancelled=True)
+        if self._load: self._finish_load(cancelled=True, rollback=False)
+        self.stop_watching()  # A árvore deixa de espelhar a pasta
+        self.save_scan_cache(); self._scan_cache = None
+        self.model.clear(); self._lazy_paths.clear()
         self.tree.delete(*self.tree.get_children());
         # A notificação de "árvore limpa" será feita por quem chamou o clear_tree
+
+    def has_items(self):
+        return not self.model.is_empty()
         
     def get_structure(self, parent_id=""):
-        return {self.tree.item(i, "text"): self.get_structure(i) or None for i in self.tree.get_children(parent_id)}
+        self.load_pending(parent_id)
+        return self.model.get_structure(parent_id)
         
-    def build_from_structure(self, structure: dict, parent_id=""):
-        if not structure: return
-        for name, children in structure.items():
-            is_folder = bool(children)
-            item_id = self._insert_item(parent_id, name, is_folder=is_folder)
-            if children: self.build_from_structure(children, parent_id=item_id)
-        self._notify_update("Estrutura carregada.")
+    def build_from_structure(self, structure: dict, parent_id="", on_progress=None, on_done=None):
+        """Carrega um dicionário aninhado (preset JSON, template, área de transferência). Ver build_from_nodes."""
+        if not structure: return False
+        return self.build_from_nodes(iter_structure_nodes(structure), parent_id, on_progress, on_done)
+
+    # --- Carregamento em etapas ---
+    def build_from_nodes(self, nodes, parent_id="", on_progress=None, on_done=None):
+        """
+        Carrega uma sequência em pré-ordem de (profundidade, é_pasta, nome), como a de um preset compacto,
+        em etapas de LOAD_SLICE segundos via after(), sem recursão; as pastas entram recolhidas.
+        A primeira etapa roda já na chamada, então estruturas pequenas terminam antes do retorno.
+        on_progress(itens_inseridos) é chamado a cada etapa; on_done(total, cancelado, erro) ao final.
+        Retorna True se o carregamento continua em segundo plano (pode ser interrompido com cancel_load).
+        """
+        if self._load: self._finish_load(cancelled=True)
+        self._load = load = _TreeLoad(nodes, parent_id, on_progress, on_done)
+        self.suspend_updates()  # Uma só notificação (e renderização do texto) ao final
+        self._process_load(load)
+        return self._load is load
+
+    def is_loading(self):
+        return self._load is not None
+
+    def cancel_load(self):
+        if self._load: self._load.cancelled = True
+
+    def _process_load(self, load):
+        if load is not self._load: return  # Carregamento substituído ou interrompido
+        if load.cancelled:
+            self._finish_load(cancelled=True); return
+        deadline = time.perf_counter() + self.LOAD_SLICE
+        try:
+            for depth, is_folder, name in load.nodes:
+                self._load_node(load, depth, is_folder, name)
+                if not load.count % 256 and time.perf_counter() > deadline: break
+            else:
+                self._finish_load(); return
+        except (OSError, EOFError, ValueError) as e:  # Ex.: preset compacto truncado, lido em fluxo
+            self._finish_load(error=e); return
+        except Exception as e:  # Inesperado: ainda assim encerra, senão a árvore fica suspensa com _load preso
+            log.exception("Erro inesperado ao carregar a estrutura")
+            self._finish_load(error=e); return
+        if load.on_progress: load.on_progress(load.count)
+        self.tree.after(1, self._process_load, load)
+
+    def _load_node(self, load, depth, is_folder, name):
+        parents = load.parents
+        if depth >= len(parents): raise ValueError(f"Profundidade inválida na sequência de nós: {depth}")
+        del parents[depth + 1:]
+        parent_id = parents[depth]
+        if parent_id is None or parent_id not in self.model:
+            parents.append(None); return  # A pasta pai foi excluída pelo usuário durante o carregamento
+        item_id = self._insert_item(parent_id, name, is_folder=is_folder, open=False)
+        if depth == 0: load.created.append(item_id)
+        parents.append(item_id); load.count += 1
+
+    def _finish_load(self, cancelled=False, error=None, rollback=True):
+        load, self._load = self._load, None
+        if hasattr(load.nodes, "close"): load.nodes.close()  # Fecha o arquivo de um preset lido em fluxo
+        if (cancelled or error) and rollback:
+            # Um carregamento interrompido não deixa uma estrutura pela metade
+            for item_id in load.created:
+                if item_id in self.model: self.model.delete(item_id); self.tree.delete(item_id)
+        if error: log.error(f"Erro ao carregar a estrutura: {error}")
+        if cancelled or error: self.resume_updates("Carregamento cancelado." if cancelled else "Erro ao carregar a estrutura.")
+        else: self.resume_updates(None if self._suspended_message else f"Estrutura carregada: {load.count} itens.")
+        if load.on_done: load.on_done(load.count, cancelled, error)
     
-    # --- FUNÇÃO CORRIGIDA ---
     def export_to_text(self, project_name="MeuProjeto"):
-        if not self.tree.get_children(): return f"{project_name}/"
-        lines = [f"{project_name}/"]; children = self.tree.get_children()
-        for i, item_id in enumerate(children):
-            self._export_recursive(item_id, "    ", i == len(children) - 1, lines)
-        return "\n".join(lines)
+        return self.model.export_to_text(project_name)
 
     # --- MÉTODO NOVO PARA IMPORTAR ESTRUTURA ---
-    def load_from_directory(self, root_path: Path):
+    def load_from_directory(self, root_path: Path, lazy: bool = True):
         """
         Limpa a árvore atual e a popula com a estrutura de diretórios de um caminho.
         Ignora arquivos e pastas definidos em app_config.IGNORED_DIRS_AND_FILES.
+        Com `lazy=True` apenas o primeiro nível é inserido; o conteúdo de cada pasta
+        é lido quando ela é expandida (<<TreeviewOpen>>).
         """
         self.clear_tree()
-        self._populate_tree_recursive(root_path, "")
+        self._scan_cache = ScanCache(root_path)
+        if lazy: self._populate_level(root_path, "")
+        else: self._populate_tree_recursive(root_path, "")
         log.info(f"Estrutura de '{root_path.name}' carregada na árvore.")
 
+    def import_directory_async(self, root_path: Path, on_progress=None, on_done=None):
+        """
+        Importa a pasta inteira em segundo plano: uma thread varre o disco com os.scandir e
+        os itens chegam à árvore em lotes, drenados da fila via after() (como em BuildWindow).
+        on_progress(itens_inseridos) é chamado a cada ciclo; on_done(total, cancelado) ao final.
+        """
+        self.clear_tree()
+        self._scan_cache = ScanCache(root_path)  # Lido e gravado pela thread do importador
+        self._importer = DirectoryImporter(root_path, cache=self._scan_cache).start()
+        self._import_keys = {0: ""}
+        self._import_callbacks = (on_progress, on_done)
+        self.tree.after(50, self._process_import_queue, self._importer)
+        return self._importer
+
+    def cancel_import(self):
+        if self._importer: self._importer.cancel()
+
+    def _process_import_queue(self, importer):
+        if importer is not self._importer: return  # Importação substituída ou interrompida
+        on_progress = self._import_callbacks[0]
+        deadline = time.perf_counter() + 0.05  # Limita o tempo por ciclo para a UI continuar respondendo
+        try:
+            while time.perf_counter() < deadline:
+                msg = importer.queue.get_nowait()
+                if msg[0] == "batch":
+                    if not importer.cancelled: self._insert_import_batch(msg[1])
+                elif msg[0] == "end":
+                    _, total, cancelled = msg
+                    self._finish_import(total, cancelled)
+                    self._notify_update("Importação cancelada." if cancelled else f"Importação concluída: {total} itens.")
+                    return
+        except queue.Empty: pass
+        if on_progress: on_progress(len(self.model))
+        self.tree.after(50, self._process_import_queue, importer)
+
+    def _finish_import(self, total, cancelled):
+        self._importer.cancel()  # Garante que a thread pare se ainda estiver rodando
+        on_done = self._import_callbacks[1]
+        self._importer = None; self._import_keys = {}; self._import_callbacks = (None, None)
+        if on_done: on_done(total, cancelled)
+
+    def _insert_import_batch(self, batch):
+        keys = self._import_keys
+        for parent_key, key, name, is_folder in batch:
+            parent_id = keys.get(parent_key)
+            # A pasta pai pode ter sido excluída pelo usuário durante a importação
+            if parent_id is None or parent_id not in self.model: continue
+            item_id = self._insert_item(parent_id, name, is_folder=is_folder, open=False)
+            if is_folder: keys[key] = item_id
+
+    def load_pending(self, item_id=""):
+        """Varre por completo as pastas ainda pendentes sob `item_id` (antes de copiar, salvar ou gerar)."""
+        loaded = 0
+        with self.batch_updates():  # Uma só notificação (e exportação do texto) para todas as pastas
+            while True:
+                pending = [i for i in self._lazy_paths if self._is_within(i, item_id)]
+                if not pending: break
+                for pending_id in pending: loaded += self._load_lazy_folder(pending_id)
+            if loaded: self._notify_update(f"{loaded} pasta(s) pendente(s) carregada(s).")
+
+    def _is_within(self, item_id, ancestor_id):
+        while item_id:
+            if item_id == ancestor_id: return True
+            item_id = self.model.parent(item_id)
+        return ancestor_id == ""
+
+    def _populate_level(self, current_path: Path, parent_item_id: str):
+        """Insere só o conteúdo imediato de `current_path`; subpastas ganham um filho provisório."""
+        for name, is_folder in self._scan_directory(current_path):
+            self._insert_lazy_entry(parent_item_id, name, is_folder, current_path / name)
+
+    def _insert_lazy_entry(self, parent_id, name, is_folder, path: Path, index=None):
+        item_id = self._insert_item(parent_id, name, is_folder=is_folder, open=False, index=index)
+        if is_folder:
+            self._lazy_paths[item_id] = path
+            # O filho provisório existe só na visualização, para o Treeview mostrar o indicador de expandir
+            self.tree.insert(item_id, tk.END, iid=self._placeholder_id(item_id), text="...")
+        return item_id
+
+    def _placeholder_id(self, item_id):
+        return f"{item_id}::pendente"
+
+    def _load_lazy_folder(self, item_id):
+        """Insere o conteúdo de uma pasta pendente. Retorna False se ela já estava carregada."""
+        path = self._lazy_paths.pop(item_id, None)
+        if path is None: return False
+        placeholder = self._placeholder_id(item_id)
+        if self.tree.exists(placeholder): self.tree.delete(placeholder)
+        self._populate_level(path, item_id)
+        if self._watcher: self._watcher.add_folder(path, self._child_entries(self.model.get(item_id)))
+        return True
+
+    def _on_tree_open(self, event=None):
+        item_id = self.tree.focus()
+        if self._load_lazy_folder(item_id): self._notify_update(f"Pasta '{self.model.name(item_id)}' carregada.")
+
     # --- MÉTODO AUXILIAR NOVO RECURSIVO ---
     def _populate_tree_recursive(self, current_path: Path, parent_item_id: str):
         """
-        Método recursivo que varre um diretório e adiciona seus conteúdos à árvore.
+        Varre um diretório e todas as subpastas (com uma pilha, sem recursão) e adiciona seus conteúdos à árvore.
         """
+        stack = [(current_path, parent_item_id)]
+        while stack:
+            path, parent_id = stack.pop()
+            subfolders = []
+            for name, is_folder in self._scan_directory(path):
+                item_id = self._insert_item(parent_id, name, is_folder=is_folder)
+                if is_folder: subfolders.append((path / name, item_id))
+            stack.extend(reversed(subfolders))
+        # Varredura completa: pastas que não foram visitadas não existem mais
+        if self._scan_cache: self._scan_cache.save(prune=True)
+
+    def save_scan_cache(self):
+        if self._scan_cache: self._scan_cache.save()
+
+    def _scan_directory(self, current_path: Path):
+        """Lista (nome, é_pasta) de um diretório, pastas primeiro, sem os itens ignorados."""
         try:
-            items = sorted(list(current_path.iterdir()), key=lambda p: (not p.is_dir(), p.name.lower()))
-            for item in items:
-                if any(fnmatch.fnmatch(item.name, pattern) for pattern in IGNORED_DIRS_AND_FILES):
-                    continue
-                is_folder = item.is_dir()
-                item_id = self._insert_item(parent_item_id, item.name, is_folder=is_folder)
-                if is_folder:
-                    self._populate_tree_recursive(item, item_id)
+            return scan_directory(current_path, cache=self._scan_cache)
         except PermissionError:
             log.warning(f"Sem permissão para ler o diretório: {current_path}")
         except Exception as e:
             log.error(f"Erro ao ler o diretório {current_path}: {e}")
+        return []
             
+    # --- Acompanhamento de alterações no disco ---
+    def watch_directory(self, root_path: Path):
+        """
+        Mantém a árvore em sincronia com `root_path` (a pasta que ela espelha): criações,
+        exclusões e renomeações no disco chegam agrupadas e são aplicadas item a item.
+        Só as pastas já carregadas são acompanhadas; as demais entram ao serem expandidas.
+        Para com stop_watching ou quando a árvore é limpa.
+        """
+        self.stop_watching()
+        self._watcher = DirectoryWatcher(root_path).start()
+        self._watch_root = Path(root_path)
+        for path, node in self._loaded_folders(): self._watcher.add_folder(path, self._child_entries(node))
+        log.info(f"Acompanhando alterações em '{self._watch_root.name}' ({self._watcher.backend}).")
+        self.tree.after(300, self._process_watch_queue, self._watcher)
+        return self._watcher
+
+    def _loaded_folders(self):
+        """
+        (caminho no disco, nó) da raiz e das pastas já carregadas (fora de _lazy_paths), nível a nível:
+        se forem mais que DirectoryWatcher.MAX_FOLDERS, as mais perto da raiz têm preferência.
+        """
+        level = [(self._watch_root, self.model.root)]
+        while level:
+            yield from level
+            level = [(path / child.name, child) for path, node in level for child in node.children
+                     if child.is_folder and child.id not in self._lazy_paths]
+
+    @staticmethod
+    def _child_entries(node) -> dict:
+        return {child.name: child.is_folder for child in node.children}
+
+    def stop_watching(self):
+        if self._watcher: self._watcher.stop(); self._watcher = None
+
+    def is_watching(self):
+        return self._watcher is not None
+
+    def _process_watch_queue(self, watcher):
+        if watcher is not self._watcher: return  # Acompanhamento encerrado ou substituído
+        # Durante uma importação ou carregamento as alterações esperam na fila
+        if not (self._importer or self._load):
+            changes = set()
+            try:
+                while True: changes.update(watcher.queue.get_nowait()[1])
+            except queue.Empty: pass
+            if changes: self.apply_disk_changes(changes)
+        self.tree.after(300, self._process_watch_queue, watcher)
+
+    def apply_disk_changes(self, paths):
+        """
+        Confere no disco o estado atual de cada caminho alterado e atualiza só os itens correspondentes.
+        Pastas ainda não carregadas (sob demanda) são ignoradas: serão lidas ao expandir.
+        Retorna o nº de itens inseridos ou removidos.
+        """
+        applied = 0
+        self.suspend_updates()
+        try:
+            for path in sorted(paths, key=lambda p: p.count(os.sep)):  # Pais antes dos filhos
+                try: parts = Path(path).relative_to(self._watch_root).parts
+                except ValueError: continue
+                if not parts: continue
+                parent = self._node_at(parts[:-1])
+                if parent is None or parent.id in self._lazy_paths: continue
+                name = parts[-1]
+                node = next((c for c in parent.children if c.name == name), None)
+                exists = os.path.lexists(path); is_folder = exists and os.path.isdir(path)
+                if node is not None and exists and node.is_folder == is_folder: continue
+                if node is not None: self._delete_item(node.id); applied += 1
+                if exists:
+                    self._insert_lazy_entry(parent.id, name, is_folder, Path(path),
+                                            index=self._sorted_index(parent, name, is_folder))
+                    applied += 1
+        finally:
+            self.resume_updates(f"{applied} alteração(ões) do disco aplicada(s)." if applied else None)
+        return applied
+
+    def _node_at(self, parts):
+        """Nó da árvore no caminho relativo `parts` (nomes a partir da raiz), ou None."""
+        node = self.model.root
+        for part in parts:
+            node = next((c for c in node.children if c.name == part), None)
+            if node is None: return None
+        return node
+
+    def _sorted_index(self, parent, name, is_folder):
+        """Posição na ordem da varredura (pastas primeiro, depois por nome)."""
+        key = (not is_folder, name.lower())
+        for index, child in enumerate(parent.children):
+            if (not child.is_folder, child.name.lower()) > key: return index
+        return None
+
+    # --- Destaque da comparação com o disco ---
+    def highlight_diff(self, diff):
+        """
+        Destaca o resultado de structure_diff.diff_structure: itens só na árvore (diff_new), com tipo
+        diferente (diff_type) e pastas com itens que só existem no disco (diff_extra).
+        """
+        self.clear_diff_highlight()
+        marks = {node_id: "diff_new" for node_id, _ in diff.only_in_tree}
+        marks.update((node_id, "diff_type") for node_id, _, _ in diff.type_mismatch)
+        for parent_id, _, _ in diff.only_on_disk: marks.setdefault(parent_id, "diff_extra")
+        for item_id, tag in marks.items():
+            if item_id and self.tree.exists(item_id):  # A raiz não tem linha; o item pode ter sido excluído
+                self.tree.item(item_id, tags=self._base_tags(item_id) + (tag,)); self._diff_marked.add(item_id)
+        return len(self._diff_marked)
+
+    def clear_diff_highlight(self):
+        for item_id in self._diff_marked:
+            if self.tree.exists(item_id): self.tree.item(item_id, tags=self._base_tags(item_id))
+        self._diff_marked.clear()
+
+    def _on_model_event(self, event, node=None, **data):
+        if self._diff_marked: self.clear_diff_highlight()  # Qualquer alteração invalida a comparação
+
+    def _base_tags(self, item_id):
+        return tuple(tag for tag in self.tree.item(item_id, "tags") if tag not in self.DIFF_TAGS)
+
     def get_selected_item(self):
         selection = self.tree.selection(); return selection[0] if selection else None
         
     def get_selected_item_as_folder(self):
         item_id = self.get_selected_item()
         if not item_id: return ""
-        return item_id if self.is_folder_node(item_id) else self.tree.parent(item_id)
+        return item_id if self.is_folder_node(item_id) else self.model.parent(item_id)
 
     def is_folder_node(self, item_id):
-        if not item_id: return True
-        # A maneira mais segura de saber se é uma pasta é ver se tem filhos,
+        # A maneira mais segura de saber se é uma pasta é ver se tem filhos, a marca de pasta
         # ou se não tem extensão (com algumas exceções, mas é uma boa heurística).
-        if self.tree.get_children(item_id): return True
-        tags = self.tree.item(item_id, "tags")
-        if "folder" in tags: return True # Se usarmos tags para marcar
-        item_text = self.tree.item(item_id, "text")
-        return "." not in item_text
+        return self.model.is_folder(item_id)
 
     def _bind_events(self):
         self.tree.bind("<ButtonPress-1>", self._on_drag_start)
         self.tree.bind("<B1-Motion>", self._on_drag_motion)
         self.tree.bind("<ButtonRelease-1>", self._on_drag_stop)
+        self.tree.bind("<<TreeviewOpen>>", self._on_tree_open)
+
+    def suspend_updates(self):
+        self._suspend_count += 1
+
+    def resume_updates(self, message: str | None = None):
+        """Reativa as notificações; se houve alterações no período, notifica uma única vez."""
+        self._suspend_count = max(self._suspend_count - 1, 0)
+        if message: self._suspended_message = message
+        if self._suspend_count: return  # Ainda dentro de outro lote: a mensagem fica para o final dele
+        pending, self._suspended_message = self._suspended_message, None
+        if pending: self._notify_update(pending)
+
+    @contextmanager
+    def batch_updates(self, message: str | None = None):
+        """Agrupa as notificações de uma operação em lote em uma só, emitida ao final."""
+        self.suspend_updates()
+        try: yield
+        finally: self.resume_updates(message)
 
     def _notify_update(self, message: str = "Estrutura atualizada."):
+        if self._suspend_count:
+            self._suspended_message = message; return
         log.info(message)
         if self.on_update_callback: self.on_update_callback()
 
@@ -166,52 +527,56 @@ class TreeManager:
                     ".png": "image", ".jpg": "image", ".svg": "image", ".ico": "image"}
         return self.icons.get(mapping.get(ext, "file"))
 
-    def _insert_item(self, parent_id, text, is_folder=False):
-        icon = self.icons.get("folder") if is_folder else self._get_icon_for_file(text)
-        opts = {"text": text, "open": True}
+    def _insert_item(self, parent_id, text, is_folder=False, open=True, index=None):
+        item_id = self.model.insert(parent_id, text, is_folder=is_folder, index=index)
+        self._insert_view(self.model.get(item_id), tk.END if index is None else index, open=open)
+        return item_id
+
+    def _delete_item(self, item_id):
+        for removed_id in self.model.delete(item_id): self._lazy_paths.pop(removed_id, None)
+        self.tree.delete(item_id)
+
+    def _insert_view(self, node, index=tk.END, open=True):
+        """Cria no Treeview a linha correspondente a um nó do modelo (mesmo iid)."""
+        icon = self.icons.get("folder") if node.is_folder else self._get_icon_for_file(node.name)
+        opts = {"text": node.name, "open": open}
         if icon: opts["image"] = icon
-        if is_folder: opts["tags"] = ("folder",)
-        return self.tree.insert(parent_id, tk.END, **opts)
+        if node.is_folder: opts["tags"] = ("folder",)
+        return self.tree.insert(node.parent.id, index, iid=node.id, **opts)
+
+    def _move_item(self, item_id, parent_id, index=None):
+        """Move no modelo e replica no Treeview. Retorna False se o movimento for inválido."""
+        try: final_index = self.model.move(item_id, parent_id, index)
+        except ValueError: return False
+        # detach + move: o índice passa a ser contado sem o próprio item, como no modelo
+        self.tree.detach(item_id); self.tree.move(item_id, parent_id, final_index)
+        return True
 
     def _update_icon(self, item_id):
         is_folder = self.is_folder_node(item_id)
-        icon_key = "folder" if is_folder else self._get_icon_for_file(self.tree.item(item_id, "text"))
-        if self.icons.get(icon_key): self.tree.item(item_id, image=self.icons.get(icon_key))
-            
-    
-    def _find_recursive(self, search_term, parent_item=""):
-        for item_id in self.tree.get_children(parent_item):
-            if search_term in self.tree.item(item_id, "text").lower(): return item_id
-            found = self._find_recursive(search_term, item_id)
-            if found: return found
-        return None
+        icon = self.icons.get("folder") if is_folder else self._get_icon_for_file(self.model.name(item_id))
+        if icon: self.tree.item(item_id, image=icon)
+
 
-    def _export_recursive(self, item_id, prefix, is_last, lines):
-        lines.append(f"{prefix}{'└── ' if is_last else '├── '}{self.tree.item(item_id, 'text')}")
-        children = self.tree.get_children(item_id)
-        if children:
-            new_prefix = prefix + ("    " if is_last else "│   ")
-            for i, child_id in enumerate(children): self._export_recursive(child_id, new_prefix, i == len(children) - 1, lines)
-                
     def _on_drag_start(self, event):
         item = self.tree.identify_row(event.y);
-        if item: self.drag_data["item"] = item
+        # Os filhos provisórios ("...") só existem na visualização: não podem ser arrastados
+        if item and item in self.model: self.drag_data["item"] = item
         
     def _on_drag_motion(self, event):
         if not self.drag_data["item"]: return
         target_item = self.tree.identify_row(event.y)
         if target_item:
+            # Ignora o próprio item e os filhos provisórios (que só existem na visualização)
+            if target_item == self.drag_data["item"] or target_item not in self.model: return
             if self.is_folder_node(target_item):
-                self.tree.move(self.drag_data["item"], target_item, self.tree.index(target_item))
+                self._move_item(self.drag_data["item"], target_item, self.model.index(target_item))
             else:
-                parent = self.tree.parent(target_item)
-                self.tree.move(self.drag_data["item"], parent, self.tree.index(target_item))
+                parent = self.model.parent(target_item)
+                self._move_item(self.drag_data["item"], parent, self.model.index(target_item))
 
     def _get_all_descendants(self, item_id):
-        descendants = []; children = self.tree.get_children(item_id)
-        descendants.extend(children)
-        for child in children: descendants.extend(self._get_all_descendants(child))
-        return descendants
+        return self.model.descendants(item_id)
         
     def _on_drag_stop(self, event):
         if not self.drag_data["item"]: return
@@ -221,7 +586,7 @@ class TreeManager:
         
         target_item = self.tree.identify_row(event.y)
         if not target_item: # Movido para o espaço vazio (raiz)
-            self.tree.move(item_to_move, "", tk.END)
+            self._move_item(item_to_move, "")
         else:
             # Lógica para mover para dentro ou ao lado de um item
             # A lógica no _on_drag_motion já deve ter posicionado corretamente,
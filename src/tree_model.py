@@ -0,0 +1,207 @@
+# src/tree_model.py
+"""
+Modelo de árvore em memória, independente de Tk.
+
+É a fonte da verdade da estrutura do projeto: o TreeManager apenas espelha
+este modelo no ttk.Treeview. Como não importa tkinter, pode ser usado e
+testado sem display.
+"""
+import itertools
+
+def iter_structure_nodes(structure: dict | None):
+    """Converte o dicionário aninhado dos presets em (profundidade, é_pasta, nome), em pré-ordem."""
+    stack = [(0, iter((structure or {}).items()))]
+    while stack:
+        depth, items = stack[-1]
+        item = next(items, None)
+        if item is None:
+            stack.pop(); continue
+        name, children = item
+        yield depth, bool(children), name
+        if children: stack.append((depth + 1, iter(children.items())))
+
+
+class TreeNode:
+    """Nó compacto (pasta ou arquivo) com referências para o pai e os filhos."""
+    __slots__ = ("id", "name", "is_folder", "parent", "children")
+
+    def __init__(self, node_id: str, name: str, is_folder: bool = False, parent=None):
+        self.id = node_id
+        self.name = name
+        self.is_folder = is_folder
+        self.parent = parent
+        self.children = []
+
+    def __repr__(self):
+        return f"TreeNode({self.id!r}, {self.name!r}, is_folder={self.is_folder})"
+
+
+class TreeModel:
+    """Armazena os nós em um índice por id. O id "" é a raiz, como no Treeview."""
+    ROOT_ID = ""
+
+    def __init__(self):
+        self._next_id = itertools.count(1)
+        self.root = TreeNode(self.ROOT_ID, "", is_folder=True)
+        self.nodes = {self.ROOT_ID: self.root}
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """
+        Registra callback(evento, nó, **dados) chamado após cada mutação:
+          "insert" (nó já ligado ao pai, com a subárvore que tiver), "rename" (old_name),
+          "remove" (nó já desligado; parent e index de onde saiu) e "clear".
+        Mover um nó gera "remove" seguido de "insert".
+        """
+        self._listeners.append(callback)
+
+    def _emit(self, event, node=None, **data):
+        for callback in self._listeners: callback(event, node, **data)
+
+    def __contains__(self, node_id):
+        return node_id in self.nodes
+
+    def __len__(self):
+        return len(self.nodes) - 1  # A raiz não conta
+
+    # --- Consultas ---
+    def get(self, node_id: str) -> TreeNode:
+        return self.nodes[node_id]
+
+    def name(self, node_id: str) -> str:
+        return self.nodes[node_id].name
+
+    def parent(self, node_id: str) -> str:
+        parent = self.nodes[node_id].parent
+        return parent.id if parent else self.ROOT_ID
+
+    def children(self, node_id: str = ROOT_ID) -> list[str]:
+        return [child.id for child in self.nodes[node_id].children]
+
+    def index(self, node_id: str) -> int:
+        node = self.nodes[node_id]
+        return node.parent.children.index(node) if node.parent else 0
+
+    def is_empty(self) -> bool:
+        return not self.root.children
+
+    def is_folder(self, node_id: str) -> bool:
+        """Mesma heurística usada historicamente pelo TreeManager: marcado como pasta,
+        com filhos, ou sem extensão no nome."""
+        if not node_id: return True
+        node = self.nodes[node_id]
+        return node.is_folder or bool(node.children) or "." not in node.name
+
+    def walk(self, node_id: str = ROOT_ID, include_self: bool = False):
+        """Percorre a subárvore em pré-ordem (iterativo), gerando (nó, profundidade)."""
+        start = self.nodes[node_id]
+        stack = [(start, 0)] if include_self else [(c, 1) for c in reversed(start.children)]
+        while stack:
+            node, depth = stack.pop()
+            yield node, depth
+            stack.extend((c, depth + 1) for c in reversed(node.children))
+
+    def iter_nodes(self, node_id: str = ROOT_ID):
+        """(profundidade, é_pasta, nome) da subárvore em pré-ordem; profundidade 0 = filhos de node_id."""
+        for node, depth in self.walk(node_id):
+            yield depth - 1, self.is_folder(node.id), node.name
+
+    def descendants(self, node_id: str) -> list[str]:
+        return [node.id for node, _ in self.walk(node_id)]
+
+    # --- Mutações ---
+    def insert(self, parent_id: str, name: str, is_folder: bool = False, index: int | None = None,
+               node_id: str | None = None) -> str:
+        parent = self.nodes[parent_id]
+        if node_id is None: node_id = f"n{next(self._next_id)}"
+        elif node_id in self.nodes: raise ValueError(f"Id de nó duplicado: {node_id!r}")
+        node = TreeNode(node_id, name, is_folder, parent)
+        if index is None or index >= len(parent.children): parent.children.append(node)
+        else: parent.children.insert(max(index, 0), node)
+        self.nodes[node_id] = node
+        self._emit("insert", node)
+        return node_id
+
+    def rename(self, node_id: str, name: str):
+        node = self.nodes[node_id]
+        old_name, node.name = node.name, name
+        self._emit("rename", node, old_name=old_name)
+
+    def _detach(self, node):
+        parent = node.parent; index = parent.children.index(node)
+        del parent.children[index]
+        self._emit("remove", node, parent=parent, index=index)
+
+    def delete(self, node_id: str) -> list[str]:
+        """Remove o nó e toda a sua subárvore. Retorna os ids removidos."""
+        node = self.nodes.get(node_id)
+        if node is None or node is self.root: return []
+        removed = [node_id] + self.descendants(node_id)
+        self._detach(node)
+        for rid in removed: del self.nodes[rid]
+        return removed
+
+    def move(self, node_id: str, parent_id: str, index: int | None = None) -> int:
+        """Move o nó para `parent_id` na posição `index`. Retorna a posição final."""
+        node, new_parent = self.nodes[node_id], self.nodes[parent_id]
+        ancestor = new_parent
+        while ancestor is not None:
+            if ancestor is node: raise ValueError("Não é possível mover um item para dentro de si mesmo.")
+            ancestor = ancestor.parent
+        self._detach(node)
+        siblings = new_parent.children
+        if index is None or index >= len(siblings): index = len(siblings)
+        index = max(index, 0)
+        siblings.insert(index, node); node.parent = new_parent
+        self._emit("insert", node)
+        return index
+
+    def clear(self):
+        self.root.children.clear()
+        self.nodes = {self.ROOT_ID: self.root}
+        self._emit("clear")
+
+    # --- Conversões ---
+    def get_structure(self, node_id: str = ROOT_ID) -> dict:
+        """Converte a subárvore no dicionário aninhado usado pelos presets ({nome: filhos ou None})."""
+        structure = {}; stack = [(self.nodes[node_id], structure)]
+        while stack:  # Iterativo: árvores muito profundas não esbarram no limite de recursão
+            node, target = stack.pop()
+            for child in node.children:
+                if child.children:
+                    target[child.name] = {}; stack.append((child, target[child.name]))
+                else:
+                    target[child.name] = None
+        return structure
+
+    def build_from_structure(self, structure: dict, parent_id: str = ROOT_ID) -> list[str]:
+        """Insere um dicionário aninhado sob `parent_id`. Retorna os ids de primeiro nível criados."""
+        return self.build_from_nodes(iter_structure_nodes(structure), parent_id)
+
+    def build_from_nodes(self, nodes, parent_id: str = ROOT_ID) -> list[str]:
+        """
+        Insere uma sequência em pré-ordem de (profundidade, é_pasta, nome) sob `parent_id`
+        (profundidade 0 = filhos diretos). Aceita um gerador, sem montar a estrutura inteira.
+        Retorna os ids de primeiro nível criados.
+        """
+        created = []; parents = [parent_id]
+        for depth, is_folder, name in nodes:
+            if depth >= len(parents): raise ValueError(f"Profundidade inválida na sequência de nós: {depth}")
+            del parents[depth + 1:]
+            node_id = self.insert(parents[depth], name, is_folder=is_folder)
+            if depth == 0: created.append(node_id)
+            parents.append(node_id)
+        return created
+
+    def export_to_text(self, project_name: str = "MeuProjeto") -> str:
+        """Gera a representação ASCII (├── / └──) da árvore."""
+        lines = [f"{project_name}/"]
+        stack = [(c, "    ", i == len(self.root.children) - 1) for i, c in reversed(list(enumerate(self.root.children)))]
+        while stack:
+            node, prefix, is_last = stack.pop()
+            lines.append(f"{prefix}{'└── ' if is_last else '├── '}{node.name}")
+            if node.children:
+                new_prefix = prefix + ("    " if is_last else "│   ")
+                last = len(node.children) - 1
+                stack.extend((c, new_prefix, i == last) for i, c in reversed(list(enumerate(node.children))))
+        return "\n".join(lines)
@@ -0,0 +1,91 @@
+# src/tree_search.py
+"""
+Índice de nomes do TreeModel para a busca (Ctrl+F).
+
+O índice é mantido pelos eventos do modelo (inserir, renomear, excluir), então
+uma consulta percorre só os nomes distintos, sem caminhar pela árvore.
+"""
+import re
+import fnmatch
+
+SEARCH_MODES = {"Contém": "contains", "Glob": "glob", "Regex": "regex"}
+
+class NameIndex:
+    # Até quantos resultados vale ordenar pelo caminho em vez de recalcular a ordem da árvore
+    PATH_SORT_LIMIT = 500
+
+    def __init__(self, model):
+        self.model = model
+        self._by_name = {}   # nome em minúsculas -> set de ids
+        self._rank = None    # id -> posição em pré-ordem (recalculada sob demanda)
+        model.add_listener(self._on_model_event)
+        self.rebuild()
+
+    def rebuild(self):
+        self._by_name = {}; self._rank = None
+        for node, _ in self.model.walk(): self._add(node)
+
+    def search(self, query: str, mode: str = "contains") -> list[str]:
+        """
+        Ids dos nós cujo nome corresponde à consulta, na ordem em que aparecem na árvore.
+        Modos: "contains" (substring), "glob" (nome inteiro, ex.: *.py) e "regex" (re.search).
+        Nenhum diferencia maiúsculas. Levanta ValueError para um padrão inválido.
+        """
+        if not query: return []
+        names = self._by_name
+        if mode == "contains":
+            term = query.lower()
+            matched = [name for name in names if term in name]
+        else:
+            try:
+                pattern = re.compile(fnmatch.translate(query.lower()) if mode == "glob" else query, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Padrão inválido: {e}") from e
+            test = pattern.match if mode == "glob" else pattern.search
+            matched = list(filter(test, names))
+        ids = [node_id for name in matched for node_id in names[name]]
+        if self._rank is None and len(ids) <= self.PATH_SORT_LIMIT:
+            # Poucos resultados: ordenar pelo caminho de cada um evita percorrer a árvore inteira
+            ids.sort(key=self._path_key)
+        else:
+            ids.sort(key=self._get_rank().__getitem__)
+        return ids
+
+    def _path_key(self, node_id: str) -> list[int]:
+        key = []; node = self.model.get(node_id)
+        while node.parent is not None:
+            key.append(node.parent.children.index(node)); node = node.parent
+        key.reverse()
+        return key
+
+    def _get_rank(self) -> dict:
+        if self._rank is None:
+            order = []; stack = list(reversed(self.model.root.children))
+            while stack:
+                node = stack.pop(); order.append(node.id); stack.extend(reversed(node.children))
+            self._rank = dict(zip(order, range(len(order))))
+        return self._rank
+
+    # --- Manutenção pelos eventos do modelo ---
+    def _add(self, node):
+        self._by_name.setdefault(node.name.lower(), set()).add(node.id)
+
+    def _discard(self, name: str, node_id: str):
+        key = name.lower()
+        ids = self._by_name.get(key)
+        if ids is None: return
+        ids.discard(node_id)
+        if not ids: del self._by_name[key]
+
+    def _on_model_event(self, event, node=None, **data):
+        if event == "rename":
+            self._discard(data["old_name"], node.id); self._add(node)
+            return
+        self._rank = None
+        if event == "clear":
+            self._by_name = {}; return
+        stack = [node]
+        while stack:
+            current = stack.pop(); stack.extend(current.children)
+            if event == "insert": self._add(current)
+            else: self._discard(current.name, current.id)